@@ -5,13 +5,16 @@ import ipaddress
 import json
 import syslog
 import operator
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 import openconfig_acl
 import tabulate
 import pyangbind.lib.pybindJSON as pybindJSON
 from natsort import natsorted
 from sonic_py_common import multi_asic
-from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
+from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector, ConfigDBPipeConnector
 from utilities_common.general import load_db_config
 
 def info(msg):
@@ -152,6 +155,9 @@ class AclLoader(object):
 
         self.per_npu_statedb = {}
 
+        # Pipelined Config DB connectors used by diff_update, opened on first use
+        self.pipe_configdbs = None
+
         # Getting all front asic namespace and correspding config and state DB connector
 
         namespaces = multi_asic.get_all_namespaces()
@@ -884,6 +890,140 @@ class AclLoader(object):
                 for namespace_configdb in self.per_npu_configdb.values():
                     namespace_configdb.set_entry(self.ACL_RULE, key, self.rules_info[key])
 
+    @staticmethod
+    def raw_rule(rule_props):
+        """
+        Return the rule fields as they are stored in Config DB, so that rules
+        converted from file compare equal to the ones read from the DB.
+        :param rule_props: ACL rule fields
+        :return: dict of field -> string value
+        """
+        return {field: ",".join(map(str, value)) if isinstance(value, list) else str(value)
+                for field, value in rule_props.items()}
+
+    def diff_rules(self):
+        """
+        Compare the rules loaded from file with the rules in Config DB. If the
+        current_table is not empty, only rules within that table are compared.
+        :return: tuple of (added, removed, changed) sets of rule keys
+        """
+        def in_scope(key):
+            return self.current_table is None or self.current_table == key[0]
+
+        new_rules = set(key for key in self.rules_info if in_scope(key))
+        current_rules = set(key for key in self.rules_db_info if in_scope(key))
+
+        added = new_rules.difference(current_rules)
+        removed = current_rules.difference(new_rules)
+        changed = set(key for key in new_rules.intersection(current_rules)
+                      if self.raw_rule(self.rules_info[key]) != self.raw_rule(self.rules_db_info[key]))
+
+        return added, removed, changed
+
+    def get_pipe_configdbs(self):
+        """
+        Get the pipelined Config DB connectors of the global namespace and of
+        every front asic namespace.
+        :return: dict of namespace -> ConfigDBPipeConnector
+        """
+        if self.pipe_configdbs is None:
+            self.pipe_configdbs = {multi_asic.DEFAULT_NAMESPACE: ConfigDBPipeConnector()}
+            for namespace in self.per_npu_configdb or {}:
+                self.pipe_configdbs[namespace] = ConfigDBPipeConnector(namespace=namespace)
+            for configdb in self.pipe_configdbs.values():
+                configdb.connect()
+        return self.pipe_configdbs
+
+    def write_rules(self, remove_keys, program_keys):
+        """
+        Remove and then program ACL rules in every namespace. The rules are
+        written with one pipelined mod_config per phase and namespace, and
+        the namespaces are written in parallel.
+        :param remove_keys: keys of the rules to delete
+        :param program_keys: keys of the rules to write from rules_info
+        :return: dict of phase -> seconds, the slowest namespace of each phase
+        """
+        removed = {key: None for key in sorted(remove_keys)}
+        programmed = {key: self.rules_info[key] for key in sorted(program_keys)}
+
+        def write(configdb):
+            timing = {"remove": 0.0, "program": 0.0}
+            # Never pass an empty table to mod_config, it would delete the whole table
+            for phase, rules in (("remove", removed), ("program", programmed)):
+                if rules:
+                    start = time.monotonic()
+                    configdb.mod_config({self.ACL_RULE: rules})
+                    timing[phase] = time.monotonic() - start
+            return timing
+
+        configdbs = list(self.get_pipe_configdbs().values())
+        with ThreadPoolExecutor(max_workers=len(configdbs)) as executor:
+            timings = list(executor.map(write, configdbs))
+
+        return {phase: max(timing[phase] for timing in timings) for phase in ("remove", "program")}
+
+    def diff_update(self, dry_run=False):
+        """
+        Perform diff update of ACL rules configuration. The result is the same
+        as a full update, but only rules that were added, removed or changed
+        are written to Config DB. A changed rule which lost some fields is
+        removed and installed again, other changed rules are updated in place.
+
+        Rules are only inserted or removed at their own priority, which does
+        not move the other rules of the table. Like incremental_update, we do
+        not assume the ASIC copes with shifting existing dataplane ACLs: if
+        the priority of an existing rule of a dataplane table changed, all
+        rules of that table are removed and programmed again.
+        :param dry_run: only print what would be changed
+        :return: dict of phase -> seconds
+        """
+        start = time.monotonic()
+        added, removed, changed = self.diff_rules()
+        shifted = self.get_shifted_tables(changed)
+        timing = {"diff": time.monotonic() - start}
+
+        self.show_diff(added, removed, changed)
+        for table in natsorted(shifted):
+            print("Rule priorities of {} changed, all of its rules are programmed again".format(table))
+
+        if not dry_run and (added or removed or changed):
+            replaced = set(key for key in changed
+                           if key[0] in shifted or set(self.rules_db_info[key]).difference(self.rules_info[key]))
+            removed = removed.union(key for key in self.rules_db_info if key[0] in shifted)
+            added = added.union(key for key in self.rules_info if key[0] in shifted)
+            timing.update(self.write_rules(removed.union(replaced), added.union(changed)))
+
+        for phase, seconds in timing.items():
+            info("ACL rules %s took %.3f seconds" % (phase, seconds))
+
+        return timing
+
+    def get_shifted_tables(self, changed):
+        """
+        Get the dataplane ACL tables in which an existing rule changed priority.
+        :param changed: keys of the changed rules
+        :return: set of table names
+        """
+        return set(key[0] for key in changed
+                   if not self.is_table_control_plane(key[0]) and
+                   str(self.rules_info[key].get("PRIORITY")) != str(self.rules_db_info[key].get("PRIORITY")))
+
+    def show_diff(self, added, removed, changed):
+        """
+        Print the number of rules added, removed and changed per ACL table.
+        :param added: keys of the added rules
+        :param removed: keys of the removed rules
+        :param changed: keys of the changed rules
+        :return:
+        """
+        header = ("Table", "Added", "Removed", "Changed")
+        counts = [Counter(key[0] for key in keys) for keys in (added, removed, changed)]
+        tables = natsorted(set(key[0] for key in added | removed | changed))
+        data = [[table] + [count[table] for count in counts] for table in tables]
+        data.append(["Total", len(added), len(removed), len(changed)])
+
+        print(tabulate.tabulate(data, headers=header, tablefmt="simple", missingval=""))
+
     def delete(self, table=None, rule=None):
         """
         :param table:
@@ -1196,6 +1336,37 @@ def incremental(ctx, filename, session_name, mirror_stage, max_priority):
     acl_loader.incremental_update()
 
 
+@update.command()
+@click.argument('filename', type=click.Path(exists=True))
+@click.option('--table_name', type=click.STRING, required=False)
+@click.option('--session_name', type=click.STRING, required=False)
+@click.option('--mirror_stage', type=click.Choice(["ingress", "egress"]), default="ingress")
+@click.option('--max_priority', type=click.INT, required=False)
+@click.option('--dry_run', is_flag=True, default=False, help="Only show the changes that would be made")
+@click.pass_context
+def diff(ctx, filename, table_name, session_name, mirror_stage, max_priority, dry_run):
+    """
+    Diff update of ACL rules configuration.
+    Results in the same rules as a full update, but only writes the rules that changed.
+    If a table_name is provided, the operation will be restricted in the specified table.
+    """
+    acl_loader = ctx.obj["acl_loader"]
+
+    if table_name:
+        acl_loader.set_table_name(table_name)
+
+    if session_name:
+        acl_loader.set_session_name(session_name)
+
+    acl_loader.set_mirror_stage(mirror_stage)
+
+    if max_priority:
+        acl_loader.set_max_priority(max_priority)
+
+    acl_loader.load_rules_from_file(filename)
+    acl_loader.diff_update(dry_run)
+
+
 @cli.command()
 @click.argument('table', required=False)
 @click.argument('rule', required=False)
@@ -11,12 +11,13 @@ import tempfile
 import yang as ly
 from json import load
 from sys import flags
-from time import sleep as tsleep
+from time import time as ttime
 
 import sonic_yang
 from jsondiff import diff
 from sonic_py_common import port_util
 from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
+from utilities_common.bulk_db import BulkReader
 from utilities_common.general import load_module_from_source
 
 
@@ -367,10 +368,11 @@ class ConfigMgmtDPB(ConfigMgmt):
         try:
             # connect to ASIC DB,
             db.connect(db.ASIC_DB)
-            for port in ports:
-                key = self.oidKey + portMap[port]
-                if self._checkKeyinAsicDB(key, db) == True:
-                    return False
+            keys = [self.oidKey + portMap[port] for port in ports]
+            self.sysLog(msg='Check Keys in Asic DB: {}'.format(keys))
+            # check all the keys with pipelined requests
+            if BulkReader(db, db.ASIC_DB).exists_many(keys):
+                return False
 
         except Exception as e:
             self.sysLog(doPrint=True, logLevel=syslog.LOG_ERR, msg=str(e))
@@ -378,30 +380,76 @@ class ConfigMgmtDPB(ConfigMgmt):
 
         return True
 
+    def _waitForDbState(self, db, dbName, keyPattern, isConverged, timeout):
+        '''
+        Wait till isConverged() returns True. It is checked again as soon as
+        a key matching keyPattern is changed in dbName, as notified by the
+        redis keyspace notifications, and at least every second otherwise.
+
+        Parameters:
+            db (SonicV2Connector): database, connected to dbName.
+            dbName (str): database to watch.
+            keyPattern (str): pattern of the keys to watch.
+            isConverged (function): returns True once the wait is over.
+            timeout (int): timeout period.
+
+        Returns:
+            (converged, waitTime) (tuple)[bool, float]: True if converged
+                before timeout, and the secs waited.
+        '''
+        startTime = ttime()
+        pubsub = db.get_redis_client(dbName).pubsub()
+        # subscribe before the first check, so that no change is missed
+        channel = "__keyspace@{}__:{}".format(db.get_dbid(dbName), keyPattern)
+        pubsub.psubscribe(channel)
+        try:
+            while True:
+                if isConverged():
+                    return True, ttime() - startTime
+                remaining = timeout - (ttime() - startTime)
+                if remaining <= 0:
+                    return False, ttime() - startTime
+                # wake up on the first change, then consume the changes of
+                # the other ports before checking again
+                item = pubsub.get_message(timeout=min(1, remaining))
+                while item and ttime() - startTime < timeout:
+                    item = pubsub.get_message(timeout=0)
+        finally:
+            pubsub.punsubscribe(channel)
+
     def _verifyPortShutdown(self, db, ports, timeout):
+        '''
+        Verify in the State DB that ports are admin down, Keep on trying till
+        timeout period.
+
+        Parameters:
+            db (SonicV2Connector): database.
+            ports (list): port list to check in State DB.
+            timeout (int): timeout period
+
+        Returns:
+            (bool): True, if all ports are admin down.
+        '''
         self.sysLog(doPrint=True, msg="Verify Port shutdown from State DB, Wait...")
 
         db.connect(db.STATE_DB)
-        for waitTime in range(timeout):
-            retry = False
-            for intf in ports:
-                _hash = "PORT_TABLE|{}".format(intf)
-                port_status = db.get(db.STATE_DB, _hash, "admin_status")
-                if port_status != 'down':
-                    retry = True
-                    continue
-            if retry:
-                tsleep(1)
-            else:
-                break
-
-        if waitTime + 1 == timeout:
-            for intf in ports:
-                _hash = "PORT_TABLE|{}".format(intf)
-                port_status = db.get(db.STATE_DB, _hash, "admin_status")
-                if port_status != 'down':
-                    self.sysLog(syslog.LOG_CRIT, "Fail to shutdown port {}".format(intf))
+        keys = ["PORT_TABLE|{}".format(intf) for intf in ports]
+        upPorts = list(ports)
+
+        def _checkPortsShutdown():
+            portStatus = BulkReader(db, db.STATE_DB).get_fields_many(keys, ["admin_status"])
+            upPorts[:] = [intf for intf, key in zip(ports, keys) \
+                if portStatus[key].get("admin_status") != 'down']
+            return not upPorts
+
+        shutdown, waitTime = self._waitForDbState(db, db.STATE_DB, "PORT_TABLE|*", \
+            _checkPortsShutdown, timeout)
+        self.sysLog(msg="Port shutdown wait took {:.3f} secs".format(waitTime))
 
+        for intf in upPorts:
+            self.sysLog(syslog.LOG_CRIT, "Fail to shutdown port {}".format(intf))
+
+        return shutdown
 
     def _verifyAsicDB(self, db, ports, portMap, timeout):
         '''
@@ -419,17 +467,15 @@ class ConfigMgmtDPB(ConfigMgmt):
         '''
         self.sysLog(doPrint=True, msg="Verify Port Deletion from Asic DB, Wait...")
         try:
-            for waitTime in range(timeout):
-                self.sysLog(logLevel=syslog.LOG_DEBUG, msg='Check Asic DB: {} \
-                    try'.format(waitTime+1))
-                # checkNoPortsInAsicDb will return True if all ports are not
-                # present in ASIC DB
-                if self._checkNoPortsInAsicDb(db, ports, portMap):
-                    break
-                tsleep(1)
+            db.connect(db.ASIC_DB)
+            # checkNoPortsInAsicDb will return True if all ports are not
+            # present in ASIC DB
+            deleted, waitTime = self._waitForDbState(db, db.ASIC_DB, self.oidKey + '*', \
+                lambda: self._checkNoPortsInAsicDb(db, ports, portMap), timeout)
+            self.sysLog(msg="Port deletion wait took {:.3f} secs".format(waitTime))
 
             # raise if timer expired
-            if waitTime + 1 == timeout:
+            if not deleted:
                 self.sysLog(syslog.LOG_CRIT, "!!!  Critical Failure, Ports \
                     are not Deleted from ASIC DB, Bail Out  !!!", doPrint=True)
                 raise Exception("Ports are present in ASIC DB after {} secs".format(timeout))
@@ -19,6 +19,7 @@ import tempfile
 from jsonpatch import JsonPatchConflict
 from jsonpointer import JsonPointerException
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from generic_config_updater.generic_updater import GenericUpdater, ConfigFormat
 from minigraph import parse_device_desc_xml, minigraph_encoder
 from natsort import natsorted
@@ -27,9 +28,9 @@ from socket import AF_INET, AF_INET6
 from sonic_py_common import device_info, multi_asic
 from sonic_py_common.general import getstatusoutput_noshell
 from sonic_py_common.interface import get_interface_table_name, get_port_table_name, get_intf_longname
-from utilities_common import util_base
+from utilities_common import util_base, constants
 from swsscommon import swsscommon
-from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
+from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector, ConfigDBPipeConnector
 from utilities_common.db import Db
 from utilities_common.intf_filter import parse_interface_in_filter
 from utilities_common import bgp_util
@@ -125,18 +126,57 @@ sonic_cfggen = load_module_from_source('sonic_cfggen', '/usr/local/bin/sonic-cfg
 # Helper functions
 #
 
-# Sort nested dict
-def sort_dict(data):
-    """ Sort of 1st level and 2nd level dict of data naturally by its key
-        data: data to be sorted
+def serialize_config(config_db, data, level=0):
+    """ Serialize the keys of config DB data and sort it the way
+        'sonic-cfggen -d --print-data' prints it, with the tables and their
+        keys sorted naturally, as 'config save' used to sort the file
+        config_db: connector the data was read from
+        data: data to be serialized
+        level: nesting level of data, 0 for the tables
     """
     if type(data) is not dict:
         return data
 
-    for table in data:
-        if type(data[table]) is dict:
-            data[table] = OrderedDict(natsorted(data[table].items()))
-    return OrderedDict(natsorted(data.items()))
+    items = [(config_db.serialize_key(key), serialize_config(config_db, value, level + 1))
+             for key, value in data.items()]
+    # Only the tables and their keys are sorted naturally, the fields keep
+    # the order of sonic-cfggen, which sorts its output
+    if level < 2:
+        return OrderedDict(natsorted(items))
+    return OrderedDict(sorted(items))
+
+def run_per_namespace(func, jobs, parallel=False):
+    """ Call func(*job) for every job, one after the other or, if parallel,
+        concurrently in a pool bounded by SONIC_CLI_NS_MAX_WORKERS
+        func: per namespace function
+        jobs: iterable of argument tuples, starting with the namespace
+        parallel: run the jobs concurrently
+
+        In parallel, the failures of all the namespaces are reported once the
+        pool is done, then the first one is raised again from the calling thread.
+    """
+    if not parallel:
+        for job in jobs:
+            func(*job)
+        return
+
+    jobs = list(jobs)
+    max_workers = min(multi_asic_util.multi_asic_max_workers(constants.DEFAULT_NS_PARALLEL_MAX_WORKERS), len(jobs))
+    if max_workers <= 1:
+        for job in jobs:
+            func(*job)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(func, *job) for job in jobs]
+
+    # sys.exit() and click.Abort raised by func only end its worker thread
+    failures = [(job[0], future.exception()) for job, future in zip(jobs, futures)
+                if future.exception() is not None]
+    for namespace, error in failures:
+        click.echo("Failed in namespace {}: {!r}".format(namespace or 'host', error), err=True)
+    if failures:
+        raise failures[0][1]
 
 # Read given JSON file
 def read_json_file(fileName):
@@ -1254,8 +1294,10 @@ config.add_command(dns.dns)
 @config.command()
 @click.option('-y', '--yes', is_flag=True, callback=_abort_if_false,
                 expose_value=False, prompt='Existing files will be overwritten, continue?')
+@click.option('-p', '--parallel', is_flag=True, default=False,
+              help='Save the config of the namespaces concurrently')
 @click.argument('filename', required=False)
-def save(filename):
+def save(filename, parallel):
     """Export current config DB to a file on disk.\n
        <filename> : Names of configuration file(s) to save, separated by comma with no spaces in between
     """
@@ -1276,6 +1318,7 @@ def save(filename):
 
     # In case of multi-asic mode we have additional config_db{NS}.json files for
     # various namespaces created per ASIC. {NS} is the namespace index.
+    jobs = []
     for inst in range(-1, num_cfg_file-1):
         #inst = -1, refers to the linux host where there is no namespace.
         if inst == -1:
@@ -1292,17 +1335,32 @@ def save(filename):
             else:
                 file = "/etc/sonic/config_db{}.json".format(inst)
 
-        if namespace is None:
-            command = "{} -d --print-data > {}".format(SONIC_CFGGEN_PATH, file)
-        else:
-            command = "{} -n {} -d --print-data > {}".format(SONIC_CFGGEN_PATH, namespace, file)
+        jobs.append((namespace, file))
+
+    run_per_namespace(save_config_db, jobs, parallel)
+
+def save_config_db(namespace, file):
+    """ Dump the config DB of a namespace to file, like sonic-cfggen does
+        namespace: namespace of the config DB, None for the linux host
+        file: file to write
+    """
+    log.log_info("'save' executing...")
+    if namespace is None:
+        click.echo("Saving CONFIG_DB to {}".format(file))
+    else:
+        click.echo("Saving CONFIG_DB of namespace {} to {}".format(namespace, file))
 
-        log.log_info("'save' executing...")
-        clicommon.run_command(command, display_cmd=True, shell=True)
+    if namespace is None:
+        config_db = ConfigDBPipeConnector()
+    else:
+        config_db = ConfigDBPipeConnector(use_unix_socket_path=True, namespace=namespace)
+    config_db.connect()
 
-        config_db = sort_dict(read_json_file(file))
-        with open(file, 'w') as config_db_file:
-            json.dump(config_db, config_db_file, indent=4)
+    # Same content as 'sonic-cfggen -d --print-data', without a second
+    # interpreter and a round trip through the file to sort it
+    config = serialize_config(config_db, config_db.get_config())
+    with open(file, 'w') as config_db_file:
+        json.dump(config, config_db_file, indent=4)
 
 @config.command()
 @click.option('-y', '--yes', is_flag=True)
@@ -1512,9 +1570,10 @@ def list_checkpoints(ctx, verbose):
 @click.option('-n', '--no_service_restart', default=False, is_flag=True, help='Do not restart docker services')
 @click.option('-f', '--force', default=False, is_flag=True, help='Force config reload without system checks')
 @click.option('-t', '--file_format', default='config_db',type=click.Choice(['config_yang', 'config_db']),show_default=True,help='specify the file format')
+@click.option('-p', '--parallel', is_flag=True, default=False, help='Load the config of the namespaces concurrently')
 @click.argument('filename', required=False)
 @clicommon.pass_db
-def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_format):
+def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_format, parallel):
     """Clear current configuration and import a previous saved config DB dump file.
        <filename> : Names of configuration file(s) to load, separated by comma with no spaces in between
     """
@@ -1564,133 +1623,146 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
     # service running in the host + DB services running in each ASIC namespace created per ASIC.
     # In the below logic, we get all namespaces in this platform and add an empty namespace ''
     # denoting the current namespace which we are in ( the linux host )
-    for inst in range(-1, num_cfg_file-1):
-        # Get the namespace name, for linux host it is None
-        if inst == -1:
-            namespace = None
-        else:
-            namespace = "{}{}".format(NAMESPACE_PREFIX, inst)
-
-        # Get the file from user input, else take the default file /etc/sonic/config_db{NS_id}.json
-        if cfg_files:
-            file = cfg_files[inst+1]
-            # Save to tmpfile in case of stdin input which can only be read once
-            if file == "/dev/stdin":
-                file_input = read_json_file(file)
-                (_, tmpfname) = tempfile.mkstemp(dir="/tmp", suffix="_configReloadStdin")
-                write_json_file(file_input, tmpfname)
-                file = tmpfname
-        else:
-            if file_format == 'config_db':
-                if namespace is None:
-                    file = DEFAULT_CONFIG_DB_FILE
-                else:
-                    file = "/etc/sonic/config_db{}.json".format(inst)
+    def reload_jobs(load_sysinfo):
+        """ Yield the (namespace, file, file_format, load_sysinfo) to reload """
+        for inst in range(-1, num_cfg_file-1):
+            # Get the namespace name, for linux host it is None
+            if inst == -1:
+                namespace = None
             else:
-                file = DEFAULT_CONFIG_YANG_FILE
-
+                namespace = "{}{}".format(NAMESPACE_PREFIX, inst)
+
+            # Get the file from user input, else take the default file /etc/sonic/config_db{NS_id}.json
+            if cfg_files:
+                file = cfg_files[inst+1]
+                # Save to tmpfile in case of stdin input which can only be read once
+                if file == "/dev/stdin":
+                    file_input = read_json_file(file)
+                    (_, tmpfname) = tempfile.mkstemp(dir="/tmp", suffix="_configReloadStdin")
+                    write_json_file(file_input, tmpfname)
+                    file = tmpfname
+            else:
+                if file_format == 'config_db':
+                    if namespace is None:
+                        file = DEFAULT_CONFIG_DB_FILE
+                    else:
+                        file = "/etc/sonic/config_db{}.json".format(inst)
+                else:
+                    file = DEFAULT_CONFIG_YANG_FILE
 
-        # Check the file exists before proceeding.
-        if not os.path.exists(file):
-            click.echo("The config file {} doesn't exist".format(file))
-            continue
 
-        if file_format == 'config_db':
-            file_input = read_json_file(file)
+            # Check the file exists before proceeding.
+            if not os.path.exists(file):
+                click.echo("The config file {} doesn't exist".format(file))
+                continue
 
-            platform = file_input.get("DEVICE_METADATA", {}).\
-                get("localhost", {}).get("platform")
-            mac = file_input.get("DEVICE_METADATA", {}).\
-                get("localhost", {}).get("mac")
+            if file_format == 'config_db':
+                file_input = read_json_file(file)
 
-            if not platform or not mac:
-                log.log_warning("Input file does't have platform or mac. platform: {}, mac: {}"
-                    .format(None if platform is None else platform, None if mac is None else mac))
-                load_sysinfo = True
+                platform = file_input.get("DEVICE_METADATA", {}).\
+                    get("localhost", {}).get("platform")
+                mac = file_input.get("DEVICE_METADATA", {}).\
+                    get("localhost", {}).get("mac")
 
-        if load_sysinfo:
-            try:
-                command = [SONIC_CFGGEN_PATH, "-j", file, '-v', "DEVICE_METADATA.localhost.hwsku"]
-                proc = subprocess.Popen(command, text=True, stdout=subprocess.PIPE)
-                output, err = proc.communicate()
+                if not platform or not mac:
+                    log.log_warning("Input file does't have platform or mac. platform: {}, mac: {}"
+                        .format(None if platform is None else platform, None if mac is None else mac))
+                    load_sysinfo = True
 
-            except FileNotFoundError as e:
-                click.echo("{}".format(str(e)), err=True)
-                raise click.Abort()
-            except Exception as e:
-                click.echo("{}\n{}".format(type(e), str(e)), err=True)
-                raise click.Abort()
+            yield namespace, file, file_format, load_sysinfo
 
-            if not output:
-                click.secho("Could not get the HWSKU from config file,  Exiting!!!", fg='magenta')
-                sys.exit(1)
+    run_per_namespace(reload_config_db, reload_jobs(load_sysinfo), parallel)
 
-            cfg_hwsku = output.strip()
+    # Re-generate the environment variable in case config_db.json was edited
+    update_sonic_environment()
 
-        if namespace is None:
-            config_db = ConfigDBConnector()
-        else:
-            config_db = ConfigDBConnector(use_unix_socket_path=True, namespace=namespace)
+    # We first run "systemctl reset-failed" to remove the "failed"
+    # status from all services before we attempt to restart them
+    if not no_service_restart:
+        _reset_failed_services()
+        log.log_notice("'reload' restarting services...")
+        _restart_services()
 
-        config_db.connect()
-        client = config_db.get_redis_client(config_db.CONFIG_DB)
-        client.flushdb()
+def reload_config_db(namespace, file, file_format, load_sysinfo):
+    """ Clear the config DB of a namespace and load it from file
+        namespace: namespace of the config DB, None for the linux host
+        file: file to load
+        file_format: config_db or config_yang
+        load_sysinfo: load the system default information first
+    """
+    if load_sysinfo:
+        try:
+            command = [SONIC_CFGGEN_PATH, "-j", file, '-v', "DEVICE_METADATA.localhost.hwsku"]
+            proc = subprocess.Popen(command, text=True, stdout=subprocess.PIPE)
+            output, err = proc.communicate()
 
-        if load_sysinfo:
-            if namespace is None:
-                command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
-            else:
-                command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(namespace), '--write-to-db']
-            clicommon.run_command(command, display_cmd=True)
+        except FileNotFoundError as e:
+            click.echo("{}".format(str(e)), err=True)
+            raise click.Abort()
+        except Exception as e:
+            click.echo("{}\n{}".format(type(e), str(e)), err=True)
+            raise click.Abort()
 
-        # For the database service running in linux host we use the file user gives as input
-        # or by default DEFAULT_CONFIG_DB_FILE. In the case of database service running in namespace,
-        # the default config_db<namespaceID>.json format is used.
+        if not output:
+            click.secho("Could not get the HWSKU from config file,  Exiting!!!", fg='magenta')
+            sys.exit(1)
 
+        cfg_hwsku = output.strip()
 
-        config_gen_opts = []
+    if namespace is None:
+        config_db = ConfigDBConnector()
+    else:
+        config_db = ConfigDBConnector(use_unix_socket_path=True, namespace=namespace)
 
-        if os.path.isfile(INIT_CFG_FILE):
-            config_gen_opts += ['-j', str(INIT_CFG_FILE)]
+    config_db.connect()
+    client = config_db.get_redis_client(config_db.CONFIG_DB)
+    client.flushdb()
 
-        if file_format == 'config_db':
-            config_gen_opts += ['-j', str(file)]
+    if load_sysinfo:
+        if namespace is None:
+            command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
         else:
-            config_gen_opts += ['-Y', str(file)]
+            command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(namespace), '--write-to-db']
+        clicommon.run_command(command, display_cmd=True)
 
-        if namespace is not None:
-            config_gen_opts += ['-n', str(namespace)]
+    # For the database service running in linux host we use the file user gives as input
+    # or by default DEFAULT_CONFIG_DB_FILE. In the case of database service running in namespace,
+    # the default config_db<namespaceID>.json format is used.
 
-        command = [SONIC_CFGGEN_PATH] + config_gen_opts + ['--write-to-db']
 
-        clicommon.run_command(command, display_cmd=True)
-        client.set(config_db.INIT_INDICATOR, 1)
+    config_gen_opts = []
 
-        if os.path.exists(file) and file.endswith("_configReloadStdin"):
-            # Remove tmpfile
-            try:
-                os.remove(file)
-            except OSError as e:
-                click.echo("An error occurred while removing the temporary file: {}".format(str(e)), err=True)
+    if os.path.isfile(INIT_CFG_FILE):
+        config_gen_opts += ['-j', str(INIT_CFG_FILE)]
 
-        # Migrate DB contents to latest version
-        db_migrator='/usr/local/bin/db_migrator.py'
-        if os.path.isfile(db_migrator) and os.access(db_migrator, os.X_OK):
-            if namespace is None:
-                command = [db_migrator, '-o', 'migrate']
-            else:
-                command = [db_migrator, '-o', 'migrate', '-n', str(namespace)]
-            clicommon.run_command(command, display_cmd=True)
+    if file_format == 'config_db':
+        config_gen_opts += ['-j', str(file)]
+    else:
+        config_gen_opts += ['-Y', str(file)]
 
-    # Re-generate the environment variable in case config_db.json was edited
-    update_sonic_environment()
+    if namespace is not None:
+        config_gen_opts += ['-n', str(namespace)]
 
-    # We first run "systemctl reset-failed" to remove the "failed"
-    # status from all services before we attempt to restart them
-    if not no_service_restart:
-        _reset_failed_services()
-        log.log_notice("'reload' restarting services...")
-        _restart_services()
+    command = [SONIC_CFGGEN_PATH] + config_gen_opts + ['--write-to-db']
+
+    clicommon.run_command(command, display_cmd=True)
+    client.set(config_db.INIT_INDICATOR, 1)
+
+    if os.path.exists(file) and file.endswith("_configReloadStdin"):
+        # Remove tmpfile
+        try:
+            os.remove(file)
+        except OSError as e:
+            click.echo("An error occurred while removing the temporary file: {}".format(str(e)), err=True)
+
+    # Migrate DB contents to latest version
+    db_migrator='/usr/local/bin/db_migrator.py'
+    if os.path.isfile(db_migrator) and os.access(db_migrator, os.X_OK):
+        if namespace is None:
+            command = [db_migrator, '-o', 'migrate']
+        else:
+            command = [db_migrator, '-o', 'migrate', '-n', str(namespace)]
+        clicommon.run_command(command, display_cmd=True)
 
 @config.command("load_mgmt_config")
 @click.option('-y', '--yes', is_flag=True, callback=_abort_if_false,
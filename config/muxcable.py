@@ -11,7 +11,7 @@ from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
 from swsscommon import swsscommon
 from tabulate import tabulate
 from utilities_common import platform_sfputil_helper
-from utilities_common.general import get_optional_value_for_key_in_config_tbl 
+from utilities_common.general import get_optional_value_for_key_in_config_tbl, get_xcvr_batch_timeout
 
 platform_sfputil = None
 
@@ -69,7 +69,21 @@ def delete_all_keys_in_db_table(db_type, table_name):
 
 def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_name, cmd_arg_table_name, rsp_table_name, port, cmd_timeout_secs, param_dict=None, arg=None):
 
-    res_dict = {}
+    res_dicts = update_and_get_response_for_xcvr_cmds(
+        cmd_name, rsp_name, exp_rsp, cmd_table_name, cmd_arg_table_name, rsp_table_name, [port], cmd_timeout_secs, param_dict, arg)
+
+    return res_dicts[port]
+
+
+def update_and_get_response_for_xcvr_cmds(cmd_name, rsp_name, exp_rsp, cmd_table_name, cmd_arg_table_name, rsp_table_name, ports, cmd_timeout_secs, param_dict=None, arg=None):
+    """
+    Post cmd_name for all the ports at once and collect the responses of
+    xcvrd through one subscriber per namespace, until every port responded
+    or cmd_timeout_secs elapsed. Returns port -> res_dict, res_dict[0] being
+    0 if the port responded exp_rsp and res_dict[1] the response of the port.
+    """
+
+    res_dicts = {}
     state_db, appl_db = {}, {}
     firmware_rsp_tbl, firmware_rsp_tbl_keys = {}, {}
     firmware_rsp_sub_tbl = {}
@@ -95,44 +109,50 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
             firmware_rsp_tbl[asic_id]._del(key)
         sel.addSelectable(firmware_rsp_sub_tbl[asic_id])
 
-    rc = CONFIG_FAIL
-    res_dict[0] = CONFIG_FAIL
-    res_dict[1] = 'unknown'
+    # ports waiting for a response -> asic index
+    pending_ports = {}
 
     logical_port_list = platform_sfputil_helper.get_logical_list()
-    if port not in logical_port_list:
-        click.echo("ERR: This is not a valid port, valid ports ({})".format(", ".join(logical_port_list)))
-        res_dict[0] = rc
-        return res_dict
-
-    asic_index = None
-    if platform_sfputil is not None:
-        asic_index = platform_sfputil_helper.get_asic_id_for_logical_port(port)
-    if asic_index is None:
-        # TODO this import is only for unit test purposes, and should be removed once sonic_platform_base
-        # is fully mocked
-        import sonic_platform_base.sonic_sfp.sfputilhelper
-        asic_index = sonic_platform_base.sonic_sfp.sfputilhelper.SfpUtilHelper().get_asic_id_for_logical_port(port)
+    for port in ports:
+        res_dicts[port] = {0: CONFIG_FAIL, 1: 'unknown'}
+
+        if port not in logical_port_list:
+            click.echo("ERR: This is not a valid port, valid ports ({})".format(", ".join(logical_port_list)))
+            continue
+
+        asic_index = None
+        if platform_sfputil is not None:
+            asic_index = platform_sfputil_helper.get_asic_id_for_logical_port(port)
         if asic_index is None:
-            click.echo("Got invalid asic index for port {}, cant perform firmware cmd".format(port))
-            res_dict[0] = rc
-            return res_dict
+            # TODO this import is only for unit test purposes, and should be removed once sonic_platform_base
+            # is fully mocked
+            import sonic_platform_base.sonic_sfp.sfputilhelper
+            asic_index = sonic_platform_base.sonic_sfp.sfputilhelper.SfpUtilHelper().get_asic_id_for_logical_port(port)
+            if asic_index is None:
+                click.echo("Got invalid asic index for port {}, cant perform firmware cmd".format(port))
+                continue
+
+        pending_ports[port] = asic_index
+
+    if not pending_ports:
+        return res_dicts
 
     if arg is None:
         cmd_arg = "null"
     else:
         cmd_arg = str(arg)
 
-    if param_dict is not None:
-        for key, value in param_dict.items():
-            fvs = swsscommon.FieldValuePairs([(str(key), str(value))])
-            firmware_cmd_arg_tbl[asic_index].set(port, fvs)
+    for port, asic_index in pending_ports.items():
+        if param_dict is not None:
+            for key, value in param_dict.items():
+                fvs = swsscommon.FieldValuePairs([(str(key), str(value))])
+                firmware_cmd_arg_tbl[asic_index].set(port, fvs)
 
-    fvs = swsscommon.FieldValuePairs([(cmd_name, cmd_arg)])
-    firmware_cmd_tbl[asic_index].set(port, fvs)
+        fvs = swsscommon.FieldValuePairs([(cmd_name, cmd_arg)])
+        firmware_cmd_tbl[asic_index].set(port, fvs)
 
-    # Listen indefinitely for changes to the HW_MUX_CABLE_TABLE in the Application DB's
-    while True:
+    # Listen for the responses to the STATE_DB's response table until every port responded
+    while pending_ports:
         # Use timeout to prevent ignoring the signals we want to handle
         # in signal_handler() (e.g. SIGTERM for graceful shutdown)
 
@@ -141,7 +161,7 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
         time_now = time.time()
         time_diff = time_now - time_start
         if time_diff >= CMD_TIMEOUT_SECS:
-            return res_dict
+            break
 
         if state == swsscommon.Select.TIMEOUT:
             # Do not flood log when select times out
@@ -159,20 +179,13 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
 
         (port_m, op_m, fvp_m) = firmware_rsp_sub_tbl[asic_index].pop()
 
-        if not port_m:
-            click.echo("Did not receive a port response {}".format(port))
-            res_dict[1] = 'unknown'
-            res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
-            break
-
-        if port_m != port:
-
-            res_dict[1] = 'unknown'
-            res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
+        # a response of another port, or of a port which already responded
+        if not port_m or pending_ports.get(port_m) != asic_index:
             continue
 
+        del pending_ports[port_m]
+        res_dict = res_dicts[port_m]
+
         if fvp_m:
 
             fvp_dict = dict(fvp_m)
@@ -186,23 +199,18 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
                 else:
                     res_dict[1] = result
                     res_dict[0] = CONFIG_FAIL
-
-                firmware_rsp_tbl[asic_index]._del(port)
-                break
             else:
                 res_dict[1] = 'unknown'
                 res_dict[0] = CONFIG_FAIL
-                firmware_rsp_tbl[asic_index]._del(port)
-                break
         else:
             res_dict[1] = 'unknown'
             res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
-            break
+        firmware_rsp_tbl[asic_index]._del(port_m)
 
     delete_all_keys_in_db_table("STATE_DB", rsp_table_name)
 
-    return res_dict
+    return res_dicts
+
 
 def get_value_for_key_in_config_tbl(config_db, port, key, table):
     info_dict = {}
@@ -701,6 +709,7 @@ def state(db, state, port):
         logical_port_list = platform_sfputil_helper.get_logical_list()
 
         rc_exit = 0
+        mux_ports = []
 
         for port in logical_port_list:
 
@@ -725,17 +734,20 @@ def state(db, state, port):
             if port != logical_port_list_per_port[0]:
                 continue
 
-            res_dict = {}
-            res_dict[0] = CONFIG_FAIL
-            res_dict[1] = 'unknown'
+            mux_ports.append(port)
 
-            res_dict = update_and_get_response_for_xcvr_cmd(
-                "config", "result", "True", "XCVRD_CONFIG_HWMODE_DIR_CMD", None, "XCVRD_CONFIG_HWMODE_DIR_RSP", port, 1, None, state)
+        # toggle all the cables at once
+        res_dicts = {}
+        if mux_ports:
+            res_dicts = update_and_get_response_for_xcvr_cmds(
+                "config", "result", "True", "XCVRD_CONFIG_HWMODE_DIR_CMD", None, "XCVRD_CONFIG_HWMODE_DIR_RSP", mux_ports,
+                get_xcvr_batch_timeout(1, len(mux_ports)), None, state)
 
-            rc = res_dict[0]
+        delete_all_keys_in_db_table("APPL_DB", "XCVRD_CONFIG_HWMODE_DIR_CMD")
+        delete_all_keys_in_db_table("STATE_DB", "XCVRD_CONFIG_HWMODE_DIR_RSP")
 
-            delete_all_keys_in_db_table("APPL_DB", "XCVRD_CONFIG_HWMODE_DIR_CMD")
-            delete_all_keys_in_db_table("STATE_DB", "XCVRD_CONFIG_HWMODE_DIR_RSP")
+        for port in mux_ports:
+            rc = res_dicts[port][0]
 
             port = platform_sfputil_helper.get_interface_alias(port, db)
 
@@ -788,6 +800,7 @@ def setswitchmode(db, state, port):
         logical_port_list = platform_sfputil_helper.get_logical_list()
 
         rc_exit = 0
+        mux_ports = []
 
         for port in logical_port_list:
 
@@ -812,16 +825,20 @@ def setswitchmode(db, state, port):
             if port != logical_port_list_per_port[0]:
                 continue
 
-            res_dict = {}
-            res_dict[0] = CONFIG_FAIL
-            res_dict[1] = "unknown"
-            res_dict = update_and_get_response_for_xcvr_cmd(
-                "config", "result", "True", "XCVRD_CONFIG_HWMODE_SWMODE_CMD", None, "XCVRD_CONFIG_HWMODE_SWMODE_RSP", port, 1, None, state)
+            mux_ports.append(port)
 
-            rc = res_dict[0]
+        # switch the mode of all the cables at once
+        res_dicts = {}
+        if mux_ports:
+            res_dicts = update_and_get_response_for_xcvr_cmds(
+                "config", "result", "True", "XCVRD_CONFIG_HWMODE_SWMODE_CMD", None, "XCVRD_CONFIG_HWMODE_SWMODE_RSP", mux_ports,
+                get_xcvr_batch_timeout(1, len(mux_ports)), None, state)
+
+        delete_all_keys_in_db_table("APPL_DB", "XCVRD_CONFIG_HWMODE_SWMODE_CMD")
+        delete_all_keys_in_db_table("STATE_DB", "XCVRD_CONFIG_HWMODE_SWMODE_RSP")
 
-            delete_all_keys_in_db_table("APPL_DB", "XCVRD_CONFIG_HWMODE_SWMODE_CMD")
-            delete_all_keys_in_db_table("STATE_DB", "XCVRD_CONFIG_HWMODE_SWMODE_RSP")
+        for port in mux_ports:
+            rc = res_dicts[port][0]
 
             port = platform_sfputil_helper.get_interface_alias(port, db)
 
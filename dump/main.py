@@ -5,7 +5,7 @@ import re
 import click
 from tabulate import tabulate
 from sonic_py_common import multi_asic
-from utilities_common.constants import DEFAULT_NAMESPACE
+from utilities_common.constants import DEFAULT_NAMESPACE, DEFAULT_DUMP_MAX_WORKERS, DUMP_MAX_WORKERS_ENV
 from dump.match_infra import RedisSource, JsonSource, MatchEngine, CONN
 from swsscommon.swsscommon import ConfigDBConnector
 from dump import plugins
@@ -30,7 +30,7 @@ def show_modules(ctx, param, value):
 @click.group()
 @click.pass_context
 def dump(ctx):
-    ctx.obj = MatchEngine()
+    ctx.obj = MatchEngine(batch_mode=True)
 
 
 @dump.command()
@@ -80,12 +80,18 @@ def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
     params = {}
     collected_info = {}
     params['namespace'] = namespace
-    for arg in ids:
-        params[plugins.dump_modules[module].ARG_NAME] = arg
+    if identifier == "all":
         try:
-            collected_info[arg] = obj.execute(params)
+            collected_info = obj.execute_many(ids, namespace, get_max_workers())
         except ValueError as err:
             click.fail(f"Failed to execute plugin: {err}")
+    else:
+        for arg in ids:
+            params[plugins.dump_modules[module].ARG_NAME] = arg
+            try:
+                collected_info[arg] = obj.execute(params)
+            except ValueError as err:
+                click.fail(f"Failed to execute plugin: {err}")
 
     if len(db) > 0:
         collected_info = filter_out_dbs(db, collected_info)
@@ -93,7 +99,7 @@ def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
     vidtorid = extract_rid(collected_info, namespace, ctx.obj.conn_pool)
 
     if not key_map:
-        collected_info = populate_fv(collected_info, module, namespace, ctx.obj.conn_pool)
+        collected_info = populate_fv(collected_info, module, namespace, ctx.obj.conn_pool, ctx.obj)
 
     for id in vidtorid.keys():
         collected_info[id]["ASIC_DB"]["vidtorid"] = vidtorid[id]
@@ -103,6 +109,17 @@ def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
     return
 
 
+def get_max_workers():
+    """
+    Number of threads executing the plugins which can't prefetch their tables
+    when dumping all the identifiers, overridden by SONIC_DUMP_MAX_WORKERS
+    """
+    try:
+        return max(1, int(os.environ.get(DUMP_MAX_WORKERS_ENV, DEFAULT_DUMP_MAX_WORKERS)))
+    except ValueError:
+        return DEFAULT_DUMP_MAX_WORKERS
+
+
 def extract_rid(info, ns, conn_pool):
     r = RedisSource(conn_pool)
     r.connect("ASIC_DB", ns)
@@ -145,20 +162,28 @@ def filter_out_dbs(db_list, collected_info):
     return collected_info
 
 
-def populate_fv(info, module, namespace, conn_pool):
-    all_dbs = set()
+def populate_fv(info, module, namespace, conn_pool, match_engine=None):
+    """
+    Replace the keys in info with their field-values. The keys of a db are
+    read in one pipelined fetch, field-values already read by match_engine
+    while matching are reused from its cache.
+    """
+    all_dbs = {}
     for id in info.keys():
         for db_name in info[id].keys():
-            all_dbs.add(db_name)
+            all_dbs.setdefault(db_name, []).extend(info[id][db_name]["keys"])
 
+    fv_cache = match_engine.fv_cache if isinstance(match_engine, MatchEngine) else None
     db_cfg_file = JsonSource()
-    for db_name in all_dbs:
+    db_redis = RedisSource(conn_pool, fv_cache)
+    all_fvs = {}
+    for db_name, keys in all_dbs.items():
         if db_name == "CONFIG_FILE":
             db_cfg_file.connect(plugins.dump_modules[module].CONFIG_FILE, namespace)
+            all_fvs[db_name] = db_cfg_file.get_many(db_name, keys)
         else:
-            conn_pool.get(db_name, namespace)
-    
-    db_conn = conn_pool.cache.get(namespace, {}).get(CONN, None)
+            db_redis.connect(db_name, namespace)
+            all_fvs[db_name] = db_redis.get_many(db_name, keys)
 
     final_info = {}
     for id in info.keys():
@@ -168,11 +193,7 @@ def populate_fv(info, module, namespace, conn_pool):
             final_info[id][db_name]["keys"] = []
             final_info[id][db_name]["tables_not_found"] = info[id][db_name]["tables_not_found"]
             for key in info[id][db_name]["keys"]:
-                if db_name == "CONFIG_FILE":
-                    fv = db_cfg_file.get(db_name, key)
-                else:
-                    fv = db_conn.get_all(db_name, key)
-                final_info[id][db_name]["keys"].append({key: fv})
+                final_info[id][db_name]["keys"].append({key: dict(all_fvs[db_name][key])})
 
     return final_info
 
@@ -6,6 +6,7 @@ from dump.helper import verbose_print
 from swsscommon.swsscommon import SonicV2Connector, SonicDBConfig
 from sonic_py_common import multi_asic
 from utilities_common.constants import DEFAULT_NAMESPACE
+from utilities_common.bulk_db import BulkReader
 
 # Constants
 CONN = "conn"
@@ -162,17 +163,31 @@ class SourceAdapter(ABC):
     def hgetall(self, db, key):
         raise NotImplementedError
 
+    def get_many(self, db, keys):
+        """ Return a dict of key -> field-values for every key in keys """
+        return {key: self.get(db, key) for key in keys}
+
 
 class RedisSource(SourceAdapter):
-    """ Concrete Adaptor Class for connecting to Redis Data Sources """
+    """
+    Concrete Adaptor Class for connecting to Redis Data Sources
+
+    get_many pipelines the HGETALLs of a batch of keys. When a fv_cache dict
+    is provided, the fetched field-values are kept in it, keyed by
+    (namespace, db, key), and later requests for the same keys are served
+    from the cache.
+    """
 
-    def __init__(self, conn_pool):
+    def __init__(self, conn_pool, fv_cache=None):
         self.conn = None
+        self.ns = None
         self.pool = conn_pool
+        self.fv_cache = fv_cache
 
     def connect(self, db, ns):
         try:
             self.conn = self.pool.get(db, ns)
+            self.ns = ns
         except Exception as e:
             verbose_print("RedisSource: Connection Failed\n" + str(e))
             return False
@@ -193,6 +208,17 @@ class RedisSource(SourceAdapter):
     def hgetall(self, db, key):
         return self.conn.get_all(db, key)
 
+    def get_many(self, db, keys):
+        keys = list(dict.fromkeys(keys))
+        if self.fv_cache is None:
+            return BulkReader(self.conn, db).get_all_many(keys)
+
+        missing = [key for key in keys if (self.ns, db, key) not in self.fv_cache]
+        if missing:
+            for key, fvs in BulkReader(self.conn, db).get_all_many(missing).items():
+                self.fv_cache[(self.ns, db, key)] = fvs
+        return {key: self.fv_cache[(self.ns, db, key)] for key in keys}
+
 
 class JsonSource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to JSON Data Sources """
@@ -236,6 +262,80 @@ class JsonSource(SourceAdapter):
         return self.json_data.get(table, {}).get(key)
 
 
+class TableSnapshot:
+    """
+    In-memory copy of every key of one table, read once by MatchEngine.load_tables.
+    Field indexes are built on the first lookup and kept with the snapshot.
+    """
+
+    def __init__(self, table, sep, fvs):
+        self.table = table
+        self.sep = sep
+        self.fvs = fvs
+        self.keys = list(fvs.keys())
+        self.indexes = {}
+
+    def find(self, field, value, match_entire_list):
+        """ Return the keys whose field matches value, same criteria as MatchEngine """
+        index = self.indexes.get((field, match_entire_list))
+        if index is None:
+            index = {}
+            for key in self.keys:
+                f_values = self.fvs[key].get(field)
+                if not f_values:
+                    continue
+                if "," in f_values and not match_entire_list:
+                    f_value = f_values.split(",")
+                else:
+                    f_value = [f_values]
+                for item in dict.fromkeys(f_value):
+                    index.setdefault(item, []).append(key)
+            self.indexes[(field, match_entire_list)] = index
+        return index.get(value, [])
+
+
+class SnapshotSource(SourceAdapter):
+    """ Concrete Adaptor Class serving the requests from TableSnapshot objects """
+
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+
+    def connect(self, db, ns):
+        return True
+
+    def get_separator(self, db):
+        return SonicDBConfig.getSeparator(db)
+
+    def getKeys(self, db, table, key_pattern):
+        snapshot = self.snapshots[table]
+        if key_pattern == "*":
+            return snapshot.keys
+        if not any(c in key_pattern for c in "*?[\\"):
+            key = table + snapshot.sep + key_pattern
+            return [key] if key in snapshot.fvs else []
+        # https://docs.python.org/3.7/library/fnmatch.html
+        kp = table + snapshot.sep + key_pattern.replace("[^", "[!")
+        return fnmatch.filter(snapshot.keys, kp)
+
+    def find(self, db, table, field, value, match_entire_list):
+        return self.snapshots[table].find(field, value, match_entire_list)
+
+    def __get_fvs(self, key):
+        for snapshot in self.snapshots.values():
+            if key in snapshot.fvs:
+                return snapshot.fvs[key]
+        return {}
+
+    def get(self, db, key):
+        return dict(self.__get_fvs(key))
+
+    def hget(self, db, key, field):
+        return self.__get_fvs(key).get(field)
+
+    def hgetall(self, db, key):
+        return dict(self.__get_fvs(key))
+
+
 class ConnectionPool:
     """ Caches SonicV2Connector objects for effective reuse """
     def __init__(self):
@@ -277,17 +377,54 @@ class MatchEngine:
     Usage Guidelines:
     1) Instantiate the class once for the entire execution,
                 to effectively use the caching of redis connection objects
+    2) With batch_mode set, the field-values needed to filter the keys and to
+       fill the response are read with pipelined HGETALLs and cached in
+       fv_cache for the lifetime of the engine. Use fetch_many to submit
+       several requests at once, their reads are pipelined per db and namespace.
+    3) Tables loaded with load_tables are read once and the requests on them
+       are then served from memory, until clear_snapshots is called.
     """
-    def __init__(self, pool=None):
+    def __init__(self, pool=None, batch_mode=False):
         if not isinstance(pool, ConnectionPool):
             self.conn_pool = ConnectionPool()
         else:
             self.conn_pool = pool
+        self.batch_mode = batch_mode
+        self.fv_cache = {}
+        self.snapshots = {}
 
     def clear_cache(self, ns):
         self.conn_pool(ns)
 
+    def clear_fv_cache(self):
+        self.fv_cache.clear()
+
+    def fork(self):
+        """ Return a new engine with the same settings and its own connections """
+        return MatchEngine(batch_mode=self.batch_mode)
+
+    def load_tables(self, db, tables, ns=DEFAULT_NAMESPACE):
+        """
+        Read every key of the tables with pipelined HGETALLs and keep them in memory.
+        The field-values are also saved in fv_cache.
+        """
+        src = RedisSource(self.conn_pool, self.fv_cache)
+        if not src.connect(db, ns):
+            return False
+        sep = src.get_separator(db)
+        snapshots = self.snapshots.setdefault((ns, db), {})
+        for table in tables:
+            keys = src.getKeys(db, table, "*") or []
+            snapshots[table] = TableSnapshot(table, sep, src.get_many(db, keys))
+            verbose_print("MatchEngine: Loaded {} keys of {} from {}".format(len(keys), table, db))
+        return True
+
+    def clear_snapshots(self):
+        self.snapshots.clear()
+
     def get_redis_source_adapter(self):
+        if self.batch_mode:
+            return RedisSource(self.conn_pool, self.fv_cache)
         return RedisSource(self.conn_pool)
 
     def get_json_source_adapter(self):
@@ -296,7 +433,10 @@ class MatchEngine:
     def __get_source_adapter(self, req):
         src = None
         d_src = ""
-        if req.db:
+        if req.db and req.table in self.snapshots.get((req.ns, req.db), {}):
+            d_src = req.db
+            src = SnapshotSource(self.snapshots[(req.ns, req.db)])
+        elif req.db:
             d_src = req.db
             src = self.get_redis_source_adapter()
         else:
@@ -313,14 +453,29 @@ class MatchEngine:
         verbose_print("MatchEngine: \n" + template['error'])
         return template
 
+    def __use_batch(self, req):
+        return self.batch_mode and bool(req.db)
+
+    def __needs_fvs(self, req):
+        return bool(req.field) or not req.just_keys or len(req.return_fields) > 0
+
     def __filter_out_keys(self, src, req, all_matched_keys):
         # TODO: Custom Callbacks for Complex Matching Criteria
         if not req.field:
             return all_matched_keys
 
+        if isinstance(src, SnapshotSource) and req.key_pattern == "*":
+            return src.find(req.db, req.table, req.field, req.value, req.match_entire_list)
+
+        if self.__use_batch(req):
+            fvs = src.get_many(req.db, all_matched_keys)
+
         filtered_keys = []
         for key in all_matched_keys:
-            f_values = src.hget(req.db, key, req.field)
+            if self.__use_batch(req):
+                f_values = fvs[key].get(req.field)
+            else:
+                f_values = src.hget(req.db, key, req.field)
             if not f_values:
                 continue
             if "," in f_values and not req.match_entire_list:
@@ -332,6 +487,18 @@ class MatchEngine:
         return filtered_keys
 
     def __fill_template(self, src, req, filtered_keys, template):
+        if self.__use_batch(req) and self.__needs_fvs(req):
+            fvs = src.get_many(req.db, filtered_keys)
+            for key in filtered_keys:
+                if not req.just_keys:
+                    template["keys"].append({key: dict(fvs[key])})
+                else:
+                    template["keys"].append(key)
+                    if len(req.return_fields) > 0:
+                        template["return_values"][key] = {field: fvs[key].get(field) for field in req.return_fields}
+            verbose_print("Return Values:" + str(template["return_values"]))
+            return template
+
         for key in filtered_keys:
             temp = {}
             if not req.just_keys:
@@ -347,30 +514,67 @@ class MatchEngine:
         verbose_print("Return Values:" + str(template["return_values"]))
         return template
 
-    def fetch(self, req):
-        """ Given a request obj, find its match in the data source provided """
+    def __match_keys(self, req):
+        """ Validate the request and return (error template, source, matched keys) """
         if not isinstance(req, MatchRequest):
-            return self.__display_error(EXCEP_DICT["INV_REQ"])
+            return self.__display_error(EXCEP_DICT["INV_REQ"]), None, []
 
         verbose_print(str(req))
 
         if not req.key_pattern:
-            return self.__display_error(EXCEP_DICT["NO_KEY"])
+            return self.__display_error(EXCEP_DICT["NO_KEY"]), None, []
 
         d_src, src = self.__get_source_adapter(req)
         if not src.connect(d_src, req.ns):
-            return self.__display_error(EXCEP_DICT["CONN_ERR"])
+            return self.__display_error(EXCEP_DICT["CONN_ERR"]), None, []
 
-        template = self.__create_template()
         all_matched_keys = src.getKeys(req.db, req.table, req.key_pattern)
         if not all_matched_keys:
-            return self.__display_error(EXCEP_DICT["NO_MATCHES"])
+            return self.__display_error(EXCEP_DICT["NO_MATCHES"]), None, []
+        return None, src, all_matched_keys
+
+    def __prefetch(self, matched):
+        """
+        Read the field-values of every matched key of the batched requests,
+        one pipelined fetch per db and namespace
+        """
+        pending = {}
+        for req, src, keys in matched:
+            if self.__use_batch(req) and self.__needs_fvs(req) and isinstance(src, RedisSource):
+                entry = pending.setdefault((req.ns, req.db), (src, []))
+                entry[1].extend(keys)
+        for (ns, db), (src, keys) in pending.items():
+            src.get_many(db, keys)
+
+    def fetch_many(self, reqs):
+        """
+        Given a list of request objs, return the list of their matches.
+        In batch mode the redis reads of all the requests are pipelined.
+        """
+        results = [None] * len(reqs)
+        matched = []
+        for idx, req in enumerate(reqs):
+            err, src, all_matched_keys = self.__match_keys(req)
+            if err:
+                results[idx] = err
+            else:
+                matched.append((idx, req, src, all_matched_keys))
 
-        filtered_keys = self.__filter_out_keys(src, req, all_matched_keys)
-        verbose_print("Filtered Keys:" + str(filtered_keys))
-        if not filtered_keys:
-            return self.__display_error(EXCEP_DICT["NO_ENTRIES"])
-        return self.__fill_template(src, req, filtered_keys, template)
+        if self.batch_mode:
+            self.__prefetch([(req, src, keys) for _, req, src, keys in matched])
+
+        for idx, req, src, all_matched_keys in matched:
+            filtered_keys = self.__filter_out_keys(src, req, all_matched_keys)
+            verbose_print("Filtered Keys:" + str(filtered_keys))
+            if not filtered_keys:
+                results[idx] = self.__display_error(EXCEP_DICT["NO_ENTRIES"])
+            else:
+                results[idx] = self.__fill_template(src, req, filtered_keys, self.__create_template())
+        return results
+
+    def fetch(self, req):
+        """ Given a request obj, find its match in the data source provided """
+        return self.fetch_many([req])[0]
 
 
 class MatchRequestOptimizer():
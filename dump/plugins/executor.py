@@ -1,4 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dump.match_infra import MatchEngine
 
 
@@ -10,6 +12,7 @@ class Executor(ABC):
 
     ARG_NAME = "id"  # Arg Identifier
     CONFIG_FILE = ""  # Path to config file, if any
+    PREFETCH_TABLES = {}  # db -> tables read once by execute_many, if any
 
     def __init__(self, match_engine=None):
         if not isinstance(match_engine, MatchEngine):
@@ -25,7 +28,55 @@ class Executor(ABC):
     @abstractmethod
     def get_all_args(self, ns):
         pass
-    
+
+    def get_params(self, arg, ns):
+        return {self.ARG_NAME: arg, "namespace": ns}
+
+    def prefetch(self, ns):
+        """ Read the PREFETCH_TABLES of the namespace into the MatchEngine """
+        for db, tables in self.PREFETCH_TABLES.items():
+            self.match_engine.load_tables(db, tables, ns)
+
+    def execute_many(self, ids, ns, max_workers=1):
+        """
+        Execute the plugin for every id and return a dict of id -> result.
+
+        Plugins listing their tables in PREFETCH_TABLES have them read once
+        and every id is then resolved from memory. The others are executed
+        in a pool of max_workers threads, each with its own MatchEngine.
+        """
+        if self.PREFETCH_TABLES:
+            try:
+                self.prefetch(ns)
+                return {arg: self.execute(self.get_params(arg, ns)) for arg in ids}
+            finally:
+                self.match_engine.clear_snapshots()
+        return self.execute_concurrently(ids, ns, max_workers)
+
+    def execute_concurrently(self, ids, ns, max_workers):
+        if max_workers <= 1 or len(ids) <= 1:
+            return {arg: self.execute(self.get_params(arg, ns)) for arg in ids}
+
+        local = threading.local()
+        engines = []
+        lock = threading.Lock()
+
+        def execute(arg):
+            # Plugin objects keep per-execution state, one per worker thread
+            if not hasattr(local, "plugin"):
+                engine = self.match_engine.fork()
+                with lock:
+                    engines.append(engine)
+                local.plugin = type(self)(engine)
+            return local.plugin.execute(local.plugin.get_params(arg, ns))
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as pool:
+            results = list(pool.map(execute, ids))
+        # Let the caller reuse the field-values read by the workers
+        for engine in engines:
+            self.match_engine.fv_cache.update(engine.fv_cache)
+        return dict(zip(ids, results))
+
     def add_to_ret_template(self, table, db, keys, err, add_to_tables_not_found=True):
         if db not in self.ret_temp:
             return []
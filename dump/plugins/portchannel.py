@@ -9,6 +9,13 @@ class Portchannel(Executor):
     Debug Dump Plugin for PortChannel/LAG Module
     """
     ARG_NAME = "portchannel_name"
+    PREFETCH_TABLES = {
+        "CONFIG_DB": ["PORTCHANNEL", "PORTCHANNEL_MEMBER"],
+        "APPL_DB": ["LAG_TABLE"],
+        "STATE_DB": ["LAG_TABLE"],
+        "ASIC_DB": ["ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF", "ASIC_STATE:SAI_OBJECT_TYPE_LAG_MEMBER",
+                    "ASIC_STATE:SAI_OBJECT_TYPE_LAG"]
+    }
 
     def __init__(self, match_engine=None):
         super().__init__(match_engine)
@@ -8,6 +8,7 @@ NH = "ASIC_STATE:SAI_OBJECT_TYPE_NEXT_HOP"
 NH_GRP = "ASIC_STATE:SAI_OBJECT_TYPE_NEXT_HOP_GROUP"
 RIF = "ASIC_STATE:SAI_OBJECT_TYPE_ROUTER_INTERFACE"
 CPU_PORT = "ASIC_STATE:SAI_OBJECT_TYPE_PORT"
+ROUTE_ENTRY = "ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY"
 
 OID_HEADERS = {
     NH: "0x40",
@@ -21,7 +22,7 @@ def get_route_pattern(dest):
     return "*\"dest\":\"" + dest + "\"*"
 
 
-def get_vr_oid(asic_route_entry):
+def get_route_entry_dict(asic_route_entry):
     """
     Route Entry Format: ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY:
     {'dest':'::0','switch_id':'oid:0x21000000000000','vr':'oid:0x3000000000002'}
@@ -33,7 +34,11 @@ def get_vr_oid(asic_route_entry):
             key_dict = json.loads(matches[0])
         except Exception as e:
             pass
-    return key_dict.get("vr", "")
+    return key_dict
+
+
+def get_vr_oid(asic_route_entry):
+    return get_route_entry_dict(asic_route_entry).get("vr", "")
 
 
 class Route(Executor):
@@ -41,6 +46,12 @@ class Route(Executor):
     Debug Dump Plugin for Route Module
     """
     ARG_NAME = "destination_network"
+    PREFETCH_TABLES = {
+        "CONFIG_DB": ["STATIC_ROUTE"],
+        "APPL_DB": ["ROUTE_TABLE", "CLASS_BASED_NEXT_HOP_GROUP_TABLE", "NEXTHOP_GROUP_TABLE"],
+        "ASIC_DB": [ROUTE_ENTRY, "ASIC_STATE:SAI_OBJECT_TYPE_VIRTUAL_ROUTER", NH, NH_GRP,
+                    "ASIC_STATE:SAI_OBJECT_TYPE_NEXT_HOP_GROUP_MEMBER", RIF, CPU_PORT]
+    }
 
     def __init__(self, match_engine=None):
         super().__init__(match_engine)
@@ -57,6 +68,7 @@ class Route(Executor):
         self.dest_net = ''
         self.nh_id = ''
         self.nh_type = ''
+        self.route_entries = None
 
     def get_all_args(self, ns=""):
         req = MatchRequest(db="APPL_DB", table="ROUTE_TABLE", key_pattern="*", ns=self.ns)
@@ -64,6 +76,24 @@ class Route(Executor):
         all_routes = ret.get("keys", [])
         return [key[len("ROUTE_TABLE:"):] for key in all_routes]
 
+    def prefetch(self, ns):
+        """
+        The ASIC route entries are looked up with a glob on their dest, index
+        them by dest once so that every route is resolved with an exact key
+        """
+        super().prefetch(ns)
+        req = MatchRequest(db="ASIC_DB", table=ROUTE_ENTRY, key_pattern="*", ns=ns)
+        self.route_entries = {}
+        for key in self.match_engine.fetch(req)["keys"]:
+            dest = get_route_entry_dict(key).get("dest")
+            self.route_entries.setdefault(dest, []).append(key[len(ROUTE_ENTRY) + 1:])
+
+    def execute_many(self, ids, ns, max_workers=1):
+        try:
+            return super().execute_many(ids, ns, max_workers)
+        finally:
+            self.route_entries = None
+
     def execute(self, params):
         self.ret_temp = create_template_dict(dbs=["CONFIG_DB", "APPL_DB", "ASIC_DB"])
         self.dest_net = params[Route.ARG_NAME]
@@ -120,7 +150,15 @@ class Route(Executor):
 
     def init_asic_route_entry_info(self):
         nh_id_field = "SAI_ROUTE_ENTRY_ATTR_NEXT_HOP_ID"
-        req = MatchRequest(db="ASIC_DB", table="ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY", key_pattern=get_route_pattern(self.dest_net),
+        key_pattern = get_route_pattern(self.dest_net)
+        if self.route_entries is not None:
+            entries = self.route_entries.get(self.dest_net, [])
+            if not entries:
+                self.ret_temp["ASIC_DB"]["tables_not_found"].append(ROUTE_ENTRY)
+                return "", ""
+            if len(entries) == 1:
+                key_pattern = entries[0]
+        req = MatchRequest(db="ASIC_DB", table=ROUTE_ENTRY, key_pattern=key_pattern,
                            ns=self.ns, return_fields=[nh_id_field])
         ret = self.match_engine.fetch(req)
         keys = self.add_to_ret_template(req.table, req.db, ret["keys"], ret["error"])
@@ -6,7 +6,13 @@ from dump.match_helper import fetch_vlan_oid
 class Vlan(Executor):
     
     ARG_NAME = "vlan_name"
-    
+    PREFETCH_TABLES = {
+        "CONFIG_DB": ["VLAN"],
+        "APPL_DB": ["VLAN_TABLE"],
+        "STATE_DB": ["VLAN_TABLE"],
+        "ASIC_DB": ["ASIC_STATE:SAI_OBJECT_TYPE_VLAN"]
+    }
+
     def __init__(self, match_engine=None):
         super().__init__(match_engine)
         self.ret_temp = {}
@@ -39,6 +39,7 @@ class PatchApplier:
     def apply(self, patch, sort=True):
         self.logger.log_notice("Patch application starting.")
         self.logger.log_notice(f"Patch: {patch}")
+        self.config_wrapper.validation_stats.reset()
 
         # Get old config
         self.logger.log_notice("Getting current config db.")
@@ -92,6 +93,7 @@ class PatchApplier:
         if not(self.patch_wrapper.verify_same_json(target_config, new_config)):
             raise GenericConfigUpdaterError(f"After applying patch to config, there are still some parts not updated")
 
+        self.logger.log_notice(f"Config validation: {self.config_wrapper.validation_stats}.")
         self.logger.log_notice("Patch application completed.")
 
 class ConfigReplacer:
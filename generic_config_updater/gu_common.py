@@ -9,6 +9,8 @@ import yang as ly
 import copy
 import re
 import os
+import time
+from collections import OrderedDict
 from sonic_py_common import logger
 from enum import Enum
 
@@ -51,10 +53,32 @@ class JsonChange:
             return self.patch == other.patch
         return False
 
+class ValidationStats:
+    """
+    Counts the config validations done by a ConfigWrapper and the time spent in them.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.validations = 0
+        self.cache_hits = 0
+        self.validation_time = 0.0
+
+    def __str__(self):
+        return f"{self.validations} validation{'s' if self.validations != 1 else ''} " \
+               f"({self.cache_hits} cached) in {self.validation_time:.3f}s"
+
 class ConfigWrapper:
+    VALIDATION_CACHE_SIZE = 1024
+
     def __init__(self, yang_dir = YANG_DIR):
         self.yang_dir = YANG_DIR
         self.sonic_yang_with_loaded_models = None
+        # Validation results keyed by the content hashes of all the tables of the validated config,
+        # or by the content hash of the whole config given by the caller
+        self.validation_cache = OrderedDict()
+        self.validation_stats = ValidationStats()
 
     def get_config_db_as_json(self):
         text = self._get_config_db_as_text()
@@ -122,7 +146,33 @@ class ConfigWrapper:
         except sonic_yang.SonicYangException as ex:
             return False, ex
 
-    def validate_config_db_config(self, config_db_as_json):
+    def validate_config_db_config(self, config_db_as_json, config_hash=None):
+        """
+        Validates the config against the YANG models, the results are cached by the content of the config.
+        config_hash is a content hash of the config already known by the caller, e.g. updated from the hash of the
+        config a move was applied to. It is used as the cache key instead of hashing every table of the config.
+        """
+        start_time = time.time()
+        self.validation_stats.validations += 1
+        try:
+            if config_hash is not None:
+                cache_key = config_hash
+            else:
+                cache_key = frozenset(self._get_table_hashes(config_db_as_json).items())
+            if cache_key in self.validation_cache:
+                self.validation_stats.cache_hits += 1
+                self.validation_cache.move_to_end(cache_key)
+                return self.validation_cache[cache_key]
+
+            result = self._validate_config_db_config(config_db_as_json)
+            self.validation_cache[cache_key] = result
+            if len(self.validation_cache) > self.VALIDATION_CACHE_SIZE:
+                self.validation_cache.popitem(last=False)
+            return result
+        finally:
+            self.validation_stats.validation_time += time.time() - start_time
+
+    def _validate_config_db_config(self, config_db_as_json):
         sy = self.create_sonic_yang_with_loaded_models()
 
         # TODO: Move these validators to YANG models
@@ -145,6 +195,9 @@ class ConfigWrapper:
 
         return True, None
 
+    def _get_table_hashes(self, config_db_as_json):
+        return {table: hash(json.dumps(content, sort_keys=True)) for table, content in config_db_as_json.items()}
+
     def validate_field_operation(self, old_config, target_config):
         """
         Some fields in ConfigDB are restricted and may not allow third-party addition, replacement, or removal. 
@@ -6,18 +6,58 @@ from enum import Enum
 from .gu_common import OperationWrapper, OperationType, GenericConfigUpdaterError, \
                        JsonChange, PathAddressing, genericUpdaterLogging
 
+# Marks a config node that does not exist
+_MISSING = object()
+_HASH_MASK = (1 << 64) - 1
+
+def _get_node(config, tokens):
+    for token in tokens:
+        if isinstance(config, dict):
+            if token not in config:
+                return _MISSING
+            config = config[token]
+        else:
+            return _MISSING
+    return config
+
+def _node_hash(node, tokens):
+    """
+    Returns the hash of the node at tokens, as the sum of the hashes of every dict it contains and every leaf
+    under it paired with its path. Summing makes the hash independent of the order of dict keys, and lets a
+    config hash be updated by subtracting the hash of a replaced node and adding the hash of its replacement.
+    Lists are hashed as leaves as their items are not addressable by a stable path.
+    """
+    if node is _MISSING:
+        return 0
+
+    if not isinstance(node, dict):
+        return hash((tokens, json.dumps(node, sort_keys=True))) & _HASH_MASK
+
+    node_hash = hash((tokens, "{}"))
+    for key, value in node.items():
+        node_hash += _node_hash(value, tokens + (key,))
+    return node_hash & _HASH_MASK
+
 class Diff:
     """
     A class that contains the diff info between current and target configs.
+
+    The hashes of current and target configs are computed once, and updated per changed path when a move is
+    applied. Moves do not modify the configs themselves, they replace the dicts along the changed path, so a
+    config can be shared by several diffs, and a diff updated in place can be restored by undo_move.
     """
     def __init__(self, current_config, target_config):
         self.current_config = current_config
         self.target_config = target_config
+        self.current_config_hash = None
+        self.target_config_hash = None
 
     def __hash__(self):
-        cc = json.dumps(self.current_config, sort_keys=True)
-        tc = json.dumps(self.target_config, sort_keys=True)
-        return hash((cc,tc))
+        if self.current_config_hash is None:
+            self.current_config_hash = _node_hash(self.current_config, ())
+        if self.target_config_hash is None:
+            self.target_config_hash = _node_hash(self.target_config, ())
+        return hash((self.current_config_hash, self.target_config_hash))
 
     def __eq__(self, other):
         """Overrides the default implementation"""
@@ -26,14 +66,41 @@ class Diff:
 
         return False
 
-    # TODO: Can be optimized to apply the move in place. JsonPatch supports that using the option 'in_place=True'
-    # Check: https://python-json-patch.readthedocs.io/en/latest/tutorial.html#applying-a-patch
-    # NOTE: in case move is applied in place, we will need to support `undo_move` as well.
     def apply_move(self, move):
-        new_current_config = move.apply(self.current_config)
-        return Diff(new_current_config, self.target_config)
+        new_current_config, changed_tokens = move.apply_with_changed_tokens(self.current_config)
+        new_diff = Diff(new_current_config, self.target_config)
+        new_diff.current_config_hash = self._get_updated_hash(changed_tokens, new_current_config)
+        new_diff.target_config_hash = self.target_config_hash
+        return new_diff
+
+    def apply_move_in_place(self, move):
+        """
+        Applies the move to this diff, returns the state to be passed to undo_move to revert it.
+        """
+        undo_state = (self.current_config, self.current_config_hash)
+        new_current_config, changed_tokens = move.apply_with_changed_tokens(self.current_config)
+        self.current_config_hash = self._get_updated_hash(changed_tokens, new_current_config)
+        self.current_config = new_current_config
+        return undo_state
+
+    def undo_move(self, undo_state):
+        self.current_config, self.current_config_hash = undo_state
+
+    def _get_updated_hash(self, changed_tokens, new_current_config):
+        if self.current_config_hash is None:
+            return None
+
+        changed_tokens = tuple(changed_tokens)
+        old_node = _get_node(self.current_config, changed_tokens)
+        new_node = _get_node(new_current_config, changed_tokens)
+        return (self.current_config_hash
+                - _node_hash(old_node, changed_tokens)
+                + _node_hash(new_node, changed_tokens)) & _HASH_MASK
 
     def has_no_diff(self):
+        if self.current_config_hash is not None and self.target_config_hash is not None and \
+           self.current_config_hash != self.target_config_hash:
+            return False
         return self.current_config == self.target_config
 
     def __str__(self):
@@ -272,7 +339,66 @@ class JsonMove:
         return JsonMove(diff, op_type, current_config_tokens, target_config_tokens)
 
     def apply(self, config):
-        return self.patch.apply(config)
+        """
+        Returns config after applying the move. The given config is not modified, and the parts of it not changed by
+        the move are shared with the returned config instead of being copied. So neither config should be modified
+        in place afterwards.
+        """
+        new_config, _ = self.apply_with_changed_tokens(config)
+        return new_config
+
+    def apply_with_changed_tokens(self, config):
+        """
+        Same as apply, but also returns the tokens of the node replaced by the move. The node is the one the move
+        path points at, or the list containing it if the path refers to a list item.
+        """
+        tokens = PathAddressing().get_path_tokens(self.path)
+
+        # Walk down the dicts along the path, stop at the first list or at the first missing key
+        node = config
+        depth = 0
+        for token in tokens:
+            if not isinstance(node, dict):
+                break
+            depth += 1
+            if token not in node:
+                node = _MISSING
+                break
+            node = node[token]
+
+        if not isinstance(node, (dict, list)) and depth < len(tokens) or \
+           node is _MISSING and (depth < len(tokens) or self.op_type != OperationType.ADD) or \
+           self.op_type == OperationType.REMOVE and not tokens:
+            # Invalid path, let JsonPatch report the error
+            return self.patch.apply(config), tokens
+
+        changed_tokens = tokens[:depth]
+        if depth < len(tokens):
+            # path refers to a list item, replace the list as a whole
+            relative_path = PathAddressing().create_path(tokens[depth:])
+            operation = OperationWrapper().create(self.op_type, relative_path, copy.deepcopy(self.value))
+            new_node = jsonpatch.JsonPatch([operation]).apply(node)
+        elif self.op_type == OperationType.REMOVE:
+            new_node = _MISSING
+        else:
+            new_node = copy.deepcopy(self.value)
+
+        return JsonMove._replace_node(config, changed_tokens, new_node), changed_tokens
+
+    @staticmethod
+    def _replace_node(config, tokens, new_node):
+        if not tokens:
+            return new_node
+
+        new_config = dict(config)
+        if len(tokens) == 1:
+            if new_node is _MISSING:
+                del new_config[tokens[0]]
+            else:
+                new_config[tokens[0]] = new_node
+        else:
+            new_config[tokens[0]] = JsonMove._replace_node(config[tokens[0]], tokens[1:], new_node)
+        return new_config
 
     def __str__(self):
         return str(self.patch)
@@ -346,6 +472,12 @@ class MoveWrapper:
     def simulate(self, move, diff):
         return diff.apply_move(move)
 
+    def simulate_in_place(self, move, diff):
+        return diff.apply_move_in_place(move)
+
+    def undo_simulate(self, undo_state, diff):
+        diff.undo_move(undo_state)
+
     def _generate_moves(self, diff):
         for generator in self.move_generators:
             for move in generator.generate(diff):
@@ -681,8 +813,13 @@ class FullConfigMoveValidator:
         self.config_wrapper = config_wrapper
 
     def validate(self, move, diff):
-        simulated_config = move.apply(diff.current_config)
-        is_valid, error = self.config_wrapper.validate_config_db_config(simulated_config)
+        # The hash of the simulated config is updated from the one of the current config, per changed path,
+        # so looking up the validation cache does not go over the whole config
+        if diff.current_config_hash is None:
+            diff.current_config_hash = _node_hash(diff.current_config, ())
+        simulated_diff = diff.apply_move(move)
+        is_valid, error = self.config_wrapper.validate_config_db_config(simulated_diff.current_config,
+                                                                       simulated_diff.current_config_hash)
         return is_valid
 
 class CreateOnlyMoveValidator:
@@ -1552,8 +1689,11 @@ class DfsSorter:
 
         for move in moves:
             if self.move_wrapper.validate(move, diff):
-                new_diff = self.move_wrapper.simulate(move, diff)
-                new_moves = self.sort(new_diff)
+                undo_state = self.move_wrapper.simulate_in_place(move, diff)
+                try:
+                    new_moves = self.sort(diff)
+                finally:
+                    self.move_wrapper.undo_simulate(undo_state, diff)
                 if new_moves is not None:
                     return [move] + new_moves
 
@@ -1616,8 +1756,11 @@ class MemoizationSorter:
         bst_moves = None
         for move in moves:
             if self.move_wrapper.validate(move, diff):
-                new_diff = self.move_wrapper.simulate(move, diff)
-                new_moves = self.sort(new_diff)
+                undo_state = self.move_wrapper.simulate_in_place(move, diff)
+                try:
+                    new_moves = self.sort(diff)
+                finally:
+                    self.move_wrapper.undo_simulate(undo_state, diff)
                 if new_moves != None and (bst_moves is None or len(bst_moves) > len(new_moves)+1):
                     bst_moves = [move] + new_moves
 
@@ -8,13 +8,23 @@ The verification procedure here uses JSON schemas to verify the DB entities.
 
 In future, to verify new tables or their content, just the schema modification is needed.
 No modification may be needed to the integrity check logic.
+
+Only the tables named in the "required" and "properties" of a schema are read from the
+DB, in every namespace, and validated in the same format as the sonic-db-dump output.
 """
 
 import os, sys
-import json, jsonschema
+import jsonschema
 import syslog
-import subprocess
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from sonic_py_common import multi_asic
+from swsscommon.swsscommon import SonicV2Connector
+from utilities_common import constants
+from utilities_common.general import load_db_config
+from utilities_common.multi_asic import multi_asic_max_workers
 
 DB_SCHEMA = {
     "COUNTERS_DB":
@@ -30,38 +40,78 @@ DB_SCHEMA = {
 }
 
 
+def get_schema_tables(schema):
+    """
+    Return the tables a schema validates, the required ones first
+    """
+    tables = list(schema.get("required", [])) + list(schema.get("properties", {}))
+    return list(dict.fromkeys(tables))
+
+
+def fetch_tables(namespace, db_name, tables):
+    """
+    Read the tables of db_name in namespace, in the format of sonic-db-dump:
+    { <table>: { "type": "hash", "value": { <field>: <value> } } }
+    Tables that do not exist are left out.
+    Return the tables and a list of (table, seconds taken) pairs.
+    """
+    db = SonicV2Connector(use_unix_socket_path=True, namespace=namespace)
+    db.connect(db_name)
+
+    db_data = {}
+    timings = []
+    for table in tables:
+        start = time.monotonic()
+        if db.exists(db_name, table):
+            db_data[table] = {"type": "hash", "value": dict(db.get_all(db_name, table))}
+        timings.append((table, time.monotonic() - start))
+    return db_data, timings
+
+
+def check_db(namespace, db_name, schema):
+    """
+    Validate db_name of namespace against its schema.
+    Return (rc, timings).
+    """
+    db_data, timings = fetch_tables(namespace, db_name, get_schema_tables(schema))
+
+    # What: Validate if critical tables and entries are present in DB.
+    # Why: This is needed to avoid warmbooting with a bad DB; which can
+    #   potentially trigger failures in the reboot recovery path.
+    # How: Validate DB against a schema which defines required tables.
+    try:
+        jsonschema.validate(instance=db_data, schema=schema)
+    except jsonschema.exceptions.ValidationError as err:
+        syslog.syslog(syslog.LOG_ERR, "Database {}{} is missing tables/entries needed for reboot procedure. ".format(
+            db_name, " of namespace " + namespace if namespace else "") +\
+            "DB integrity check failed with:\n{}".format(str(err.message)))
+        return 1, timings
+    return 0, timings
+
+
 def main():
     if not DB_SCHEMA:
         return 0
 
-    for db_name, schema in DB_SCHEMA.items():
-        db_dump_file = "/tmp/{}.json".format(db_name)
-        dump_db_cmd = ["sonic-db-dump", "-n", 'COUNTERS_DB', "-y"]
-        with open(db_dump_file, 'w') as f:
-            p = subprocess.Popen(dump_db_cmd, text=True, stdout=f, stderr=subprocess.PIPE)
-        (_, err) = p.communicate()
-        rc = p.wait()
-        if rc != 0:
-            print("Failed to dump db {}. Return code: {} with err: {}".format(db_name, rc, err))
-
-        try:
-            with open(db_dump_file) as fp:
-                db_dump_data = json.load(fp)
-        except ValueError as err:
-            syslog.syslog(syslog.LOG_DEBUG, "DB json file is not a valid json file. " +\
-                "Error: {}".format(str(err)))
-            return 1
-
-        # What: Validate if critical tables and entries are present in DB.
-        # Why: This is needed to avoid warmbooting with a bad DB; which can
-        #   potentially trigger failures in the reboot recovery path.
-        # How: Validate DB against a schema which defines required tables.
-        try:
-            jsonschema.validate(instance=db_dump_data, schema=schema)
-        except jsonschema.exceptions.ValidationError as err:
-            syslog.syslog(syslog.LOG_ERR, "Database is missing tables/entries needed for reboot procedure. " +\
-                "DB integrity check failed with:\n{}".format(str(err.message)))
-            return 1
+    load_db_config()
+    jobs = [(namespace, db_name, schema)
+            for db_name, schema in DB_SCHEMA.items()
+            for namespace in multi_asic.get_namespace_list()]
+
+    # The namespaces and DBs are checked in parallel, unless SONIC_CLI_NS_MAX_WORKERS says otherwise
+    max_workers = min(multi_asic_max_workers(constants.DEFAULT_NS_PARALLEL_MAX_WORKERS), len(jobs))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda job: check_db(*job), jobs))
+
+    res = 0
+    for (namespace, db_name, _), (rc, timings) in zip(jobs, results):
+        for table, secs in timings:
+            syslog.syslog(syslog.LOG_INFO, "DB integrity check of {}{} {} took {:.3f} seconds".format(
+                db_name, "@" + namespace if namespace else "", table, secs))
+        res = res or rc
+    if res:
+        return res
+
     syslog.syslog(syslog.LOG_DEBUG, "Database integrity checks passed.")
     return 0
 
@@ -9,23 +9,19 @@ mux ports should have correct neighbor/route entry in ASIC.
 import argparse
 import enum
 import functools
+import hashlib
 import ipaddress
 import json
 import logging
-import shlex
+import redis
 import sys
 import syslog
-import subprocess
 import tabulate
 
 from natsort import natsorted
 
 from swsscommon import swsscommon
-from sonic_py_common import daemon_base
-try:
-    from swsssdk import port_util
-except ImportError:
-    from sonic_py_common import port_util
+from utilities_common.asic_object_map import get_asic_object_maps
 
 
 DB_READ_SCRIPT = """
@@ -153,7 +149,8 @@ result['asic_neigh_table']  = asic_neighbor_table
 return redis.status_reply(cjson.encode(result))
 """
 
-DB_READ_SCRIPT_CONFIG_DB_KEY = "_DUALTOR_NEIGHBOR_CHECK_SCRIPT_SHA1"
+# redis caches the scripts by the sha1 of their body
+DB_READ_SCRIPT_SHA1 = hashlib.sha1(DB_READ_SCRIPT.encode()).hexdigest()
 ZERO_MAC = "00:00:00:00:00:00"
 NEIGHBOR_ATTRIBUTES = ["NEIGHBOR", "MAC", "PORT", "MUX_STATE", "IN_MUX_TOGGLE", "NEIGHBOR_IN_ASIC", "TUNNEL_IN_ASIC", "HWSTATUS"]
 NOT_AVAILABLE = "N/A"
@@ -276,43 +273,41 @@ def config_logging(args):
         WRITE_LOG_DEBUG = functools.partial(write_syslog, SyslogLevel.DEBUG)
 
 
-def run_command(cmd):
-    """Runs a command and returns its output."""
-    WRITE_LOG_DEBUG("Running command: %s", cmd)
+class LazyJson(object):
+    """Dumps obj as json only when the log message is formatted."""
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return json.dumps(self.obj, indent=4)
+
+
+def get_redis_client(db_name="APPL_DB"):
+    """Return a redis client connected to the redis instance of db_name."""
+    return redis.Redis(
+        host=swsscommon.SonicDBConfig.getDbHostname(db_name),
+        port=swsscommon.SonicDBConfig.getDbPort(db_name),
+        db=swsscommon.SonicDBConfig.getDbId(db_name),
+        decode_responses=True
+    )
+
+
+def run_db_read_script(redis_client):
+    """Runs the db read script, loading it only if redis has not cached it yet."""
     try:
-        p = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        (output, _) = p.communicate()
-    except Exception as details:
-        raise RuntimeError("Failed to run command: %s", details)
-    WRITE_LOG_DEBUG("Command output: %s", output)
-    WRITE_LOG_DEBUG("Command return code: %s", p.returncode)
-    if p.returncode != 0:
-        raise RuntimeError("Command failed with return code %s: %s" % (p.returncode, output))
-    return output.decode()
-
-
-def redis_cli(redis_cmd):
-    """Call a redis command with return error check."""
-    run_cmd = "sudo redis-cli %s" % redis_cmd
-    result = run_command(run_cmd).strip()
-    if "error" in result or "ERR" in result:
-        raise RuntimeError("Redis command '%s' failed: %s" % (redis_cmd, result))
-    return result
-
-
-def read_tables_from_db(appl_db):
+        return redis_client.evalsha(DB_READ_SCRIPT_SHA1, 0)
+    except redis.exceptions.NoScriptError:
+        WRITE_LOG_INFO("loading script sha1: %s", DB_READ_SCRIPT_SHA1)
+        # EVAL caches the script for the next EVALSHA
+        return redis_client.eval(DB_READ_SCRIPT, 0)
+
+
+def read_tables_from_db(redis_client):
     """Reads required tables from db."""
-    # NOTE: let's cache the db read script sha1 in APPL_DB under
-    # key "_DUALTOR_NEIGHBOR_CHECK_SCRIPT_SHA1"
-    db_read_script_sha1 = appl_db.get(DB_READ_SCRIPT_CONFIG_DB_KEY)
-    if not db_read_script_sha1:
-        redis_load_cmd = "SCRIPT LOAD \"%s\"" % DB_READ_SCRIPT
-        db_read_script_sha1 = redis_cli(redis_load_cmd).strip()
-        WRITE_LOG_INFO("loaded script sha1: %s", db_read_script_sha1)
-        appl_db.set(DB_READ_SCRIPT_CONFIG_DB_KEY, db_read_script_sha1)
-
-    redis_run_cmd = "EVALSHA %s 0" % db_read_script_sha1
-    result = redis_cli(redis_run_cmd).strip()
+    result = run_db_read_script(redis_client)
+    if isinstance(result, bytes):
+        result = result.decode()
     tables = json.loads(result)
 
     neighbors = tables["neighbors"]
@@ -321,28 +316,19 @@ def read_tables_from_db(appl_db):
     asic_fdb = {k: v.lstrip("oid:0x") for k, v in tables["asic_fdb"].items()}
     asic_route_table = tables["asic_route_table"]
     asic_neigh_table = tables["asic_neigh_table"]
-    WRITE_LOG_DEBUG("neighbors: %s", json.dumps(neighbors, indent=4))
-    WRITE_LOG_DEBUG("mux states: %s", json.dumps(mux_states, indent=4))
-    WRITE_LOG_DEBUG("hw mux states: %s", json.dumps(hw_mux_states, indent=4))
-    WRITE_LOG_DEBUG("ASIC FDB: %s", json.dumps(asic_fdb, indent=4))
-    WRITE_LOG_DEBUG("ASIC route table: %s", json.dumps(asic_route_table, indent=4))
-    WRITE_LOG_DEBUG("ASIC neigh table: %s", json.dumps(asic_neigh_table, indent=4))
+    WRITE_LOG_DEBUG("neighbors: %s", LazyJson(neighbors))
+    WRITE_LOG_DEBUG("mux states: %s", LazyJson(mux_states))
+    WRITE_LOG_DEBUG("hw mux states: %s", LazyJson(hw_mux_states))
+    WRITE_LOG_DEBUG("ASIC FDB: %s", LazyJson(asic_fdb))
+    WRITE_LOG_DEBUG("ASIC route table: %s", LazyJson(asic_route_table))
+    WRITE_LOG_DEBUG("ASIC neigh table: %s", LazyJson(asic_neigh_table))
     return neighbors, mux_states, hw_mux_states, asic_fdb, asic_route_table, asic_neigh_table
 
 
 def get_if_br_oid_to_port_name_map():
     """Return port bridge oid to port name map."""
     db = swsscommon.SonicV2Connector(host="127.0.0.1")
-    try:
-        port_name_map = port_util.get_interface_oid_map(db)[1]
-    except IndexError:
-        port_name_map = {}
-    if_br_oid_map = port_util.get_bridge_port_map(db)
-    if_br_oid_to_port_name_map = {}
-    for if_br_oid, if_oid in if_br_oid_map.items():
-        if if_oid in port_name_map:
-            if_br_oid_to_port_name_map[if_br_oid] = port_name_map[if_oid]
-    return if_br_oid_to_port_name_map
+    return get_asic_object_maps(db).get_if_br_oid_to_port_name_map()
 
 
 def is_dualtor(config_db):
@@ -380,12 +366,21 @@ def get_mac_to_port_name_map(asic_fdb, if_oid_to_port_name_map):
     return mac_to_port_name_map
 
 
+def get_port_mux_state_map(mux_states, hw_mux_states):
+    """Return port name to (mux state, in mux toggle) map of the ports with both mux states."""
+    return {
+        port: (mux_state, mux_state != hw_mux_states[port])
+        for port, mux_state in mux_states.items() if port in hw_mux_states
+    }
+
+
 def check_neighbor_consistency(neighbors, mux_states, hw_mux_states, mac_to_port_name_map,
                                asic_route_table, asic_neigh_table, mux_server_to_port_map):
     """Checks if neighbors are consistent with mux states."""
 
     asic_route_destinations = set(json.loads(_)["dest"].split("/")[0] for _ in asic_route_table)
     asic_neighs = set(json.loads(_)["ip"] for _ in asic_neigh_table)
+    port_mux_state_map = get_port_mux_state_map(mux_states, hw_mux_states)
 
     check_results = []
     for neighbor_ip in natsorted(list(neighbors.keys())):
@@ -407,15 +402,12 @@ def check_neighbor_consistency(neighbors, mux_states, hw_mux_states, mac_to_port
             # 2. neighbor expired, neighbor entry still present in ASIC, no tunnel route in ASIC.
             check_result["HWSTATUS"] = check_result["NEIGHBOR_IN_ASIC"] or check_result["TUNNEL_IN_ASIC"]
         else:
-            port_name = mac_to_port_name_map[mac]
             # NOTE: mux server ips are always fixed to the mux port
-            if neighbor_ip in mux_server_to_port_map:
-                port_name = mux_server_to_port_map[neighbor_ip]
-            mux_state = mux_states[port_name]
-            hw_mux_state = hw_mux_states[port_name]
+            port_name = mux_server_to_port_map.get(neighbor_ip) or mac_to_port_name_map[mac]
+            mux_state, in_mux_toggle = port_mux_state_map[port_name]
             check_result["PORT"] = port_name
             check_result["MUX_STATE"] = mux_state
-            check_result["IN_MUX_TOGGLE"] = mux_state != hw_mux_state
+            check_result["IN_MUX_TOGGLE"] = in_mux_toggle
 
             if mux_state == "active":
                 check_result["HWSTATUS"] = (check_result["NEIGHBOR_IN_ASIC"] and (not check_result["TUNNEL_IN_ASIC"]))
@@ -480,7 +472,6 @@ if __name__ == "__main__":
 
     config_db = swsscommon.ConfigDBConnector(use_unix_socket_path=False)
     config_db.connect()
-    appl_db = daemon_base.db_connect("APPL_DB")
 
     mux_cables = get_mux_cable_config(config_db)
 
@@ -490,7 +481,7 @@ if __name__ == "__main__":
 
     mux_server_to_port_map = get_mux_server_to_port_map(mux_cables)
     if_oid_to_port_name_map = get_if_br_oid_to_port_name_map()
-    neighbors, mux_states, hw_mux_states, asic_fdb, asic_route_table, asic_neigh_table = read_tables_from_db(appl_db)
+    neighbors, mux_states, hw_mux_states, asic_fdb, asic_route_table, asic_neigh_table = read_tables_from_db(get_redis_client())
     mac_to_port_name_map = get_mac_to_port_name_map(asic_fdb, if_oid_to_port_name_map)
 
     check_results = check_neighbor_consistency(
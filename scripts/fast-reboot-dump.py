@@ -6,6 +6,7 @@ import socket
 import struct
 import sys
 import os
+import time
 from fcntl import ioctl
 import binascii
 import argparse
@@ -13,41 +14,76 @@ import syslog
 import traceback
 import ipaddress
 from builtins import str #for unicode conversion in python2
+from contextlib import contextmanager
+from utilities_common.asic_object_map import OID_PREFIX, read_bridge_ports_and_vlans
+from utilities_common.bulk_db import BulkReader, ASIC_FDB_ENTRY_PREFIX
 
 
 ARP_CHUNK = binascii.unhexlify('08060001080006040001') # defines a part of the packet for ARP Request
 ARP_PAD = binascii.unhexlify('00' * 18)
 
+FDB_TYPES = {
+  'SAI_FDB_ENTRY_TYPE_DYNAMIC': 'dynamic',
+  'SAI_FDB_ENTRY_TYPE_STATIC' : 'static'
+}
+FDB_FIELDS = ['SAI_FDB_ENTRY_ATTR_TYPE', 'SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID']
+
+@contextmanager
+def timed_phase(name):
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        syslog.syslog(syslog.LOG_INFO, "Phase %s took %.3f seconds" % (name, time.monotonic() - start))
+
+def write_json_list(filename, entries):
+    # Same output as json.dump(list(entries), fp, indent=2, separators=(',', ': ')),
+    # written one entry at a time to a temporary file, which replaces filename
+    # only once all the entries were written
+    tmp_filename = filename + '.tmp'
+    try:
+        with open(tmp_filename, 'w') as fp:
+            first = True
+            for entry in entries:
+                fp.write('[\n  ' if first else ',\n  ')
+                fp.write(json.dumps(entry, indent=2, separators=(',', ': ')).replace('\n', '\n  '))
+                first = False
+            fp.write('[]' if first else '\n]')
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
 def generate_neighbor_entries(filename, all_available_macs):
     db = SonicV2Connector(use_unix_socket_path=False)
     db.connect(db.APPL_DB, False)   # Make one attempt only
 
-    arp_output = []
     neighbor_entries = []
-    keys = db.keys(db.APPL_DB, 'NEIGH_TABLE:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        vlan_name = key.split(':')[1]
-        entry = db.get_all(db.APPL_DB, key)
-        mac = entry['neigh'].lower()
-        if (vlan_name, mac) not in all_available_macs:
-            # FIXME: print me to log
-            continue
-        obj = {
-          key: entry,
-          'OP': 'SET'
-        }
-        arp_output.append(obj)
-
-        ip_addr = key.split(':', 2)[2]
-        neighbor_entries.append((vlan_name, mac, ip_addr))
-        syslog.syslog(syslog.LOG_INFO, "Neighbor entry: [Vlan: %s, Mac: %s, Ip: %s]" % (vlan_name, mac, ip_addr))
+    reader = BulkReader(db, db.APPL_DB)
+    keys = reader.scan_keys('NEIGH_TABLE:*')
+
+    def arp_output():
+        for key, entry in reader.iter_batches(keys, lambda client, key: client.hgetall(key)):
+            entry = dict(entry or {})
+            vlan_name = key.split(':')[1]
+            mac = entry['neigh'].lower()
+            if (vlan_name, mac) not in all_available_macs:
+                # FIXME: print me to log
+                continue
+            yield {
+              key: entry,
+              'OP': 'SET'
+            }
+
+            ip_addr = key.split(':', 2)[2]
+            neighbor_entries.append((vlan_name, mac, ip_addr))
+            syslog.syslog(syslog.LOG_INFO, "Neighbor entry: [Vlan: %s, Mac: %s, Ip: %s]" % (vlan_name, mac, ip_addr))
+
+    write_json_list(filename, arp_output())
 
     db.close(db.APPL_DB)
 
-    with open(filename, 'w') as fp:
-        json.dump(arp_output, fp, indent=2, separators=(',', ': '))
-
     return neighbor_entries
 
 def is_mac_unicast(mac):
@@ -61,74 +97,68 @@ def get_vlan_ifaces():
 
     return vlans
 
-def get_bridge_port_id_2_port_id(db):
+def get_asic_objects(reader, object_type):
+    prefix = 'ASIC_STATE:%s:' % object_type
+    objects = reader.get_all_many(reader.scan_keys(prefix + 'oid:*'))
+    return {key.replace(prefix, ''): value for key, value in objects.items()}
+
+def get_bridge_port_id_2_port_id(bridge_ports):
     bridge_port_id_2_port_id = {}
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
-        port_type = value['SAI_BRIDGE_PORT_ATTR_TYPE']
+    for bridge_id, (port_id, port_type) in bridge_ports.items():
         if port_type != 'SAI_BRIDGE_PORT_TYPE_PORT':
             continue
-        port_id = value['SAI_BRIDGE_PORT_ATTR_PORT_ID']
         # ignore admin status
-        bridge_id = key.replace('ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:', '')
-        bridge_port_id_2_port_id[bridge_id] = port_id
+        bridge_port_id_2_port_id[OID_PREFIX + bridge_id] = OID_PREFIX + port_id
 
     return bridge_port_id_2_port_id
 
-def get_lag_by_member(member_name, app_db):
+def get_map_lag_member_2_lag_name(app_db):
+    lag_member_2_lag = {}
     keys = app_db.keys(app_db.APPL_DB, 'LAG_MEMBER_TABLE:*')
     keys = [] if keys is None else keys
     for key in keys:
         _, lag_name, lag_member_name = key.split(":")
-        if lag_member_name == member_name:
-            return lag_name
-    return None
+        lag_member_2_lag.setdefault(lag_member_name, lag_name)
+    return lag_member_2_lag
 
-def get_map_host_port_id_2_iface_name(asic_db):
+def get_map_host_port_id_2_iface_name(reader):
     host_port_id_2_iface = {}
-    keys = asic_db.keys(asic_db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_HOSTIF:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = asic_db.get_all(asic_db.ASIC_DB, key)
+    for value in get_asic_objects(reader, 'SAI_OBJECT_TYPE_HOSTIF').values():
         if value['SAI_HOSTIF_ATTR_TYPE'] != 'SAI_HOSTIF_TYPE_NETDEV':
             continue
         port_id = value['SAI_HOSTIF_ATTR_OBJ_ID']
         iface_name = value['SAI_HOSTIF_ATTR_NAME']
         host_port_id_2_iface[port_id] = iface_name
-    
+
     return host_port_id_2_iface
 
-def get_map_lag_port_id_2_portchannel_name(asic_db, app_db, host_port_id_2_iface):
+def get_map_lag_port_id_2_portchannel_name(reader, app_db, host_port_id_2_iface):
     lag_port_id_2_iface = {}
-    keys = asic_db.keys(asic_db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_LAG_MEMBER:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = asic_db.get_all(asic_db.ASIC_DB, key)
+    lag_member_2_lag = get_map_lag_member_2_lag_name(app_db)
+    for value in get_asic_objects(reader, 'SAI_OBJECT_TYPE_LAG_MEMBER').values():
         lag_id = value['SAI_LAG_MEMBER_ATTR_LAG_ID']
         if lag_id in lag_port_id_2_iface:
             continue
         member_id = value['SAI_LAG_MEMBER_ATTR_PORT_ID']
         member_name = host_port_id_2_iface[member_id]
-        lag_name = get_lag_by_member(member_name, app_db)
+        lag_name = lag_member_2_lag.get(member_name)
         if lag_name is not None:
             lag_port_id_2_iface[lag_id] = lag_name
 
     return lag_port_id_2_iface
 
-def get_map_port_id_2_iface_name(asic_db, app_db):
+def get_map_port_id_2_iface_name(reader, app_db):
     port_id_2_iface = {}
-    host_port_id_2_iface = get_map_host_port_id_2_iface_name(asic_db)
+    host_port_id_2_iface = get_map_host_port_id_2_iface_name(reader)
     port_id_2_iface.update(host_port_id_2_iface)
-    lag_port_id_2_iface = get_map_lag_port_id_2_portchannel_name(asic_db, app_db, host_port_id_2_iface)
+    lag_port_id_2_iface = get_map_lag_port_id_2_portchannel_name(reader, app_db, host_port_id_2_iface)
     port_id_2_iface.update(lag_port_id_2_iface)
 
     return port_id_2_iface
 
-def get_map_bridge_port_id_2_iface_name(asic_db, app_db):
-    bridge_port_id_2_port_id = get_bridge_port_id_2_port_id(asic_db)
-    port_id_2_iface = get_map_port_id_2_iface_name(asic_db, app_db)
+def get_map_bridge_port_id_2_iface_name(reader, app_db, bridge_ports):
+    bridge_port_id_2_port_id = get_bridge_port_id_2_port_id(bridge_ports)
+    port_id_2_iface = get_map_port_id_2_iface_name(reader, app_db)
 
     bridge_port_id_2_iface_name = {}
 
@@ -140,54 +170,64 @@ def get_map_bridge_port_id_2_iface_name(asic_db, app_db):
 
     return bridge_port_id_2_iface_name
 
-def get_vlan_oid_by_vlan_id(db, vlan_id):
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        value = db.get_all(db.ASIC_DB, key)
-        if 'SAI_VLAN_ATTR_VLAN_ID' in value and int(value['SAI_VLAN_ATTR_VLAN_ID']) == vlan_id:
-            return key.replace('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:', '')
-
-    raise Exception('Not found bvi oid for vlan_id: %d' % vlan_id)
-
-def get_fdb(db, vlan_name, vlan_id, bridge_id_2_iface):
-    fdb_types = {
-      'SAI_FDB_ENTRY_TYPE_DYNAMIC': 'dynamic',
-      'SAI_FDB_ENTRY_TYPE_STATIC' : 'static'
-    }
-
-    bvid = get_vlan_oid_by_vlan_id(db, vlan_id)
-    available_macs = set()
-    map_mac_ip = {}
-    fdb_entries = []
-    keys = db.keys(db.ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:{*\"bvid\":\"%s\"*}' % bvid)
-    keys = [] if keys is None else keys
-    for key in keys:
-        key_obj = json.loads(key.replace('ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:', ''))
-        mac = str(key_obj['mac'])
-        if not is_mac_unicast(mac):
-            continue
-        available_macs.add((vlan_name, mac.lower()))
-        fdb_mac = mac.replace(':', '-')
-        # get attributes
-        value = db.get_all(db.ASIC_DB, key)
-        fdb_type = fdb_types[value['SAI_FDB_ENTRY_ATTR_TYPE']]
-        if value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID'] not in bridge_id_2_iface:
-            continue
-        fdb_port = bridge_id_2_iface[value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID']]
-
-        obj = {
-          'FDB_TABLE:Vlan%d:%s' % (vlan_id, fdb_mac) : {
-            'type': fdb_type,
-            'port': fdb_port,
-          },
-          'OP': 'SET'
-        }
-
-        fdb_entries.append(obj)
-        map_mac_ip[mac.lower()] = fdb_port
-
-    return fdb_entries, available_macs, map_mac_ip
+def get_map_vlan_id_2_bvid(bvid_vlan_map):
+    vlan_id_2_bvid = {}
+    for bvid, vlan_id in bvid_vlan_map.items():
+        if vlan_id is not None:
+            vlan_id_2_bvid.setdefault(int(vlan_id), bvid)
+    return vlan_id_2_bvid
+
+def get_map_bvid_2_fdb_macs(reader):
+    bvid_2_fdb_macs = {}
+    for key in reader.scan_keys(ASIC_FDB_ENTRY_PREFIX + '*'):
+        key_obj = json.loads(key.replace(ASIC_FDB_ENTRY_PREFIX, ''))
+        if 'bvid' in key_obj:
+            bvid_2_fdb_macs.setdefault(key_obj['bvid'], []).append((key, str(key_obj['mac'])))
+    return bvid_2_fdb_macs
+
+def iter_fdb_entries(asic_db, app_db, vlan_ifaces, all_available_macs, map_mac_ip_per_vlan):
+    """
+    Yield the FDB_TABLE entries of vlan_ifaces. The VLAN and FDB objects
+    are read once for all the VLANs, in pipelined batches.
+    all_available_macs and map_mac_ip_per_vlan are filled on the way.
+    """
+    reader = BulkReader(asic_db, asic_db.ASIC_DB)
+
+    bridge_ports, bvid_vlan_map, _ = read_bridge_ports_and_vlans(asic_db)
+    bridge_id_2_iface = get_map_bridge_port_id_2_iface_name(reader, app_db, bridge_ports)
+    vlan_id_2_bvid = get_map_vlan_id_2_bvid(bvid_vlan_map)
+    bvid_2_fdb_macs = get_map_bvid_2_fdb_macs(reader)
+
+    vlan_fdb_macs = []
+    for vlan in vlan_ifaces:
+        vlan_id = int(vlan.replace('Vlan', ''))
+        if vlan_id not in vlan_id_2_bvid:
+            raise Exception('Not found bvi oid for vlan_id: %d' % vlan_id)
+        fdb_macs = [(key, mac) for key, mac in bvid_2_fdb_macs.get(vlan_id_2_bvid[vlan_id], []) if is_mac_unicast(mac)]
+        vlan_fdb_macs.append((vlan, vlan_id, fdb_macs))
+
+    fdb_values = reader.get_fields_many((key for _, _, fdb_macs in vlan_fdb_macs for key, _ in fdb_macs), FDB_FIELDS)
+
+    for vlan, vlan_id, fdb_macs in vlan_fdb_macs:
+        map_mac_ip = map_mac_ip_per_vlan[vlan] = {}
+        for key, mac in fdb_macs:
+            all_available_macs.add((vlan, mac.lower()))
+            fdb_mac = mac.replace(':', '-')
+            value = fdb_values[key]
+            fdb_type = FDB_TYPES[value['SAI_FDB_ENTRY_ATTR_TYPE']]
+            if value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID'] not in bridge_id_2_iface:
+                continue
+            fdb_port = bridge_id_2_iface[value['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID']]
+
+            yield {
+              'FDB_TABLE:Vlan%d:%s' % (vlan_id, fdb_mac) : {
+                'type': fdb_type,
+                'port': fdb_port,
+              },
+              'OP': 'SET'
+            }
+
+            map_mac_ip[mac.lower()] = fdb_port
 
 def generate_fdb_entries(filename):
     asic_db = SonicV2Connector(use_unix_socket_path=False)
@@ -197,28 +237,19 @@ def generate_fdb_entries(filename):
 
     vlan_ifaces = get_vlan_ifaces()
 
-    fdb_entries, all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries_logic(asic_db, app_db, vlan_ifaces)
+    all_available_macs = set()
+    map_mac_ip_per_vlan = {}
+    write_json_list(filename, iter_fdb_entries(asic_db, app_db, vlan_ifaces, all_available_macs, map_mac_ip_per_vlan))
 
     asic_db.close(asic_db.ASIC_DB)
     app_db.close(app_db.APPL_DB)
 
-    with open(filename, 'w') as fp:
-        json.dump(fdb_entries, fp, indent=2, separators=(',', ': '))
-
     return all_available_macs, map_mac_ip_per_vlan
 
 def generate_fdb_entries_logic(asic_db, app_db, vlan_ifaces):
-    fdb_entries = []
     all_available_macs = set()
     map_mac_ip_per_vlan = {}
-
-    bridge_id_2_iface = get_map_bridge_port_id_2_iface_name(asic_db, app_db)
-
-    for vlan in vlan_ifaces:
-        vlan_id = int(vlan.replace('Vlan', ''))
-        fdb_entry, available_macs, map_mac_ip_per_vlan[vlan] = get_fdb(asic_db, vlan, vlan_id, bridge_id_2_iface)
-        all_available_macs |= available_macs
-        fdb_entries.extend(fdb_entry)
+    fdb_entries = list(iter_fdb_entries(asic_db, app_db, vlan_ifaces, all_available_macs, map_mac_ip_per_vlan))
 
     return fdb_entries, all_available_macs, map_mac_ip_per_vlan
 
@@ -324,10 +355,8 @@ def generate_media_config(filename):
     db.connect(db.APPL_DB, False)   # Make one attempt only
     media_config= []
     port_serdes_keys = ["preemphasis", "idriver", "ipredriver", "pre1", "pre2", "pre3", "main", "post1", "post2", "post3","attn"]
-    keys = db.keys(db.APPL_DB, 'PORT_TABLE:*')
-    keys = [] if keys is None else keys
-    for key in keys:
-        entry = db.get_all(db.APPL_DB, key)
+    reader = BulkReader(db, db.APPL_DB)
+    for key, entry in reader.get_all_many(reader.scan_keys('PORT_TABLE:*')).items():
         media_attributes = {}
         for attr in entry.keys():
             if attr in port_serdes_keys:
@@ -353,11 +382,16 @@ def main():
     if not os.path.isdir(root_dir):
         print("Target directory '%s' not found" % root_dir)
         return 3
-    all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries(root_dir + '/fdb.json')
-    neighbor_entries = generate_neighbor_entries(root_dir + '/arp.json', all_available_macs)
-    generate_default_route_entries(root_dir + '/default_routes.json')
-    generate_media_config(root_dir + '/media_config.json')
-    send_garp_nd(neighbor_entries, map_mac_ip_per_vlan)
+    with timed_phase('fdb'):
+        all_available_macs, map_mac_ip_per_vlan = generate_fdb_entries(root_dir + '/fdb.json')
+    with timed_phase('arp'):
+        neighbor_entries = generate_neighbor_entries(root_dir + '/arp.json', all_available_macs)
+    with timed_phase('default_routes'):
+        generate_default_route_entries(root_dir + '/default_routes.json')
+    with timed_phase('media_config'):
+        generate_media_config(root_dir + '/media_config.json')
+    with timed_phase('garp_nd'):
+        send_garp_nd(neighbor_entries, map_mac_ip_per_vlan)
     return 0
 
 if __name__ == '__main__':
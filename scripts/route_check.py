@@ -30,6 +30,12 @@ To verify:
         Analyze the reported failures to match expected.
     You may use the exit code to verify the result as success or not.
 
+Watch mode:
+    With --watch, the tool stays subscribed to APPL-DB ROUTE_TABLE &
+    INTF_TABLE and to ASIC-DB, and keeps the diff up to date as the
+    entries are added & removed. Every interval only the outstanding
+    diffs are checked, the tables are read once at startup.
+
 
 
 """
@@ -44,6 +50,7 @@ import sys
 import syslog
 import time
 import signal
+import socket
 import traceback
 from ipaddress import ip_network
 
@@ -110,6 +117,16 @@ def set_level(lvl, log_to_syslog):
         report_level = syslog.LOG_DEBUG
 
 
+def is_level_enabled(lvl):
+    """
+    helper to check if messages of the given level are reported,
+    to skip building expensive messages which would be dropped.
+    :param lvl: Log level as syslog.LOG_*
+    :return True if reported, else False
+    """
+    return lvl <= report_level
+
+
 def print_message(lvl, *args):
     """
     print and log the message for given level.
@@ -118,7 +135,7 @@ def print_message(lvl, *args):
     :return None
     """
     msg = ""
-    if (lvl <= report_level):
+    if is_level_enabled(lvl):
         for arg in args:
             rem_len = PRINT_MSG_LEN_MAX - len(msg)
             if rem_len <= 0:
@@ -174,65 +191,143 @@ def is_default_route(ip):
     return t.is_unspecified and ip.split("/")[1] == "0"
 
 
-def cmps(s1, s2):
-    """
-    helper to compare two strings
-    :param s1: left string
-    :param s2: right string
-    :return comparison result as -1/0/1
-    """
-    if (s1 == s2):
-        return 0
-    if (s1 < s2):
-        return -1
-    return 1
-
-
-def diff_sorted_lists(t1, t2):
-    """
-    helper to compare two sorted lists.
-    :param t1: list 1
-    :param t2: list 2
-    :return (<t1 entries that are not in t2>, <t2 entries that are not in t1>)
-    """
-    t1_x = t2_x = 0
-    t1_miss = []
-    t2_miss = []
-    t1_len = len(t1);
-    t2_len = len(t2);
-    while t1_x < t1_len and t2_x < t2_len:
-        d = cmps(t1[t1_x], t2[t2_x])
-        if (d == 0):
-            t1_x += 1
-            t2_x += 1
-        elif (d < 0):
-            t1_miss.append(t1[t1_x])
-            t1_x += 1
-        else:
-            t2_miss.append(t2[t2_x])
-            t2_x += 1
+def route_key(ip):
+    """
+    helper to normalize an IP with or without prefix into a compact
+    binary key: the packed address followed by the prefix length.
+    Prefixes without length are taken as /32 or /128.
+    :param ip: IP with or without prefix as string
+    :return key as bytes, None for link local IPs
+    """
+    addr, _, plen = ip.partition(PREFIX_SEPARATOR)
+    family = socket.AF_INET6 if IPV6_SEPARATOR in addr else socket.AF_INET
+    try:
+        packed = socket.inet_pton(family, addr)
+    except OSError:
+        raise ValueError("{} is not a valid IP address".format(ip))
 
-    while t1_x < t1_len:
-        t1_miss.append(t1[t1_x])
-        t1_x += 1
+    if family == socket.AF_INET:
+        if packed[:2] == b'\xa9\xfe':
+            # 169.254.0.0/16
+            return None
+        max_plen = 32
+    else:
+        if packed[0] == 0xfe and (packed[1] & 0xc0) == 0x80:
+            # fe80::/10
+            return None
+        max_plen = 128
+    return packed + bytes((int(plen) if plen else max_plen,))
 
-    while t2_x < t2_len:
-        t2_miss.append(t2[t2_x])
-        t2_x += 1
-    return t1_miss, t2_miss
 
+def key_to_route(key):
+    """
+    helper to convert back a key made by route_key
+    :param key: key as bytes
+    :return IP with prefix as string
+    """
+    return "{}{}{}".format(ipaddress.ip_address(key[:-1]), PREFIX_SEPARATOR, key[-1])
 
-def checkout_rt_entry(k):
+
+def keys_to_routes(keys):
     """
-    helper to filter out correct keys and strip out IP alone.
-    :param ip: key to check as string
-    :return (True, ip) or (False, None)
+    helper to convert a set of keys made by route_key
+    :param keys: iterable of keys
+    :return sorted list of IPs with prefix
+    """
+    return sorted(key_to_route(k) for k in keys)
+
+
+def asic_route_key(k):
+    """
+    helper to get the route key of an ASIC-DB route entry
+    :param k: ASIC_STATE key as string
+    :return key as bytes, None if not a route entry or link local
     """
     if k.startswith(ASIC_KEY_PREFIX):
-        e = k.lower().split("\"", -1)[3]
-        if not is_local(e):
-            return True, e
-    return False, None
+        return route_key(k.split("\"", 4)[3])
+    return None
+
+
+def appl_route_key(k):
+    """
+    helper to get the route key of an APPL-DB ROUTE_TABLE key
+    :param k: ROUTE_TABLE key as string
+    :return key as bytes, None if link local
+    """
+    if (is_vrf(k)):
+        k = k.split(":", 1)[1]
+    return route_key(k)
+
+
+def intf_key(k):
+    """
+    helper to get the host route key of an APPL-DB INTF_TABLE key
+    :param k: INTF_TABLE key as string
+    :return key as bytes, None if the key has no IP or is link local
+    """
+    lst = k.split(':', 1)
+    if len(lst) == 1:
+        # No IP address in key; ignore
+        return None
+    return route_key(lst[1].split("/", 1)[0])
+
+
+class RouteDiff(object):
+    """
+    Routes of APPL-DB ROUTE_TABLE, addresses of APPL-DB INTF_TABLE and
+    route entries of ASIC-DB, as keys made by route_key. The routes
+    found in only one of ROUTE_TABLE & ASIC-DB are maintained as the
+    entries are added & removed, so that the diff never needs a rescan.
+    """
+
+    def __init__(self, rt_appl=(), rt_asic=(), intf_appl=()):
+        self.rt_appl = set(rt_appl)
+        self.rt_asic = set(rt_asic)
+        self.intf_appl = set(intf_appl)
+        self.appl_only = self.rt_appl - self.rt_asic
+        self.asic_only = self.rt_asic - self.rt_appl
+
+    def add_appl(self, key):
+        self.rt_appl.add(key)
+        if key in self.rt_asic:
+            self.asic_only.discard(key)
+        else:
+            self.appl_only.add(key)
+
+    def del_appl(self, key):
+        self.rt_appl.discard(key)
+        self.appl_only.discard(key)
+        if key in self.rt_asic:
+            self.asic_only.add(key)
+
+    def add_asic(self, key):
+        self.rt_asic.add(key)
+        if key in self.rt_appl:
+            self.appl_only.discard(key)
+        else:
+            self.asic_only.add(key)
+
+    def del_asic(self, key):
+        self.rt_asic.discard(key)
+        self.asic_only.discard(key)
+        if key in self.rt_appl:
+            self.appl_only.add(key)
+
+    def add_intf(self, key):
+        self.intf_appl.add(key)
+
+    def del_intf(self, key):
+        self.intf_appl.discard(key)
+
+    def get_misses(self):
+        """
+        :return (<ROUTE_TABLE routes missing in ASIC-DB>,
+                 <ASIC-DB routes missing in ROUTE_TABLE & INTF_TABLE>,
+                 <INTF_TABLE addresses missing in ASIC-DB>) as sorted lists
+        """
+        return (keys_to_routes(self.appl_only),
+                keys_to_routes(self.asic_only - self.intf_appl),
+                keys_to_routes(self.intf_appl - self.rt_asic))
 
 
 def get_subscribe_updates(selector, subs):
@@ -254,93 +349,88 @@ def get_subscribe_updates(selector, subs):
             key, op, val = subs.pop()
             if not key:
                 break
-            res, e = checkout_rt_entry(key)
-            if res:
+            k = asic_route_key(key)
+            if k:
                 if op == "SET":
-                    adds.append(e)
+                    adds.append(k)
                 elif op == "DEL":
-                    deletes.append(e)
+                    deletes.append(k)
 
+    adds = keys_to_routes(adds)
+    deletes = keys_to_routes(deletes)
     print_message(syslog.LOG_DEBUG, "adds={}".format(adds))
     print_message(syslog.LOG_DEBUG, "dels={}".format(deletes))
-    return (sorted(adds), sorted(deletes))
+    return (adds, deletes)
 
 
 def is_vrf(k):
     return k.startswith("Vrf")
 
 
+def print_keys(name, keys):
+    """
+    helper to dump a set of route keys at debug level. The dump of a
+    full table is only built when debug messages are reported.
+    """
+    if is_level_enabled(syslog.LOG_DEBUG):
+        print_message(syslog.LOG_DEBUG, json.dumps({name: keys_to_routes(keys)}, indent=4))
+
+
 def get_routes():
     """
     helper to read route table from APPL-DB.
-    :return list of sorted routes with prefix ensured
+    :return set of route keys
     """
     db = swsscommon.DBConnector(APPL_DB_NAME, 0)
     print_message(syslog.LOG_DEBUG, "APPL DB connected for routes")
     tbl = swsscommon.Table(db, 'ROUTE_TABLE')
-    keys = tbl.getKeys()
 
-    valid_rt = []
-    for k in keys:
-        if (is_vrf(k)):
-            k = k.split(":", 1)[1]
+    valid_rt = set(map(appl_route_key, tbl.getKeys()))
+    valid_rt.discard(None)
 
-        if not is_local(k):
-            valid_rt.append(add_prefix_ifnot(k.lower()))
-
-    print_message(syslog.LOG_DEBUG, json.dumps({"ROUTE_TABLE": sorted(valid_rt)}, indent=4))
-    return sorted(valid_rt)
+    print_keys("ROUTE_TABLE", valid_rt)
+    return valid_rt
 
 
 def get_route_entries():
     """
     helper to read present route entries from ASIC-DB and
     as well initiate selector for ASIC-DB:ASIC-state updates.
-    :return (selector,  subscriber, <list of sorted routes>)
+    :return (selector,  subscriber, <set of route keys>)
     """
     db = swsscommon.DBConnector(ASIC_DB_NAME, 0)
     subs = swsscommon.SubscriberStateTable(db, ASIC_TABLE_NAME)
     print_message(syslog.LOG_DEBUG, "ASIC DB connected")
 
-    rt = []
+    rt = set()
     while True:
         k, _, _ = subs.pop()
         if not k:
             break
-        res, e = checkout_rt_entry(k)
-        if res:
-            rt.append(e)
+        rt.add(asic_route_key(k))
+    rt.discard(None)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"ASIC_ROUTE_ENTRY": sorted(rt)}, indent=4))
+    print_keys("ASIC_ROUTE_ENTRY", rt)
 
     selector = swsscommon.Select()
     selector.addSelectable(subs)
-    return (selector, subs, sorted(rt))
+    return (selector, subs, rt)
 
 
 def get_interfaces():
     """
     helper to read interface table from APPL-DB.
-    :return sorted list of IP addresses with added prefix
+    :return set of host route keys of the interface addresses
     """
     db = swsscommon.DBConnector(APPL_DB_NAME, 0)
     print_message(syslog.LOG_DEBUG, "APPL DB connected for interfaces")
     tbl = swsscommon.Table(db, 'INTF_TABLE')
-    keys = tbl.getKeys()
 
-    intf = []
-    for k in keys:
-        lst = re.split(':', k.lower(), maxsplit=1)
-        if len(lst) == 1:
-            # No IP address in key; ignore
-            continue
+    intf = set(map(intf_key, tbl.getKeys()))
+    intf.discard(None)
 
-        ip = add_prefix(lst[1].split("/", -1)[0])
-        if not is_local(ip):
-            intf.append(ip)
-
-    print_message(syslog.LOG_DEBUG, json.dumps({"APPL_DB_INTF": sorted(intf)}, indent=4))
-    return sorted(intf)
+    print_keys("APPL_DB_INTF", intf)
+    return intf
 
 
 def filter_out_local_interfaces(keys):
@@ -434,13 +524,13 @@ def filter_out_vnet_routes(routes):
 
     vnet_routes_db_keys = vnet_route_table.getKeys() + vnet_route_tunnel_table.getKeys()
 
-    vnet_routes = []
+    vnet_routes = set()
 
     for vnet_route_db_key in vnet_routes_db_keys:
         vnet_route_attrs = vnet_route_db_key.split(':', 1)
         vnet_name = vnet_route_attrs[0]
         vnet_route = vnet_route_attrs[1]
-        vnet_routes.append(vnet_route)
+        vnet_routes.add(vnet_route)
 
     updated_routes = []
 
@@ -551,7 +641,8 @@ def get_vlan_neighbors():
             if device.startswith("Vlan"):
                 valid_neighs.append(add_prefix_ifnot(prefix.lower()))
 
-    print_message(syslog.LOG_DEBUG, "Vlan neighbors:",  json.dumps(valid_neighs, indent=4))
+    if is_level_enabled(syslog.LOG_DEBUG):
+        print_message(syslog.LOG_DEBUG, "Vlan neighbors:",  json.dumps(valid_neighs, indent=4))
     return valid_neighs
 
 
@@ -575,14 +666,98 @@ def filter_out_vlan_neigh_route_miss(rt_appl_miss, rt_asic_miss):
     if is_dualtor(config_db):
         vlan_neighs = set(get_vlan_neighbors())
         rt_appl_miss, ignored_rt_appl_miss = _filter_out_neigh_route(rt_appl_miss, vlan_neighs)
-        print_message(syslog.LOG_DEBUG, "Ignored appl route miss:",  json.dumps(ignored_rt_appl_miss, indent=4))
         rt_asic_miss, ignored_rt_asic_miss = _filter_out_neigh_route(rt_asic_miss, vlan_neighs)
-        print_message(syslog.LOG_DEBUG, "Ignored asic route miss:",  json.dumps(ignored_rt_asic_miss, indent=4))
+        if is_level_enabled(syslog.LOG_DEBUG):
+            print_message(syslog.LOG_DEBUG, "Ignored appl route miss:",  json.dumps(ignored_rt_appl_miss, indent=4))
+            print_message(syslog.LOG_DEBUG, "Ignored asic route miss:",  json.dumps(ignored_rt_asic_miss, indent=4))
 
     return rt_appl_miss, rt_asic_miss
 
 
-def check_routes():
+class RouteWatcher(object):
+    """
+    Long running subscription to APPL-DB ROUTE_TABLE & INTF_TABLE and
+    to ASIC-DB, applying every update to a RouteDiff. The subscriptions
+    return the present entries first, so the tables are read only once.
+    """
+
+    def __init__(self):
+        appl_db = swsscommon.DBConnector(APPL_DB_NAME, 0)
+        asic_db = swsscommon.DBConnector(ASIC_DB_NAME, 0)
+        self.route_subs = swsscommon.SubscriberStateTable(appl_db, 'ROUTE_TABLE')
+        self.intf_subs = swsscommon.SubscriberStateTable(appl_db, 'INTF_TABLE')
+        self.asic_subs = swsscommon.SubscriberStateTable(asic_db, ASIC_TABLE_NAME)
+        self.handlers = [
+            (self.route_subs, appl_route_key, self.on_route),
+            (self.intf_subs, intf_key, self.on_intf),
+            (self.asic_subs, asic_route_key, self.on_asic)
+        ]
+        self.selector = swsscommon.Select()
+        for subs, _, _ in self.handlers:
+            self.selector.addSelectable(subs)
+        self.diff = RouteDiff()
+        self.asic_adds = []
+        self.asic_deletes = []
+        self.drain()
+        print_message(syslog.LOG_DEBUG, "Watching {} routes, {} route entries & {} interfaces".format(
+            len(self.diff.rt_appl), len(self.diff.rt_asic), len(self.diff.intf_appl)))
+
+    def on_route(self, key, op):
+        if op == "SET":
+            self.diff.add_appl(key)
+        elif op == "DEL":
+            self.diff.del_appl(key)
+
+    def on_intf(self, key, op):
+        if op == "SET":
+            self.diff.add_intf(key)
+        elif op == "DEL":
+            self.diff.del_intf(key)
+
+    def on_asic(self, key, op):
+        if op == "SET":
+            self.diff.add_asic(key)
+            self.asic_adds.append(key)
+        elif op == "DEL":
+            self.diff.del_asic(key)
+            self.asic_deletes.append(key)
+
+    def drain(self):
+        """
+        Apply every pending update
+        """
+        for subs, get_key, handler in self.handlers:
+            while True:
+                k, op, _ = subs.pop()
+                if not k:
+                    break
+                key = get_key(k)
+                if key:
+                    handler(key, op)
+
+    def wait(self, secs):
+        """
+        Apply the updates received for secs seconds
+        :return (add, del) ASIC-DB route entries received, as sorted lists
+        """
+        self.asic_adds = []
+        self.asic_deletes = []
+        t_end = time.time() + secs
+        t_wait = secs
+
+        while t_wait > 0:
+            self.selector.select(int(t_wait * 1000))
+            t_wait = t_end - time.time()
+            self.drain()
+
+        adds = keys_to_routes(self.asic_adds)
+        deletes = keys_to_routes(self.asic_deletes)
+        self.asic_adds = []
+        self.asic_deletes = []
+        return (adds, deletes)
+
+
+def check_routes(watcher=None):
     """
     The heart of this script which runs the checks.
     Read APPL-DB & ASIC-DB, the relevant tables for route checking.
@@ -595,6 +770,8 @@ def check_routes():
     If there are still some unjustifiable diffs, between APPL & ASIC DB,
     related to routes report failure, else all good.
 
+    :param watcher: RouteWatcher maintaining the diff, the tables are read
+    when None
     :return (0, None) on sucess, else (-1, results) where results holds
     the unjustifiable entries.
     """
@@ -606,24 +783,23 @@ def check_routes():
     adds = []
     deletes = []
 
-    selector, subs, rt_asic = get_route_entries()
-
-    rt_appl = get_routes()
-    intf_appl = get_interfaces()
+    if watcher is None:
+        selector, subs, rt_asic = get_route_entries()
+        diff = RouteDiff(get_routes(), rt_asic, get_interfaces())
+    else:
+        watcher.drain()
+        diff = watcher.diff
 
-    # Diff APPL-DB routes & ASIC-DB routes
-    rt_appl_miss, rt_asic_miss = diff_sorted_lists(rt_appl, rt_asic)
+    # Diff APPL-DB routes & ASIC-DB routes, discounting the missed
+    # ASIC routes found in APPL-DB INTF_TABLE and checking APPL-DB
+    # INTF_TABLE with ASIC table route entries
+    rt_appl_miss, rt_asic_miss, intf_appl_miss = diff.get_misses()
 
-    # Check missed ASIC routes against APPL-DB INTF_TABLE
-    _, rt_asic_miss = diff_sorted_lists(intf_appl, rt_asic_miss)
     rt_asic_miss = filter_out_default_routes(rt_asic_miss)
     rt_asic_miss = filter_out_vnet_routes(rt_asic_miss)
     rt_asic_miss = filter_out_standalone_tunnel_routes(rt_asic_miss)
     rt_asic_miss = filter_out_soc_ip_routes(rt_asic_miss)
 
-    # Check APPL-DB INTF_TABLE with ASIC table route entries
-    intf_appl_miss, _ = diff_sorted_lists(intf_appl, rt_asic)
-
     if rt_appl_miss:
         rt_appl_miss = filter_out_local_interfaces(rt_appl_miss)
 
@@ -637,13 +813,18 @@ def check_routes():
 
     if rt_appl_miss or rt_asic_miss:
         # Look for subscribe updates for a second
-        adds, deletes = get_subscribe_updates(selector, subs)
+        if watcher is None:
+            adds, deletes = get_subscribe_updates(selector, subs)
+        else:
+            adds, deletes = watcher.wait(SUBSCRIBE_WAIT_SECS)
 
         # Drop all those for which SET received
-        rt_appl_miss, _ = diff_sorted_lists(rt_appl_miss, adds)
+        added = set(adds)
+        rt_appl_miss = [rt for rt in rt_appl_miss if rt not in added]
 
         # Drop all those for which DEL received
-        rt_asic_miss, _ = diff_sorted_lists(rt_asic_miss, deletes)
+        deleted = set(deletes)
+        rt_asic_miss = [rt for rt in rt_asic_miss if rt not in deleted]
 
     if rt_appl_miss:
         results["missed_ROUTE_TABLE_routes"] = rt_appl_miss
@@ -677,6 +858,8 @@ def main():
     parser.add_argument('-m', "--mode", type=Level, choices=list(Level), default='ERR')
     parser.add_argument("-i", "--interval", type=int, default=0, help="Scan interval in seconds")
     parser.add_argument("-s", "--log_to_syslog", action="store_true", default=True, help="Write message to syslog")
+    parser.add_argument("-w", "--watch", action="store_true", default=False,
+                        help="Stay subscribed to the DBs and check the diff every interval instead of rescanning")
     args = parser.parse_args()
 
     set_level(args.mode, args.log_to_syslog)
@@ -693,13 +876,23 @@ def main():
 
     signal.signal(signal.SIGALRM, handler)
 
+    watcher = None
+    if args.watch and interval:
+        signal.alarm(TIMEOUT_SECONDS)
+        watcher = RouteWatcher()
+        signal.alarm(0)
+
     while True:
         signal.alarm(TIMEOUT_SECONDS)
-        ret, res= check_routes()
+        ret, res= check_routes(watcher)
         signal.alarm(0)
 
         if interval:
-            time.sleep(interval)
+            if watcher:
+                # Keep the diff up to date while waiting for the next check
+                watcher.wait(interval)
+            else:
+                time.sleep(interval)
             if UNIT_TESTING:
                 return ret, res
         else:
@@ -2,7 +2,9 @@
 
 import sys
 import json
+import time
 import syslog
+import argparse
 import subprocess
 from swsscommon import swsscommon
 
@@ -16,6 +18,9 @@ Logically VNET route verification logic consists of 3 parts:
 Returns 0 if there is no inconsistancy found and all VNET routes are aligned in all DBs.
 Returns -1 if there is incosistancy found and prints differences between DBs in JSON format to standart output.
 
+With --daemon, the tool stays subscribed to the APP_DB VNET route tables and to the
+ASIC_DB route entries and checks the routes every interval, without reading the tables again.
+
 Format of differences output:
 {
     "results": {
@@ -49,6 +54,14 @@ RC_OK = 0
 RC_ERR = -1
 default_vrf_oid = ""
 
+ASIC_STATE_TABLE = 'ASIC_STATE'
+ROUTE_ENTRY_TABLE = 'ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY'
+ROUTE_ENTRY_KEY_PREFIX = 'SAI_OBJECT_TYPE_ROUTE_ENTRY:'
+VNET_ROUTE_TABLES = ['VNET_ROUTE_TABLE', 'VNET_ROUTE_TUNNEL_TABLE']
+
+SCAN_COUNT = 1000
+DEFAULT_INTERVAL = 60
+
 report_level = syslog.LOG_ERR
 write_to_syslog = True
 
@@ -141,19 +154,18 @@ def get_vrf_entries():
     Format: { <vnet_rif_name>: <vrf_oid> }
     '''
     db = swsscommon.DBConnector('ASIC_DB', 0)
-    rif_table = swsscommon.Table(db, 'ASIC_STATE')
+    rif_table = swsscommon.Table(db, ASIC_STATE_TABLE)
 
     vnet_rifs_oids = get_vnet_rifs_oids()
 
     rif_vrf_map = {}
-    for vnet_rif_name in vnet_rifs_oids:
-
-        db_keys = rif_table.getKeys()
-
-        for db_key in db_keys:
-            if (db_key == f'SAI_OBJECT_TYPE_ROUTER_INTERFACE:{vnet_rifs_oids[vnet_rif_name]}'):
-                rif_attrs = dict(rif_table.get(db_key)[1])
-                rif_vrf_map[vnet_rif_name] = rif_attrs['SAI_ROUTER_INTERFACE_ATTR_VIRTUAL_ROUTER_ID']
+    for vnet_rif_name, vnet_rif_oid in vnet_rifs_oids.items():
+        status, rif_attrs = rif_table.get(f'SAI_OBJECT_TYPE_ROUTER_INTERFACE:{vnet_rif_oid}')
+        if not status:
+            continue
+        vrf_oid = dict(rif_attrs).get('SAI_ROUTER_INTERFACE_ATTR_VIRTUAL_ROUTER_ID')
+        if vrf_oid is not None:
+            rif_vrf_map[vnet_rif_name] = vrf_oid
 
     return rif_vrf_map
 
@@ -170,7 +182,7 @@ def filter_out_vnet_ip2me_routes(vnet_routes):
     vnet_intfs = [vnet_intfs[k] for k in vnet_intfs]
     vnet_intfs = [val for sublist in vnet_intfs for val in sublist]
 
-    vnet_ip2me_routes = []
+    vnet_ip2me_routes = set()
     for rif in all_rifs_db_keys:
         rif_attrs = rif.split(':')
         # Skip RIF entries without IP prefix and prefix length (they have only one attribute - RIF name)
@@ -183,19 +195,18 @@ def filter_out_vnet_ip2me_routes(vnet_routes):
         if rif_attrs[0] in vnet_intfs:
             rif_ip, _ = rif_attrs[1].split('/')
             ip2me_route = rif_ip + '/32'
-            vnet_ip2me_routes.append(ip2me_route)
+            vnet_ip2me_routes.add(ip2me_route)
 
-    for vnet, vnet_attrs in vnet_routes.items():
-        for route in vnet_attrs['routes']:
-            if route in vnet_ip2me_routes:
-                vnet_attrs['routes'].remove(route)
+    for vnet, vnet_attrs in list(vnet_routes.items()):
+        vnet_attrs['routes'] = [route for route in vnet_attrs['routes'] if route not in vnet_ip2me_routes]
 
         if not vnet_attrs['routes']:
             vnet_routes.pop(vnet)
 
 
-def get_vnet_routes_from_app_db():
+def get_vnet_routes_from_app_db(vnet_routes_db_keys=None):
     ''' Returns dictionary of VNET routes configured per each VNET in APP_DB.
+    The VNET route tables are read unless their keys are given in vnet_routes_db_keys.
     Format: { <vnet_name>: { 'routes': [ <pfx/pfx_len> ], 'vrf_oid': <oid> } }
     '''
     db = swsscommon.DBConnector('APPL_DB', 0)
@@ -203,10 +214,10 @@ def get_vnet_routes_from_app_db():
     vnet_intfs = get_vnet_intfs()
     vnet_vrfs = get_vrf_entries()
 
-    vnet_route_table = swsscommon.Table(db, 'VNET_ROUTE_TABLE')
-    vnet_route_tunnel_table = swsscommon.Table(db, 'VNET_ROUTE_TUNNEL_TABLE')
-
-    vnet_routes_db_keys = vnet_route_table.getKeys() + vnet_route_tunnel_table.getKeys()
+    if vnet_routes_db_keys is None:
+        vnet_routes_db_keys = []
+        for table in VNET_ROUTE_TABLES:
+            vnet_routes_db_keys += swsscommon.Table(db, table).getKeys()
 
     vnet_routes = {}
 
@@ -241,17 +252,44 @@ def get_vnet_routes_from_app_db():
     return vnet_routes
 
 
-def get_vnet_routes_from_asic_db():
+def scan_route_entry_keys(db):
+    ''' Yields the ASIC_STATE route entry keys, without the ASIC_STATE prefix.
+    Only the route entries are walked, with a SCAN cursor matching their type prefix,
+    so the other SAI objects are never read and redis is never blocked by a KEYS.
+    '''
+    match = ROUTE_ENTRY_TABLE + ':*'
+    cursor = 0
+    while True:
+        cursor, keys = db.scan(cursor, match, SCAN_COUNT)
+        for key in keys:
+            yield key[len(ASIC_STATE_TABLE) + 1:]
+        if int(cursor) == 0:
+            break
+
+
+def parse_route_entry_key(route_entry_key):
+    ''' Returns the (vrf_oid, prefix) tuple of an ASIC_STATE route entry key
+    such as SAI_OBJECT_TYPE_ROUTE_ENTRY:{"dest":"<pfx/pfx_len>","switch_id":"<oid>","vr":"<oid>"}
+    or None if the key is not a route entry.
+    The ROUTE_ENTRY_KEY_PREFIX may be left out.
+    '''
+    if route_entry_key.startswith(ROUTE_ENTRY_KEY_PREFIX):
+        route_entry_key = route_entry_key[len(ROUTE_ENTRY_KEY_PREFIX):]
+    try:
+        route_entry = json.loads(route_entry_key)
+        return route_entry['vr'].lower(), route_entry['dest'].lower()
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def get_vnet_routes_from_asic_db(route_entries=None):
     ''' Returns dictionary of VNET routes configured per each VNET in ASIC_DB.
+    The route entries are read unless given as (vrf_oid, prefix) tuples in route_entries.
     Format: { <vnet_name>: { 'routes': [ <pfx/pfx_len> ], 'vrf_oid': <oid> } }
     '''
     db = swsscommon.DBConnector('ASIC_DB', 0)
 
-    tbl = swsscommon.Table(db, 'ASIC_STATE')
-
     vnet_vrfs = get_vrf_entries()
-    vnet_vrfs_oids = [vnet_vrfs[k] for k in vnet_vrfs]
-    vnet_vrfs_oids.append(default_vrf_oid) 
 
     vnet_intfs = get_vnet_intfs()
 
@@ -263,29 +301,27 @@ def get_vnet_routes_from_asic_db():
             if vnet_rif in vnet_rifs:
                 vrf_oid_to_vnet_map[vrf_oid] = vnet_name
 
-    routes_db_keys = tbl.getKeys()
+    if route_entries is None:
+        route_entries = map(parse_route_entry_key, scan_route_entry_keys(db))
 
     vnet_routes = {}
 
-    for route_db_key in routes_db_keys:
-        route_attrs = route_db_key.lower().split('\"', -1)
-
-        if 'sai_object_type_route_entry' not in route_attrs[0]:
+    for route_entry in route_entries:
+        if route_entry is None:
             continue
 
-        # route_attrs[11] - VRF OID for the VNET route
-        # route_attrs[3] - VNET route IP subnet
-        vrf_oid = route_attrs[11]
-        ip_addr = route_attrs[3]
+        vrf_oid, ip_addr = route_entry
 
-        if vrf_oid in vnet_vrfs_oids:
-            vnet_name = vrf_oid_to_vnet_map[vrf_oid]
-            if vrf_oid_to_vnet_map[vrf_oid] not in vnet_routes:
-                vnet_routes[vnet_name] = {}
-                vnet_routes[vnet_name]['routes'] = []
-                vnet_routes[vnet_name]['vrf_oid'] = vrf_oid
+        vnet_name = vrf_oid_to_vnet_map.get(vrf_oid)
+        if vnet_name is None:
+            continue
 
-            vnet_routes[vnet_name]['routes'].append(ip_addr)
+        if vnet_name not in vnet_routes:
+            vnet_routes[vnet_name] = {}
+            vnet_routes[vnet_name]['routes'] = []
+            vnet_routes[vnet_name]['vrf_oid'] = vrf_oid
+
+        vnet_routes[vnet_name]['routes'].append(ip_addr)
 
     filter_out_vnet_ip2me_routes(vnet_routes)
 
@@ -293,16 +329,13 @@ def get_vnet_routes_from_asic_db():
 
 
 def check_routes_with_default_vrf(vnet_name, vnet_attrs, routes_1, routes):
-    for vnet_route in vnet_attrs['routes']:
-        ispresent = False
-        for vnet_name_other, vnet_attrs_other in routes_1.items():
-            if vnet_route in vnet_attrs_other['routes']:
-                ispresent = True
-        if not ispresent:
-            if vnet_name not in routes:
-                routes[vnet_name] = {}
-                routes[vnet_name]['routes'] = []
-            routes[vnet_name]['routes'].append(vnet_route)
+    all_routes_1 = set()
+    for vnet_attrs_other in routes_1.values():
+        all_routes_1.update(vnet_attrs_other['routes'])
+
+    missed_routes = [vnet_route for vnet_route in vnet_attrs['routes'] if vnet_route not in all_routes_1]
+    if missed_routes:
+        routes.setdefault(vnet_name, {'routes': []})['routes'].extend(missed_routes)
 
     return
 
@@ -324,12 +357,11 @@ def get_vnet_routes_diff(routes_1, routes_2, verify_default_vrf_routes = False):
             if vnet_name not in routes_1:
                 routes[vnet_name] =  vnet_attrs['routes'].copy()
             else:
-                for vnet_route in vnet_attrs['routes']:
-                    if vnet_route not in routes_1[vnet_name]['routes']:
-                        if vnet_name not in routes:
-                            routes[vnet_name] = {}
-                            routes[vnet_name]['routes'] = []
-                        routes[vnet_name]['routes'].append(vnet_route)
+                routes_1_set = set(routes_1[vnet_name]['routes'])
+                missed_routes = [vnet_route for vnet_route in vnet_attrs['routes'] if vnet_route not in routes_1_set]
+                if missed_routes:
+                    routes[vnet_name] = {}
+                    routes[vnet_name]['routes'] = missed_routes
 
     return routes
 
@@ -356,21 +388,92 @@ def get_sdk_vnet_routes_diff(routes):
     return routes_diff
 
 
-def main():
+class VnetRouteWatcher(object):
+    ''' Long running subscription to the APP_DB VNET route tables and to the ASIC_DB
+    route entries, which keeps the present keys up to date from the keyspace notifications.
+    The subscriptions return the present entries first, so the tables are read only once.
+    '''
 
+    def __init__(self):
+        appl_db = swsscommon.DBConnector('APPL_DB', 0)
+        asic_db = swsscommon.DBConnector('ASIC_DB', 0)
+
+        self.selector = swsscommon.Select()
+        self.appl_subs = []
+        for table in VNET_ROUTE_TABLES:
+            subs = swsscommon.SubscriberStateTable(appl_db, table)
+            self.selector.addSelectable(subs)
+            self.appl_subs.append(subs)
+        self.asic_subs = swsscommon.SubscriberStateTable(asic_db, ROUTE_ENTRY_TABLE)
+        self.selector.addSelectable(self.asic_subs)
+
+        # dicts keep the keys in the order they were added
+        self.app_db_route_keys = {}
+        self.asic_db_route_entries = {}
+        self.drain()
+
+    @staticmethod
+    def apply(keys, key, op):
+        if op == 'SET':
+            keys[key] = None
+        elif op == 'DEL':
+            keys.pop(key, None)
+
+    def drain(self):
+        ''' Apply every pending update '''
+        for subs in self.appl_subs:
+            while True:
+                key, op, _ = subs.pop()
+                if not key:
+                    break
+                self.apply(self.app_db_route_keys, key, op)
+
+        while True:
+            key, op, _ = self.asic_subs.pop()
+            if not key:
+                break
+            route_entry = parse_route_entry_key(key)
+            if route_entry is not None:
+                self.apply(self.asic_db_route_entries, route_entry, op)
+
+    def wait(self, secs):
+        ''' Apply the updates received for secs seconds '''
+        t_end = time.time() + secs
+        t_wait = secs
+
+        while t_wait > 0:
+            self.selector.select(int(t_wait * 1000))
+            t_wait = t_end - time.time()
+            self.drain()
+
+    def get_vnet_routes_from_app_db(self):
+        return get_vnet_routes_from_app_db(list(self.app_db_route_keys))
+
+    def get_vnet_routes_from_asic_db(self):
+        return get_vnet_routes_from_asic_db(list(self.asic_db_route_entries))
+
+
+def check_vnet_routes(watcher=None):
+    ''' Verifies the VNET routes, read from the DBs or maintained by watcher.
+    Returns RC_OK or (RC_ERR, differences).
+    '''
     rc = RC_OK
 
     # Don't run VNET routes consistancy logic if there is no VNET configuration
     if not check_vnet_cfg():
         return rc
     asic_db = swsscommon.DBConnector('ASIC_DB', 0)
-    virtual_router = swsscommon.Table(asic_db, 'ASIC_STATE:SAI_OBJECT_TYPE_VIRTUAL_ROUTER')
-    if virtual_router.getKeys() != []:
-        global default_vrf_oid
-        default_vrf_oid = virtual_router.getKeys()[0]
-
-    app_db_vnet_routes = get_vnet_routes_from_app_db()
-    asic_db_vnet_routes = get_vnet_routes_from_asic_db()
+    virtual_router_keys = swsscommon.Table(asic_db, 'ASIC_STATE:SAI_OBJECT_TYPE_VIRTUAL_ROUTER').getKeys()
+    # checked again on every run of the daemon mode
+    global default_vrf_oid
+    default_vrf_oid = virtual_router_keys[0] if virtual_router_keys else ""
+
+    if watcher is None:
+        app_db_vnet_routes = get_vnet_routes_from_app_db()
+        asic_db_vnet_routes = get_vnet_routes_from_asic_db()
+    else:
+        app_db_vnet_routes = watcher.get_vnet_routes_from_app_db()
+        asic_db_vnet_routes = watcher.get_vnet_routes_from_asic_db()
 
     missed_in_asic_db_routes = get_vnet_routes_diff(asic_db_vnet_routes, app_db_vnet_routes,True)
     missed_in_app_db_routes = get_vnet_routes_diff(app_db_vnet_routes, asic_db_vnet_routes)
@@ -397,5 +500,22 @@ def main():
     return rc
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Verify VNET routes consistancy between APP_DB, ASIC_DB and SDK")
+    parser.add_argument("-d", "--daemon", action="store_true", default=False,
+                        help="Stay subscribed to the DBs and check the routes every interval")
+    parser.add_argument("-i", "--interval", type=int, default=DEFAULT_INTERVAL,
+                        help="Seconds between the checks of the daemon mode")
+    args = parser.parse_args(sys.argv[1:])
+
+    if not args.daemon:
+        return check_vnet_routes()
+
+    watcher = VnetRouteWatcher()
+    while True:
+        check_vnet_routes(watcher)
+        watcher.wait(args.interval)
+
+
 if __name__ == "__main__":
     sys.exit(main())
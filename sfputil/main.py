@@ -14,6 +14,8 @@ import time
 import datetime
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
 import click
 import sonic_platform
 import sonic_platform_base.sonic_sfp.sfputilhelper
@@ -23,6 +25,8 @@ from natsort import natsorted
 from sonic_py_common import device_info, logger, multi_asic
 from utilities_common.sfp_helper import covert_application_advertisement_to_output_string
 from utilities_common.sfp_helper import QSFP_DATA_MAP
+from utilities_common.sfp_helper import TRANSCEIVER_STATUS_TABLE, load_transceiver_snapshot
+from utilities_common.multi_asic import multi_asic_max_workers
 from tabulate import tabulate
 
 VERSION = '3.0'
@@ -1052,13 +1056,13 @@ def fetch_error_status_from_state_db(port, state_db):
     Returns:
         A list consisting of tuples (port, description) and sorted by port.
     """
+    snapshot = load_transceiver_snapshot(state_db, [TRANSCEIVER_STATUS_TABLE], [port] if port else None)
     status = {}
     if port:
-        status[port] = state_db.get_all(state_db.STATE_DB, 'TRANSCEIVER_STATUS|{}'.format(port))
+        status[port] = snapshot.get_all(snapshot.STATE_DB, 'TRANSCEIVER_STATUS|{}'.format(port))
     else:
-        ports = state_db.keys(state_db.STATE_DB, 'TRANSCEIVER_STATUS|*')
-        for key in ports:
-            status[key.split('|')[1]] = state_db.get_all(state_db.STATE_DB, key)
+        for key in snapshot.keys(snapshot.STATE_DB, 'TRANSCEIVER_STATUS|*'):
+            status[key.split('|')[1]] = snapshot.get_all(snapshot.STATE_DB, key)
 
     sorted_ports = natsort.natsorted(status)
     output = []
@@ -1080,6 +1084,18 @@ def fetch_error_status_from_state_db(port, state_db):
 
     return output
 
+def fetch_error_status_from_namespace(port, namespace):
+    """Fetch the error status of a namespace from its STATE_DB.
+    Returns:
+        The list of fetch_error_status_from_state_db, None if STATE_DB
+        could not be connected.
+    """
+    state_db = SonicV2Connector(use_unix_socket_path=False, namespace=namespace)
+    if state_db is None:
+        return None
+    state_db.connect(state_db.STATE_DB)
+    return fetch_error_status_from_state_db(port, state_db)
+
 @show.command()
 @click.option('-p', '--port', metavar='<port_name>', help="Display SFP error status for port <port_name> only")
 @click.option('-hw', '--fetch-from-hardware', 'fetch_from_hardware', is_flag=True, default=False, help="Fetch the error status from hardware directly")
@@ -1098,14 +1114,14 @@ def error_status(port, fetch_from_hardware):
         output_table = fetch_error_status_from_platform_api(port)
     else:
         namespaces = multi_asic.get_front_end_namespaces()
-        for namespace in namespaces:
-            state_db = SonicV2Connector(use_unix_socket_path=False, namespace=namespace)
-            if state_db is not None:
-                state_db.connect(state_db.STATE_DB)
-                output_table.extend(fetch_error_status_from_state_db(port, state_db))
-            else:
+        with ThreadPoolExecutor(max_workers=max(1, min(multi_asic_max_workers(), len(namespaces)))) as executor:
+            ns_outputs = list(executor.map(lambda namespace: fetch_error_status_from_namespace(port, namespace),
+                                           namespaces))
+        for ns_output in ns_outputs:
+            if ns_output is None:
                 click.echo("Failed to connect to STATE_DB")
                 return
+            output_table.extend(ns_output)
 
     click.echo(tabulate(output_table, table_header, tablefmt='simple'))
 
@@ -1,4 +1,5 @@
 
+import ipaddress
 import json
 import sys
 import time
@@ -7,14 +8,15 @@ import click
 import re
 import utilities_common.cli as clicommon
 from natsort import natsorted
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from operator import itemgetter
 from sonic_py_common import multi_asic
 from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
 from swsscommon import swsscommon
 from tabulate import tabulate
 from utilities_common import platform_sfputil_helper
-from utilities_common.general import get_optional_value_for_key_in_config_tbl 
+from utilities_common.bulk_db import BulkReader
+from utilities_common.general import get_optional_value_for_key_in_config_tbl, get_xcvr_batch_timeout
 
 platform_sfputil = None
 
@@ -41,6 +43,9 @@ XCVRD_GET_BER_RSP_TABLE = "XCVRD_GET_BER_RSP"
 XCVRD_GET_BER_RES_TABLE = "XCVRD_GET_BER_RES"
 XCVRD_GET_BER_CMD_ARG_TABLE = "XCVRD_GET_BER_CMD_ARG"
 
+APPL_TUNNEL_ROUTE_PREFIX = "TUNNEL_ROUTE_TABLE:"
+ASIC_ROUTE_ENTRY_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY:"
+
 def get_asic_index_for_port(port):
     asic_index = None
     if platform_sfputil is not None:
@@ -287,7 +292,22 @@ def get_result(port, res_dict, cmd ,result, table_name):
 
 def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_name, cmd_arg_table_name, rsp_table_name , res_table_name, port, cmd_timeout_secs, param_dict= None, arg=None):
 
-    res_dict = {}
+    res_dicts = update_and_get_response_for_xcvr_cmds(
+        cmd_name, rsp_name, exp_rsp, cmd_table_name, cmd_arg_table_name, rsp_table_name, res_table_name, [port], cmd_timeout_secs, param_dict, arg)
+
+    return res_dicts[port]
+
+
+def update_and_get_response_for_xcvr_cmds(cmd_name, rsp_name, exp_rsp, cmd_table_name, cmd_arg_table_name, rsp_table_name, res_table_name, ports, cmd_timeout_secs, param_dict=None, arg=None):
+    """
+    Post cmd_name for all the ports at once and collect the responses of
+    xcvrd through one subscriber per namespace, until every port responded
+    or cmd_timeout_secs elapsed. Returns port -> res_dict, res_dict[0] being
+    the rc and res_dict[1] the response of the port, 'unknown' if it did not
+    respond in time.
+    """
+
+    res_dicts = {}
     state_db, appl_db = {}, {}
     firmware_rsp_tbl, firmware_rsp_tbl_keys = {}, {}
     firmware_rsp_sub_tbl = {}
@@ -316,44 +336,50 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
             firmware_rsp_tbl[asic_id]._del(key)
         sel.addSelectable(firmware_rsp_sub_tbl[asic_id])
 
-    rc = CONFIG_FAIL
-    res_dict[0] = CONFIG_FAIL
-    res_dict[1] = 'unknown'
+    # ports waiting for a response -> asic index
+    pending_ports = {}
 
     logical_port_list = platform_sfputil_helper.get_logical_list()
-    if port not in logical_port_list:
-        click.echo("ERR: This is not a valid port, valid ports ({})".format(", ".join(logical_port_list)))
-        res_dict[0] = rc
-        return res_dict
+    for port in ports:
+        res_dicts[port] = {0: CONFIG_FAIL, 1: 'unknown'}
 
-    asic_index = None
-    if platform_sfputil is not None:
-        asic_index = platform_sfputil_helper.get_asic_id_for_logical_port(port)
-    if asic_index is None:
-        # TODO this import is only for unit test purposes, and should be removed once sonic_platform_base
-        # is fully mocked
-        import sonic_platform_base.sonic_sfp.sfputilhelper
-        asic_index = sonic_platform_base.sonic_sfp.sfputilhelper.SfpUtilHelper().get_asic_id_for_logical_port(port)
+        if port not in logical_port_list:
+            click.echo("ERR: This is not a valid port, valid ports ({})".format(", ".join(logical_port_list)))
+            continue
+
+        asic_index = None
+        if platform_sfputil is not None:
+            asic_index = platform_sfputil_helper.get_asic_id_for_logical_port(port)
         if asic_index is None:
-            click.echo("Got invalid asic index for port {}, cant perform firmware cmd".format(port))
-            res_dict[0] = rc
-            return res_dict
+            # TODO this import is only for unit test purposes, and should be removed once sonic_platform_base
+            # is fully mocked
+            import sonic_platform_base.sonic_sfp.sfputilhelper
+            asic_index = sonic_platform_base.sonic_sfp.sfputilhelper.SfpUtilHelper().get_asic_id_for_logical_port(port)
+            if asic_index is None:
+                click.echo("Got invalid asic index for port {}, cant perform firmware cmd".format(port))
+                continue
+
+        pending_ports[port] = asic_index
+
+    if not pending_ports:
+        return res_dicts
 
     if arg is None:
         cmd_arg = "null"
     else:
         cmd_arg = str(arg)
 
-    if param_dict is not None:
-        for key, value in param_dict.items():
-            fvs = swsscommon.FieldValuePairs([(str(key), str(value))])
-            firmware_cmd_arg_tbl[asic_index].set(port, fvs)
+    for port, asic_index in pending_ports.items():
+        if param_dict is not None:
+            for key, value in param_dict.items():
+                fvs = swsscommon.FieldValuePairs([(str(key), str(value))])
+                firmware_cmd_arg_tbl[asic_index].set(port, fvs)
 
-    fvs = swsscommon.FieldValuePairs([(cmd_name, cmd_arg)])
-    firmware_cmd_tbl[asic_index].set(port, fvs)
+        fvs = swsscommon.FieldValuePairs([(cmd_name, cmd_arg)])
+        firmware_cmd_tbl[asic_index].set(port, fvs)
 
-    # Listen indefinitely for changes to the HW_MUX_CABLE_TABLE in the Application DB's
-    while True:
+    # Listen for the responses to the STATE_DB's response table until every port responded
+    while pending_ports:
         # Use timeout to prevent ignoring the signals we want to handle
         # in signal_handler() (e.g. SIGTERM for graceful shutdown)
 
@@ -362,7 +388,7 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
         time_now = time.time()
         time_diff = time_now - time_start
         if time_diff >= CMD_TIMEOUT_SECS:
-            return res_dict
+            break
 
         if state == swsscommon.Select.TIMEOUT:
             # Do not flood log when select times out
@@ -380,20 +406,13 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
 
         (port_m, op_m, fvp_m) = firmware_rsp_sub_tbl[asic_index].pop()
 
-        if not port_m:
-            click.echo("Did not receive a port response {}".format(port))
-            res_dict[1] = 'unknown'
-            res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
-            break
-
-        if port_m != port:
-
-            res_dict[1] = 'unknown'
-            res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
+        # a response of another port, or of a port which already responded
+        if not port_m or pending_ports.get(port_m) != asic_index:
             continue
 
+        del pending_ports[port_m]
+        res_dict = res_dicts[port_m]
+
         if fvp_m:
 
             fvp_dict = dict(fvp_m)
@@ -406,18 +425,14 @@ def update_and_get_response_for_xcvr_cmd(cmd_name, rsp_name, exp_rsp, cmd_table_
             else:
                 res_dict[1] = 'unknown'
                 res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
-            break
         else:
             res_dict[1] = 'unknown'
             res_dict[0] = CONFIG_FAIL
-            firmware_rsp_tbl[asic_index]._del(port)
-            break
-
+        firmware_rsp_tbl[asic_index]._del(port_m)
 
     delete_all_keys_in_db_tables_helper(cmd_table_name, rsp_table_name, cmd_arg_table_name, None)
 
-    return res_dict
+    return res_dicts
 
 
 def delete_all_keys_in_db_tables_helper(cmd_table_name, rsp_table_name, cmd_arg_table_name = None, res_table_name = None):
@@ -486,7 +501,8 @@ def get_switch_name(config_db):
         sys.exit(STATUS_FAIL)
 
 
-def create_json_dump_per_port_status(db, port_status_dict, muxcable_info_dict, muxcable_grpc_dict, muxcable_health_dict, muxcable_metrics_dict, asic_index, port):
+def create_json_dump_per_port_status(db, port_status_dict, muxcable_info_dict, muxcable_grpc_dict, muxcable_health_dict, muxcable_metrics_dict, asic_index, port,
+                                     hwmode_res_dict=None):
 
     res_dict = {}
     status_value = get_value_for_key_in_dict(muxcable_info_dict[asic_index], port, "state", "MUX_CABLE_TABLE")
@@ -497,7 +513,7 @@ def create_json_dump_per_port_status(db, port_status_dict, muxcable_info_dict, m
     port_status_dict["MUX_CABLE"][port_name]["SERVER_STATUS"] = gRPC_value
     health_value = get_value_for_key_in_dict(muxcable_health_dict[asic_index], port, "state", "MUX_LINKMGR_TABLE")
     port_status_dict["MUX_CABLE"][port_name]["HEALTH"] = health_value
-    res_dict = get_hwmode_mux_direction_port(db, port)
+    res_dict = hwmode_res_dict if hwmode_res_dict is not None else get_hwmode_mux_direction_port(db, port)
     if res_dict[2] == "False":
         hwstatus = "absent"
     elif res_dict[1] == "not Y-Cable port":
@@ -515,12 +531,13 @@ def create_json_dump_per_port_status(db, port_status_dict, muxcable_info_dict, m
         last_switch_end_time = muxcable_metrics_dict[asic_index].get("linkmgrd_switch_active_end")
     port_status_dict["MUX_CABLE"][port_name]["LAST_SWITCHOVER_TIME"] = last_switch_end_time
 
-def create_table_dump_per_port_status(db, print_data, muxcable_info_dict, muxcable_grpc_dict, muxcable_health_dict, muxcable_metrics_dict, asic_index, port):
+def create_table_dump_per_port_status(db, print_data, muxcable_info_dict, muxcable_grpc_dict, muxcable_health_dict, muxcable_metrics_dict, asic_index, port,
+                                      hwmode_res_dict=None):
 
     print_port_data = []
     res_dict = {}
 
-    res_dict = get_hwmode_mux_direction_port(db, port)
+    res_dict = hwmode_res_dict if hwmode_res_dict is not None else get_hwmode_mux_direction_port(db, port)
     status_value = get_value_for_key_in_dict(muxcable_info_dict[asic_index], port, "state", "MUX_CABLE_TABLE")
     #status_value = get_value_for_key_in_tbl(y_cable_asic_table, port, "status")
     gRPC_value = get_value_for_key_in_dict(muxcable_grpc_dict[asic_index], port, "state", "MUX_CABLE_TABLE")
@@ -598,7 +615,69 @@ def create_json_dump_per_port_config(db, port_status_dict, per_npu_configdb, asi
     if soc_ipv6_value is not None:
         port_status_dict["MUX_CABLE"]["PORTS"][port_name]["SERVER"]["soc_ipv6"] = soc_ipv6_value
 
-def get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port):
+def normalize_route_prefix(prefix):
+    """Returns prefix as an ip network, or unchanged if it is not an ip prefix"""
+    try:
+        return ipaddress.ip_network(prefix, strict=False)
+    except ValueError:
+        return prefix
+
+
+def parse_tunnel_route_key(key):
+    """Returns the prefix of a TUNNEL_ROUTE_TABLE key, with or without a vrf name"""
+    prefix = normalize_route_prefix(key[len(APPL_TUNNEL_ROUTE_PREFIX):])
+    if isinstance(prefix, str) and ':' in prefix:
+        prefix = normalize_route_prefix(prefix.split(':', 1)[1])
+    return prefix
+
+
+def parse_asic_route_entry_key(key):
+    """Returns the dest prefix of an ASIC_STATE route entry key"""
+    entry = key[len(ASIC_ROUTE_ENTRY_PREFIX):]
+    try:
+        return normalize_route_prefix(json.loads(entry)["dest"])
+    except (ValueError, KeyError, TypeError):
+        return entry
+
+
+class TunnelRouteIndex(object):
+    """
+    The tunnel routes of APPL_DB and the route entries of ASIC_DB of one
+    namespace, read with a single scan of each table.
+
+    Both are kept as prefix -> number of entries, so that the server and SoC
+    addresses of every mux port are looked up without scanning the
+    databases again.
+    """
+
+    def __init__(self, appl_db, asic_db):
+        appl_reader = BulkReader(appl_db, appl_db.APPL_DB)
+        self.kernel_routes = Counter(parse_tunnel_route_key(key)
+                                     for key in appl_reader.scan_keys(APPL_TUNNEL_ROUTE_PREFIX + '*'))
+        asic_reader = BulkReader(asic_db, asic_db.ASIC_DB)
+        self.asic_routes = Counter(parse_asic_route_entry_key(key)
+                                   for key in asic_reader.scan_keys(ASIC_ROUTE_ENTRY_PREFIX + '*'))
+        self.round_trips = appl_reader.round_trips + asic_reader.round_trips
+
+    def get_kernel_route_count(self, dest_address):
+        return self.kernel_routes.get(normalize_route_prefix(dest_address), False)
+
+    def get_asic_route_count(self, dest_address):
+        return self.asic_routes.get(normalize_route_prefix(dest_address), False)
+
+
+def get_tunnel_route_index(per_npu_tunnel_route_index, per_npu_appl_db, per_npu_asic_db, asic_id):
+    if asic_id not in per_npu_tunnel_route_index:
+        per_npu_tunnel_route_index[asic_id] = TunnelRouteIndex(per_npu_appl_db[asic_id], per_npu_asic_db[asic_id])
+    return per_npu_tunnel_route_index[asic_id]
+
+
+def get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                              per_npu_tunnel_route_index=None):
+
+    if per_npu_tunnel_route_index is None:
+        per_npu_tunnel_route_index = {}
+    tunnel_route_index = get_tunnel_route_index(per_npu_tunnel_route_index, per_npu_appl_db, per_npu_asic_db, asic_id)
 
     mux_cfg_dict = per_npu_configdb[asic_id].get_all(
     per_npu_configdb[asic_id].CONFIG_DB, 'MUX_CABLE|{}'.format(port))
@@ -608,13 +687,8 @@ def get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_a
         dest_address = mux_cfg_dict.get(name, None)
 
         if dest_address is not None:
-            kernel_route_keys = per_npu_appl_db[asic_id].keys(
-                per_npu_appl_db[asic_id].APPL_DB, 'TUNNEL_ROUTE_TABLE:*{}'.format(dest_address))
-            if_kernel_tunnel_route_programed = kernel_route_keys is not None and len(kernel_route_keys)
-
-            asic_route_keys = per_npu_asic_db[asic_id].keys(
-                per_npu_asic_db[asic_id].ASIC_DB, 'ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY:*{}*'.format(dest_address))
-            if_asic_tunnel_route_programed = asic_route_keys is not None and len(asic_route_keys)
+            if_kernel_tunnel_route_programed = tunnel_route_index.get_kernel_route_count(dest_address)
+            if_asic_tunnel_route_programed = tunnel_route_index.get_asic_route_count(dest_address)
 
             if if_kernel_tunnel_route_programed or if_asic_tunnel_route_programed:
                 port_tunnel_route["TUNNEL_ROUTE"][port] = port_tunnel_route["TUNNEL_ROUTE"].get(port, {})
@@ -624,15 +698,19 @@ def get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_a
                 port_tunnel_route["TUNNEL_ROUTE"][port][name]['kernel'] = if_kernel_tunnel_route_programed
                 port_tunnel_route["TUNNEL_ROUTE"][port][name]['asic'] = if_asic_tunnel_route_programed
 
-def create_json_dump_per_port_tunnel_route(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port):
+def create_json_dump_per_port_tunnel_route(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                                           per_npu_tunnel_route_index=None):
 
-    get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port)
+    get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                              per_npu_tunnel_route_index)
 
-def create_table_dump_per_port_tunnel_route(db, print_data, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port):
+def create_table_dump_per_port_tunnel_route(db, print_data, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                                            per_npu_tunnel_route_index=None):
 
     port_tunnel_route = {}
     port_tunnel_route["TUNNEL_ROUTE"] = {}
-    get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port)
+    get_tunnel_route_per_port(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                              per_npu_tunnel_route_index)
 
     for port, route in port_tunnel_route["TUNNEL_ROUTE"].items():
         for dest_name, values in route.items():
@@ -745,6 +823,14 @@ def status(db, port, json_output):
 
     else:
 
+        # probe the hardware mux direction of all the ports at once
+        mux_ports = []
+        for namespace in namespaces:
+            asic_id = multi_asic.get_asic_index_from_namespace(namespace)
+            for key in natsorted(appl_db_muxcable_tbl_keys[asic_id]):
+                mux_ports.append(key.split(":")[1])
+        hwmode_res_dicts = get_hwmode_mux_direction_ports(db, mux_ports)
+
         if json_output:
             port_status_dict = {}
             port_status_dict["MUX_CABLE"] = {}
@@ -763,7 +849,8 @@ def status(db, port, json_output):
                     if not muxcable_metrics_dict[asic_id]: 
                         muxcable_metrics_dict[asic_id] = {}
                     create_json_dump_per_port_status(db, port_status_dict, muxcable_info_dict, muxcable_grpc_dict,
-                                                     muxcable_health_dict, muxcable_metrics_dict, asic_id, port)
+                                                     muxcable_health_dict, muxcable_metrics_dict, asic_id, port,
+                                                     hwmode_res_dicts[port])
 
             click.echo("{}".format(json.dumps(port_status_dict, indent=4)))
         else:
@@ -783,7 +870,8 @@ def status(db, port, json_output):
                     if not muxcable_metrics_dict[asic_id]: 
                         muxcable_metrics_dict[asic_id] = {}
                     create_table_dump_per_port_status(db, print_data, muxcable_info_dict, muxcable_grpc_dict,
-                                                      muxcable_health_dict, muxcable_metrics_dict, asic_id, port)
+                                                      muxcable_health_dict, muxcable_metrics_dict, asic_id, port,
+                                                      hwmode_res_dicts[port])
 
             headers = ['PORT', 'STATUS', 'SERVER_STATUS', 'HEALTH', 'HWSTATUS', 'LAST_SWITCHOVER_TIME']
             click.echo(tabulate(print_data, headers=headers))
@@ -1264,28 +1352,70 @@ def cableinfo(db, port):
 
 
 
-def get_hwmode_mux_direction_port(db, port):
+def get_results(ports, table_name):
+    """
+    Returns port -> the fields of table_name in the STATE_DB of the port's
+    namespace for all the ports, then clears table_name
+    """
+    state_db = {}
+    xcvrd_show_res_tbl = {}
+
+    namespaces = multi_asic.get_front_end_namespaces()
+    for namespace in namespaces:
+        asic_id = multi_asic.get_asic_index_from_namespace(namespace)
+        state_db[asic_id] = db_connect("STATE_DB", namespace)
+        xcvrd_show_res_tbl[asic_id] = swsscommon.Table(state_db[asic_id], table_name)
+
+    results = {}
+    for port in ports:
+        results[port] = {}
+        for res_tbl in xcvrd_show_res_tbl.values():
+            (status, fvp) = res_tbl.get(port)
+            if status:
+                results[port] = dict(fvp)
+                break
 
+    delete_all_keys_in_db_table("STATE_DB", table_name)
+
+    return results
 
-    delete_all_keys_in_db_table("APPL_DB", "XCVRD_SHOW_HWMODE_DIR_CMD")
-    delete_all_keys_in_db_table("STATE_DB", "XCVRD_SHOW_HWMODE_DIR_RSP")
-    delete_all_keys_in_db_table("STATE_DB", "XCVRD_SHOW_HWMODE_DIR_RES")
+
+def get_hwmode_mux_direction_port(db, port):
 
     res_dict = {}
     res_dict[0] = CONFIG_FAIL
     res_dict[1] = "unknown"
     res_dict[2] = "unknown"
-    result = {}
     if port is not None:
+        res_dict = get_hwmode_mux_direction_ports(db, [port])[port]
 
-        res_dict = update_and_get_response_for_xcvr_cmd(
-            "state", "state", "True", "XCVRD_SHOW_HWMODE_DIR_CMD", "XCVRD_SHOW_HWMODE_DIR_RES", "XCVRD_SHOW_HWMODE_DIR_RSP", None, port, HWMODE_MUXDIRECTION_TIMEOUT, None, "probe")
+    return res_dict
 
-        result = get_result(port, res_dict, "muxdirection" , result, "XCVRD_SHOW_HWMODE_DIR_RES")
 
-        res_dict[2] = result.get("presence","unknown")
+def get_hwmode_mux_direction_ports(db, ports):
+    """
+    Probes the mux direction of all the ports with one batch of xcvrd
+    commands. Returns port -> res_dict, res_dict[1] being the direction
+    and res_dict[2] the presence of the cable.
+    """
 
-    return res_dict
+    delete_all_keys_in_db_table("APPL_DB", "XCVRD_SHOW_HWMODE_DIR_CMD")
+    delete_all_keys_in_db_table("STATE_DB", "XCVRD_SHOW_HWMODE_DIR_RSP")
+    delete_all_keys_in_db_table("STATE_DB", "XCVRD_SHOW_HWMODE_DIR_RES")
+
+    if not ports:
+        return {}
+
+    res_dicts = update_and_get_response_for_xcvr_cmds(
+        "state", "state", "True", "XCVRD_SHOW_HWMODE_DIR_CMD", "XCVRD_SHOW_HWMODE_DIR_RES", "XCVRD_SHOW_HWMODE_DIR_RSP", None, ports,
+        get_xcvr_batch_timeout(HWMODE_MUXDIRECTION_TIMEOUT, len(ports)), None, "probe")
+
+    results = get_results(ports, "XCVRD_SHOW_HWMODE_DIR_RES")
+
+    for port in ports:
+        res_dicts[port][2] = results[port].get("presence", "unknown")
+
+    return res_dicts
 
 
 def create_active_active_mux_direction_json_result(result, port, db):
@@ -1302,9 +1432,10 @@ def create_active_active_mux_direction_json_result(result, port, db):
 
     return rc
 
-def create_active_standby_mux_direction_json_result(result, port, db):
+def create_active_standby_mux_direction_json_result(result, port, db, res_dict=None):
 
-    res_dict = get_hwmode_mux_direction_port(db, port)
+    if res_dict is None:
+        res_dict = get_hwmode_mux_direction_port(db, port)
     port = platform_sfputil_helper.get_interface_alias(port, db)
     result["HWMODE"][port] = {}
     result["HWMODE"][port]["Direction"] = res_dict[1]
@@ -1330,9 +1461,10 @@ def create_active_active_mux_direction_result(body, port, db):
 
     return rc
 
-def create_active_standby_mux_direction_result(body, port, db):
+def create_active_standby_mux_direction_result(body, port, db, res_dict=None):
 
-    res_dict = get_hwmode_mux_direction_port(db, port)
+    if res_dict is None:
+        res_dict = get_hwmode_mux_direction_port(db, port)
 
     temp_list = []
     port = platform_sfputil_helper.get_interface_alias(port, db)
@@ -1414,6 +1546,7 @@ def muxdirection(db, port, json_output):
         rc_exit = EXIT_SUCCESS
         body = []
         active_active = False
+        mux_ports = []
         if json_output:
             result = {}
             result ["HWMODE"] = {}
@@ -1447,19 +1580,26 @@ def muxdirection(db, port, json_output):
             
             asic_index = get_asic_index_for_port(port)
             cable_type = get_optional_value_for_key_in_config_tbl(per_npu_configdb[asic_index], port, "cable_type", "MUX_CABLE")
+            mux_ports.append((port, cable_type))
+
+        # probe all the active-standby cables at once
+        hwmode_res_dicts = get_hwmode_mux_direction_ports(
+            db, [port for port, cable_type in mux_ports if cable_type != "active-active"])
+
+        for port, cable_type in mux_ports:
             if json_output:
                 if cable_type == "active-active":
                     rc = create_active_active_mux_direction_json_result(result, port, db)
                     active_active = True
                 else:
-                    rc = create_active_standby_mux_direction_json_result(result, port, db)
+                    rc = create_active_standby_mux_direction_json_result(result, port, db, hwmode_res_dicts[port])
 
             else:
                 if cable_type == 'active-active':
                     rc = create_active_active_mux_direction_result(body, port, db)
                     active_active = True
                 else:
-                    rc = create_active_standby_mux_direction_result(body, port, db)
+                    rc = create_active_standby_mux_direction_result(body, port, db, hwmode_res_dicts[port])
 
             if rc != 0:
                 rc_exit = EXIT_FAIL
@@ -1523,6 +1663,7 @@ def switchmode(db, port):
 
         rc_exit = True
         body = []
+        mux_ports = []
 
         for port in logical_port_list:
 
@@ -1550,12 +1691,18 @@ def switchmode(db, port):
             if port != logical_port_list_per_port[0]:
                 continue
 
+            mux_ports.append(port)
+
+        # probe all the cables at once
+        res_dicts = {}
+        if mux_ports:
+            res_dicts = update_and_get_response_for_xcvr_cmds(
+                "state", "state", "True", "XCVRD_SHOW_HWMODE_SWMODE_CMD", None, "XCVRD_SHOW_HWMODE_SWMODE_RSP", None, mux_ports,
+                get_xcvr_batch_timeout(1, len(mux_ports)), None, "probe")
+
+        for port in mux_ports:
             temp_list = []
-            res_dict = {}
-            res_dict[0] = CONFIG_FAIL
-            res_dict[1] = "unknown"
-            res_dict = update_and_get_response_for_xcvr_cmd(
-                "state", "state", "True", "XCVRD_SHOW_HWMODE_SWMODE_CMD", None, "XCVRD_SHOW_HWMODE_SWMODE_RSP", None, port, 1, None, "probe")
+            res_dict = res_dicts[port]
             port = platform_sfputil_helper.get_interface_alias(port, db)
             temp_list.append(port)
             temp_list.append(res_dict[1])
@@ -2055,6 +2202,8 @@ def tunnel_route(db, port, json_output):
     per_npu_asic_db = {}
     per_npu_configdb = {}
     mux_tbl_keys = {}
+    # built on first use, once per namespace
+    per_npu_tunnel_route_index = {}
 
     namespaces = multi_asic.get_front_end_namespaces()
     for namespace in namespaces:
@@ -2099,14 +2248,16 @@ def tunnel_route(db, port, json_output):
                 port_tunnel_route = {}
                 port_tunnel_route["TUNNEL_ROUTE"] = {}
 
-                create_json_dump_per_port_tunnel_route(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_index, port)
+                create_json_dump_per_port_tunnel_route(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_index, port,
+                                                       per_npu_tunnel_route_index)
 
                 click.echo("{}".format(json.dumps(port_tunnel_route, indent=4)))
 
             else:
                 print_data = []
 
-                create_table_dump_per_port_tunnel_route(db, print_data, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_index, port)
+                create_table_dump_per_port_tunnel_route(db, print_data, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_index, port,
+                                                        per_npu_tunnel_route_index)
 
                 headers = ['PORT', 'DEST_TYPE', 'DEST_ADDRESS', 'kernel', 'asic']
 
@@ -2124,7 +2275,8 @@ def tunnel_route(db, port, json_output):
                 for key in natsorted(mux_tbl_keys[asic_id]):
                     port = key.split("|")[1]
 
-                    create_json_dump_per_port_tunnel_route(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port)
+                    create_json_dump_per_port_tunnel_route(db, port_tunnel_route, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                                                           per_npu_tunnel_route_index)
             
             click.echo("{}".format(json.dumps(port_tunnel_route, indent=4)))
         else:
@@ -2135,7 +2287,8 @@ def tunnel_route(db, port, json_output):
                 for key in natsorted(mux_tbl_keys[asic_id]):
                     port = key.split("|")[1]
             
-                    create_table_dump_per_port_tunnel_route(db, print_data, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port)
+                    create_table_dump_per_port_tunnel_route(db, print_data, per_npu_configdb, per_npu_appl_db, per_npu_asic_db, asic_id, port,
+                                                            per_npu_tunnel_route_index)
 
             headers = ['PORT', 'DEST_TYPE', 'DEST_ADDRESS', 'kernel', 'asic']
 
@@ -14,11 +14,8 @@ from ..common import (
    IMAGE_DIR_PREFIX,
    IMAGE_PREFIX,
    run_command,
-   default_sigpipe,
 )
-from .onie import OnieInstallerBootloader
-
-PLATFORMS_ASIC = "installer/platforms_asic"
+from .onie import OnieInstallerBootloader, read_onie_image_info
 
 class GrubBootloader(OnieInstallerBootloader):
 
@@ -126,22 +123,15 @@ class GrubBootloader(OnieInstallerBootloader):
 
     def platform_in_platforms_asic(self, platform, image_path):
         """
-        For those images that don't have devices list builtin, 'tar' will have non-zero returncode.
+        For those images that don't have devices list builtin, there are no target platforms.
         In this case, we simply return True to make it worked compatible as before.
-        Otherwise, we can grep to check if platform is inside the supported target platforms list.
+        Otherwise, we check if platform is inside the supported target platforms list.
         """
-        with open(os.devnull, 'w') as fnull:
-            p1 = subprocess.Popen(["sed", "-e", "1,/^exit_marker$/d", image_path], stdout=subprocess.PIPE, preexec_fn=default_sigpipe)
-            p2 = subprocess.Popen(["tar", "xf", "-", PLATFORMS_ASIC, "-O"], stdin=p1.stdout, stdout=subprocess.PIPE, stderr=fnull, preexec_fn=default_sigpipe)
-            p3 = subprocess.Popen(["grep", "-Fxq", "-m 1", platform], stdin=p2.stdout, preexec_fn=default_sigpipe)
-
-            p2.wait()
-            if p2.returncode != 0:
-                return True
-
-            # Code 0 is returned by grep as a result of found
-            p3.wait()
-            return p3.returncode ==0
+        image_info = read_onie_image_info(image_path)
+        if image_info is None or image_info.platforms is None:
+            return True
+
+        return platform in image_info.platforms
 
     def verify_image_platform(self, image_path):
         if not os.path.isfile(image_path):
@@ -2,17 +2,165 @@
 Common logic for bootloaders using an ONIE installer image
 """
 
+import mmap
 import os
 import re
-import subprocess
+import tarfile
+from collections import OrderedDict, namedtuple
 
 from ..common import (
    IMAGE_DIR_PREFIX,
    IMAGE_PREFIX,
-   default_sigpipe,
 )
 from .bootloader import Bootloader
 
+PLATFORMS_ASIC = "installer/platforms_asic"
+# The installer is a shell archive: a shell script header ending with the
+# exit_marker line, followed by the tar payload
+EXIT_MARKER = b"exit_marker\n"
+IMAGE_VERSION_LINE_RE = re.compile(rb"^image_version.*$", re.MULTILINE)
+IMAGE_VERSION_RE = re.compile(rb'image_version="(.*)"')
+# The header verifies the payload against its SHA1 before installing
+PAYLOAD_SHA1_RE = re.compile(rb"^payload_sha1=([0-9a-fA-F]{40})$", re.MULTILINE)
+# Signed images have a CMS signature appended after the payload, the header
+# records the size of the payload it covers
+PAYLOAD_IMAGE_SIZE_RE = re.compile(rb"^payload_image_size=([0-9]+)$", re.MULTILINE)
+IMAGE_INFO_CACHE_SIZE = 4
+
+# version: image_version of the header, None if there is none
+# platforms: lines of installer/platforms_asic, None if the payload has none
+# payload_offset: offset of the tar payload, None if there is no exit_marker
+OnieImageInfo = namedtuple('OnieImageInfo', ['version', 'platforms', 'payload_offset'])
+
+# (path, mtime, size) -> OnieImageInfo of the last images read
+_image_info_cache = OrderedDict()
+
+
+def parse_image_header(buf):
+    """
+    Returns the image version and the payload offset of the installer
+    mapped in buf, scanning the header only
+    """
+    if buf[:len(EXIT_MARKER)] == EXIT_MARKER:
+        header_end = 0
+    else:
+        header_end = buf.find(b"\n" + EXIT_MARKER)
+        if header_end >= 0:
+            header_end += 1
+    if header_end < 0:
+        header_end = len(buf)
+        payload_offset = None
+    else:
+        payload_offset = header_end + len(EXIT_MARKER)
+
+    version = None
+    # Like grep -m 1 ^image_version, only the first line is considered
+    line = IMAGE_VERSION_LINE_RE.search(buf, 0, header_end)
+    if line:
+        match = IMAGE_VERSION_RE.fullmatch(line.group())
+        if match and match.group(1):
+            version = match.group(1).decode('utf-8', 'replace')
+    return version, payload_offset
+
+
+def parse_payload_sha1(header):
+    """
+    Returns the payload SHA1 recorded in the installer header, or None
+    """
+    match = PAYLOAD_SHA1_RE.search(header)
+    return match.group(1).decode().lower() if match else None
+
+
+def parse_payload_image_size(header):
+    """
+    Returns the payload size recorded in the header of signed installers,
+    or None
+    """
+    match = PAYLOAD_IMAGE_SIZE_RE.search(header)
+    return int(match.group(1)) if match else None
+
+
+def is_platforms_asic_member(name):
+    return name.lstrip('./') == PLATFORMS_ASIC
+
+
+def parse_platforms(content):
+    return frozenset(content.decode('utf-8', 'replace').splitlines())
+
+
+def read_payload_platforms(fp, payload_offset):
+    """
+    Returns the target platforms listed in installer/platforms_asic of the
+    tar payload, or None for the images built without it. The members
+    before it are skipped over, not read.
+    """
+    fp.seek(payload_offset)
+    try:
+        with tarfile.open(fileobj=fp, mode='r:*') as tar:
+            for member in tar:
+                if not is_platforms_asic_member(member.name):
+                    continue
+                content = tar.extractfile(member)
+                if content is None:
+                    return None
+                return parse_platforms(content.read())
+    except (tarfile.TarError, EOFError, OSError):
+        pass
+    return None
+
+
+def _read_onie_image_info(image_path, size):
+    with open(image_path, 'rb') as fp:
+        if size == 0:
+            return OnieImageInfo(None, None, None)
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            version, payload_offset = parse_image_header(buf)
+        platforms = None
+        if payload_offset is not None:
+            platforms = read_payload_platforms(fp, payload_offset)
+    return OnieImageInfo(version, platforms, payload_offset)
+
+
+def _image_info_key(image_path):
+    st = os.stat(image_path)
+    return os.path.realpath(image_path), st.st_mtime_ns, st.st_size
+
+
+def _cache_image_info(key, image_info):
+    _image_info_cache[key] = image_info
+    _image_info_cache.move_to_end(key)
+    while len(_image_info_cache) > IMAGE_INFO_CACHE_SIZE:
+        _image_info_cache.popitem(last=False)
+
+
+def read_onie_image_info(image_path):
+    """
+    Returns the OnieImageInfo of the installer image_path, or None if it
+    cannot be read. The image is read once per path, mtime and size, so
+    the checks done by sonic-installer on a new image share one read.
+    """
+    try:
+        key = _image_info_key(image_path)
+        image_info = _image_info_cache.get(key)
+        if image_info is None:
+            image_info = _read_onie_image_info(key[0], key[2])
+            _cache_image_info(key, image_info)
+        return image_info
+    except (OSError, ValueError):
+        return None
+
+
+def cache_onie_image_info(image_path, image_info):
+    """
+    Records image_info, parsed while image_path was being written, so that
+    read_onie_image_info() does not read the image again
+    """
+    try:
+        _cache_image_info(_image_info_key(image_path), image_info)
+    except OSError:
+        pass
+
+
 class OnieInstallerBootloader(Bootloader): # pylint: disable=abstract-method
 
     DEFAULT_IMAGE_PATH = '/tmp/sonic_image'
@@ -28,19 +176,13 @@ class OnieInstallerBootloader(Bootloader): # pylint: disable=abstract-method
 
     def get_binary_image_version(self, image_path):
         """returns the version of the image"""
-        p1 = subprocess.Popen(["cat", "-v", image_path], stdout=subprocess.PIPE, preexec_fn=default_sigpipe)
-        p2 = subprocess.Popen(["grep", "-m 1", "^image_version"], stdin=p1.stdout, stdout=subprocess.PIPE, preexec_fn=default_sigpipe)
-        p3 = subprocess.Popen(["sed", "-n", r"s/^image_version=\"\(.*\)\"$/\1/p"], stdin=p2.stdout, stdout=subprocess.PIPE, preexec_fn=default_sigpipe, text=True)
-
-        stdout = p3.communicate()[0]
-        p3.wait()
-        version_num = stdout.rstrip('\n')
+        image_info = read_onie_image_info(image_path)
 
         # If we didn't read a version number, this doesn't appear to be a valid SONiC image file
-        if not version_num:
+        if image_info is None or not image_info.version:
             return None
 
-        return IMAGE_PREFIX + version_num
+        return IMAGE_PREFIX + image_info.version
 
     def verify_secureboot_image(self, image_path):
         return os.path.isfile(image_path)
@@ -0,0 +1,318 @@
+"""
+Image download for sonic-installer.
+
+Images are streamed in large chunks into a partial file next to the target
+path. The SHA256 of the image and, for ONIE installers, the header metadata
+and the target platforms of the payload are computed while the data
+arrives, so the checks done on a new image don't need to read it again.
+
+An interrupted download is resumed with an HTTP Range request, both when
+the connection drops and when sonic-installer is run again with the same
+URL. If-Range makes the server send the whole image again if it changed.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import tarfile
+import time
+from collections import namedtuple
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from .bootloader.onie import (
+    OnieImageInfo,
+    cache_onie_image_info,
+    is_platforms_asic_member,
+    parse_image_header,
+    parse_payload_image_size,
+    parse_payload_sha1,
+    parse_platforms,
+)
+from .exception import SonicRuntimeException
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_RETRIES = 5
+# Seconds without data before the connection is considered lost
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_RETRY_INTERVAL = 2
+# The header of an ONIE installer is a few KB, only look for the
+# exit_marker in the beginning of the image
+MAX_HEADER_SIZE = 1024 * 1024
+PARTIAL_SUFFIX = '.part'
+PARTIAL_STATE_SUFFIX = '.part.json'
+
+# image_info is the OnieImageInfo of ONIE installers, None for other images
+DownloadResult = namedtuple('DownloadResult', ['path', 'size', 'sha256', 'image_info'])
+
+
+class PayloadPlatformsParser(object):
+    """
+    Looks for installer/platforms_asic in an uncompressed tar stream fed
+    in chunks, skipping over the data of the other members.
+
+    done is set once the archive is known to have or not to have the
+    platforms list, platforms is None in the latter case. Streams which
+    are not plain tar archives are never done.
+    """
+
+    def __init__(self):
+        self.buf = b''
+        self.skip = 0
+        self.member = None
+        self.done = False
+        self.platforms = None
+
+    def update(self, data):
+        if self.done or self.buf is None:
+            return
+        if self.skip:
+            skipped = min(self.skip, len(data))
+            self.skip -= skipped
+            data = data[skipped:]
+        self.buf += data
+        while not self.done and self.buf is not None and not self.skip:
+            if self.member is not None:
+                if len(self.buf) < self.member.size:
+                    return
+                self.platforms = parse_platforms(self.buf[:self.member.size])
+                self.done = True
+                self.buf = b''
+                return
+            if len(self.buf) < tarfile.BLOCKSIZE:
+                return
+            block, self.buf = self.buf[:tarfile.BLOCKSIZE], self.buf[tarfile.BLOCKSIZE:]
+            try:
+                member = tarfile.TarInfo.frombuf(block, tarfile.ENCODING, 'surrogateescape')
+            except tarfile.EOFHeaderError:
+                # End of archive
+                self.done = True
+                self.buf = b''
+                return
+            except tarfile.HeaderError:
+                # Compressed or not a tar archive
+                self.buf = None
+                return
+            if member.isreg() and is_platforms_asic_member(member.name):
+                self.member = member
+                continue
+            blocks, remainder = divmod(member.size, tarfile.BLOCKSIZE)
+            if remainder:
+                blocks += 1
+            skipped = min(blocks * tarfile.BLOCKSIZE, len(self.buf))
+            self.skip = blocks * tarfile.BLOCKSIZE - skipped
+            self.buf = self.buf[skipped:]
+
+
+class ImageStreamParser(object):
+    """
+    Hashes an image fed in chunks and parses the header and the payload
+    of ONIE installers on the fly
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.header = b''
+        self.version = None
+        self.payload_offset = None
+        self.payload_sha1 = None
+        self.payload_size = None
+        self.payload_received = 0
+        self.payload_hash = None
+        self.platforms_parser = None
+
+    def update(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        if self.payload_offset is not None:
+            self._update_payload(data)
+        elif self.header is not None:
+            self._update_header(data)
+
+    def _update_header(self, data):
+        self.header += data
+        version, payload_offset = parse_image_header(self.header)
+        if payload_offset is None:
+            if len(self.header) > MAX_HEADER_SIZE:
+                self.header = None
+            return
+        self.version = version
+        self.payload_offset = payload_offset
+        self.payload_sha1 = parse_payload_sha1(self.header[:payload_offset])
+        self.payload_size = parse_payload_image_size(self.header[:payload_offset])
+        self.payload_hash = hashlib.sha1()
+        self.platforms_parser = PayloadPlatformsParser()
+        payload = self.header[payload_offset:]
+        self.header = None
+        self._update_payload(payload)
+
+    def _update_payload(self, data):
+        # Like sharch_body, which hashes head -c $payload_image_size of the
+        # payload, the signature of signed images is left out
+        if self.payload_size is not None:
+            data = data[:max(self.payload_size - self.payload_received, 0)]
+        self.payload_received += len(data)
+        self.payload_hash.update(data)
+        self.platforms_parser.update(data)
+
+    def verify_payload(self):
+        """
+        Returns False if the payload does not match the SHA1 of the header
+        """
+        if self.payload_sha1 is None:
+            return True
+        if self.payload_size is not None and self.payload_received < self.payload_size:
+            return False
+        return self.payload_hash.hexdigest() == self.payload_sha1
+
+    def get_image_info(self):
+        """
+        Returns the OnieImageInfo of the image, or None if it is not an
+        ONIE installer or its payload could not be parsed on the fly
+        """
+        if self.payload_offset is None or not self.platforms_parser.done:
+            return None
+        return OnieImageInfo(self.version, self.platforms_parser.platforms, self.payload_offset)
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def load_partial_state(state_path, url):
+    """
+    Returns the validator of the partial download of url, '' if it has
+    none, or None if there is no partial download of url
+    """
+    try:
+        with open(state_path) as fp:
+            state = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('url') != url:
+        return None
+    return state.get('validator', '')
+
+
+def save_partial_state(state_path, url, validator):
+    try:
+        with open(state_path, 'w') as fp:
+            json.dump({'url': url, 'validator': validator}, fp)
+    except OSError:
+        pass
+
+
+def get_validator(response):
+    """
+    Returns the ETag or the Last-Modified header, which If-Range accepts
+    to tell whether the image changed since the partial download
+    """
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified') or ''
+
+
+def get_content_range_start(response):
+    # Content-Range: bytes <start>-<end>/<size>
+    content_range = response.headers.get('Content-Range', '')
+    try:
+        unit, byte_range = content_range.split(' ', 1)
+        if unit != 'bytes':
+            return None
+        return int(byte_range.split('-', 1)[0])
+    except ValueError:
+        return None
+
+
+def download_image(url, image_path, reporthook=None, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                   retries=DOWNLOAD_RETRIES, timeout=DOWNLOAD_TIMEOUT, retry_interval=DOWNLOAD_RETRY_INTERVAL):
+    """
+    Downloads url to image_path and returns its DownloadResult.
+
+    reporthook is called like the one of urlretrieve, with the number of
+    bytes downloaded, 1 and the image size, or -1 if it is unknown.
+
+    Raises SonicRuntimeException if the image could not be downloaded
+    after retries resumed attempts without progress, or if its payload
+    does not match the checksum of its header.
+    """
+    partial_path = image_path + PARTIAL_SUFFIX
+    state_path = image_path + PARTIAL_STATE_SUFFIX
+
+    parser = ImageStreamParser()
+    # Without a validator, the server could not tell whether the image
+    # changed since the previous run
+    validator = load_partial_state(state_path, url)
+    if validator and os.path.isfile(partial_path):
+        # The bytes already downloaded are hashed and parsed again from disk
+        with open(partial_path, 'rb') as fp:
+            for data in iter(lambda: fp.read(chunk_size), b''):
+                parser.update(data)
+    else:
+        validator = None
+
+    reported = False
+    failures = 0
+    while True:
+        offset = parser.size
+        request = Request(url)
+        if offset:
+            request.add_header('Range', 'bytes={}-'.format(offset))
+            if validator:
+                request.add_header('If-Range', validator)
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                if offset and (response.getcode() != 206 or get_content_range_start(response) != offset):
+                    # The server ignored the range or the image changed, start over
+                    parser = ImageStreamParser()
+                    offset = 0
+
+                length = response.headers.get('Content-Length')
+                total_size = offset + int(length) if length is not None else -1
+                validator = get_validator(response)
+                save_partial_state(state_path, url, validator)
+
+                if reporthook and not reported:
+                    reporthook(0, 1, total_size)
+                    reported = True
+                with open(partial_path, 'ab' if offset else 'wb') as fp:
+                    for data in iter(lambda: response.read(chunk_size), b''):
+                        fp.write(data)
+                        parser.update(data)
+                        if reporthook:
+                            reporthook(parser.size, 1, total_size)
+
+                if total_size >= 0 and parser.size < total_size:
+                    raise http.client.IncompleteRead(b'', total_size - parser.size)
+            break
+        except HTTPError as e:
+            if e.code != 416 or not offset:
+                raise SonicRuntimeException("Failed to download {}: {}".format(url, e))
+            # Range not satisfiable, the image changed, start over
+            remove_file(partial_path)
+            parser = ImageStreamParser()
+            validator = None
+        except (OSError, http.client.HTTPException) as e:
+            failures = failures + 1 if parser.size <= offset else 1
+            if failures > retries:
+                raise SonicRuntimeException("Failed to download {}: {}".format(url, e))
+            time.sleep(retry_interval)
+
+    if not parser.verify_payload():
+        remove_file(partial_path)
+        remove_file(state_path)
+        raise SonicRuntimeException("Image payload checksum mismatch, the download of {} is corrupted".format(url))
+
+    os.replace(partial_path, image_path)
+    remove_file(state_path)
+
+    image_info = parser.get_image_info()
+    if image_info is not None:
+        cache_onie_image_info(image_path, image_info)
+    return DownloadResult(image_path, parser.size, parser.sha256.hexdigest(), image_info)
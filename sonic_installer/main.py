@@ -5,7 +5,7 @@ import subprocess
 import sys
 import time
 import utilities_common.cli as clicommon
-from urllib.request import urlopen, urlretrieve
+from urllib.request import urlopen
 
 import click
 from sonic_py_common import logger
@@ -19,6 +19,7 @@ from .common import (
     WORKDIR_NAME,
     DOCKERDIR_NAME,
 )
+from .download import download_image
 from .exception import SonicRuntimeException
 
 SYSLOG_IDENTIFIER = "sonic-installer"
@@ -542,11 +543,12 @@ def install(url, force, skip_platform_check=False, skip_migration=False, skip_pa
         echo_and_log('Downloading image...')
         validate_url_or_abort(url)
         try:
-            urlretrieve(url, bootloader.DEFAULT_IMAGE_PATH, reporthook)
+            result = download_image(url, bootloader.DEFAULT_IMAGE_PATH, reporthook)
             click.echo('')
         except Exception as e:
-            echo_and_log("Download error", e)
+            echo_and_log("Download error: {}".format(e), LOG_ERR)
             raise click.Abort()
+        echo_and_log("Downloaded {} bytes, SHA256 {}".format(result.size, result.sha256))
         image_path = bootloader.DEFAULT_IMAGE_PATH
     else:
         image_path = os.path.join("./", url)
@@ -794,10 +796,12 @@ def upgrade_docker(container_name, url, cleanup_image, skip_check, tag, warm):
         echo_and_log('Downloading image...')
         validate_url_or_abort(url)
         try:
-            urlretrieve(url, DEFAULT_IMAGE_PATH, reporthook)
+            result = download_image(url, DEFAULT_IMAGE_PATH, reporthook)
+            click.echo('')
         except Exception as e:
             echo_and_log("Download error: {}".format(e), LOG_ERR)
             raise click.Abort()
+        echo_and_log("Downloaded {} bytes, SHA256 {}".format(result.size, result.sha256))
         image_path = DEFAULT_IMAGE_PATH
     else:
         image_path = os.path.join("./", url)
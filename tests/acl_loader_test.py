@@ -294,6 +294,99 @@ class TestAclLoader(object):
         acl_loader.incremental_update()
         assert acl_loader.rules_info[(('NTP_ACL', 'RULE_1'))]["PACKET_ACTION"] == "DROP"
 
+    def test_diff_rules(self, acl_loader):
+        acl_loader.rules_info = {
+            ('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"},
+            ('DATAACL', 'RULE_2'): {"PRIORITY": "9998", "PACKET_ACTION": "FORWARD", "VLAN_ID": 100},
+            ('DATAACL', 'RULE_4'): {"PRIORITY": "9996", "PACKET_ACTION": "FORWARD"},
+        }
+        acl_loader.rules_db_info = {
+            ('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "FORWARD"},
+            ('DATAACL', 'RULE_2'): {"PRIORITY": "9998", "PACKET_ACTION": "FORWARD", "VLAN_ID": "100"},
+            ('DATAACL', 'RULE_3'): {"PRIORITY": "9997", "PACKET_ACTION": "FORWARD"},
+            ('EVERFLOW', 'RULE_1'): {"PRIORITY": "9999", "MIRROR_ACTION": "everflow0"},
+        }
+        added, removed, changed = acl_loader.diff_rules()
+        assert added == {('DATAACL', 'RULE_4')}
+        assert removed == {('DATAACL', 'RULE_3'), ('EVERFLOW', 'RULE_1')}
+        assert changed == {('DATAACL', 'RULE_1')}
+
+        acl_loader.current_table = 'DATAACL'
+        try:
+            added, removed, changed = acl_loader.diff_rules()
+        finally:
+            acl_loader.current_table = None
+        assert removed == {('DATAACL', 'RULE_3')}
+
+    def test_diff_update(self, acl_loader):
+        acl_loader.rules_info = {
+            ('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"},
+            ('DATAACL', 'RULE_2'): {"PRIORITY": "9998", "PACKET_ACTION": "FORWARD"},
+            ('DATAACL', 'RULE_4'): {"PRIORITY": "9996", "PACKET_ACTION": "FORWARD"},
+        }
+        acl_loader.rules_db_info = {
+            ('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "FORWARD"},
+            ('DATAACL', 'RULE_2'): {"PRIORITY": "9998", "PACKET_ACTION": "FORWARD", "VLAN_ID": "100"},
+            ('DATAACL', 'RULE_3'): {"PRIORITY": "9997", "PACKET_ACTION": "FORWARD"},
+        }
+        configdb = mock.MagicMock()
+        acl_loader.pipe_configdbs = {"": configdb}
+        try:
+            timing = acl_loader.diff_update(dry_run=True)
+            assert set(timing) == {"diff"}
+            configdb.mod_config.assert_not_called()
+
+            timing = acl_loader.diff_update()
+        finally:
+            acl_loader.pipe_configdbs = None
+        assert set(timing) == {"diff", "remove", "program"}
+        # RULE_2 lost a field and is reinstalled, RULE_1 is updated in place
+        assert configdb.mod_config.call_args_list == [
+            mock.call({"ACL_RULE": {('DATAACL', 'RULE_2'): None, ('DATAACL', 'RULE_3'): None}}),
+            mock.call({"ACL_RULE": {key: acl_loader.rules_info[key] for key in acl_loader.rules_info}}),
+        ]
+
+    def test_diff_update_shifted_priority(self, acl_loader):
+        acl_loader.tables_db_info['NTP_ACL'] = {
+            "stage": "INGRESS",
+            "type": "CTRLPLANE"
+        }
+        acl_loader.rules_info = {
+            ('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"},
+            ('DATAACL', 'RULE_2'): {"PRIORITY": "9997", "PACKET_ACTION": "FORWARD"},
+            ('DATAACL', 'RULE_3'): {"PRIORITY": "9996", "PACKET_ACTION": "FORWARD"},
+            ('NTP_ACL', 'RULE_1'): {"PRIORITY": "9998", "PACKET_ACTION": "ACCEPT"},
+        }
+        acl_loader.rules_db_info = {
+            ('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"},
+            ('DATAACL', 'RULE_2'): {"PRIORITY": "9998", "PACKET_ACTION": "FORWARD"},
+            ('DATAACL', 'RULE_4'): {"PRIORITY": "9995", "PACKET_ACTION": "FORWARD"},
+            ('NTP_ACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "ACCEPT"},
+        }
+        assert acl_loader.get_shifted_tables(acl_loader.diff_rules()[2]) == {'DATAACL'}
+        configdb = mock.MagicMock()
+        acl_loader.pipe_configdbs = {"": configdb}
+        try:
+            acl_loader.diff_update()
+        finally:
+            acl_loader.pipe_configdbs = None
+        # RULE_2 of DATAACL moved, the whole dataplane table is programmed again
+        # while the control plane rule is updated in place
+        assert configdb.mod_config.call_args_list == [
+            mock.call({"ACL_RULE": {key: None for key in acl_loader.rules_db_info if key[0] == 'DATAACL'}}),
+            mock.call({"ACL_RULE": acl_loader.rules_info}),
+        ]
+
+    def test_diff_update_no_change(self, acl_loader):
+        acl_loader.rules_info = {('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"}}
+        acl_loader.rules_db_info = {('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"}}
+        configdb = mock.MagicMock()
+        acl_loader.pipe_configdbs = {"": configdb}
+        try:
+            acl_loader.diff_update()
+        finally:
+            acl_loader.pipe_configdbs = None
+        configdb.mod_config.assert_not_called()
 
 
 class TestMasicAclLoader(object):
@@ -333,3 +426,14 @@ class TestMasicAclLoader(object):
         acl_loader.load_rules_from_file(os.path.join(test_path, 'acl_input/incremental_2.json'))
         acl_loader.incremental_update()
         assert acl_loader.rules_info[(('NTP_ACL', 'RULE_1'))]["PACKET_ACTION"] == "DROP"
+
+    def test_diff_update(self, acl_loader):
+        acl_loader.rules_info = {('DATAACL', 'RULE_1'): {"PRIORITY": "9999", "PACKET_ACTION": "DROP"}}
+        acl_loader.rules_db_info = {('DATAACL', 'RULE_2'): {"PRIORITY": "9998", "PACKET_ACTION": "DROP"}}
+        acl_loader.pipe_configdbs = None
+        with mock.patch("acl_loader.main.ConfigDBPipeConnector") as pipe_connector:
+            acl_loader.diff_update()
+        acl_loader.pipe_configdbs = None
+        # One pipelined connector for the global and for every front asic namespace
+        assert pipe_connector.call_args_list == [mock.call(), mock.call(namespace='asic0'), mock.call(namespace='asic1')]
+        assert pipe_connector.return_value.mod_config.call_count == 6
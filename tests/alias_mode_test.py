@@ -0,0 +1,120 @@
+import re
+from unittest import mock
+
+import pytest
+
+from .mock_tables import dbconnector  # noqa: F401
+
+import utilities_common.cli as clicommon
+
+NUM_PORTS = 512
+
+
+def make_port_dict(num_ports):
+    return {"Ethernet{}".format(i * 4): {"alias": "etp{}".format(i + 1), "lanes": str(i * 4)}
+            for i in range(num_ports)}
+
+
+def make_converter(port_dict):
+    db = mock.MagicMock()
+    db.cfgdb.get_table.return_value = port_dict
+    with mock.patch("utilities_common.cli.load_db_config"):
+        return clicommon.InterfaceAliasConverter(db)
+
+
+def convert_per_port(port_dict, line):
+    """ The per port regex substitution the default conversion used to do """
+    for port_name in port_dict:
+        line = re.sub(r"(^|\s){}($|,{{0,1}}\s)".format(port_name),
+                      r"\1{}\2".format(port_dict[port_name]['alias']), line)
+    return line
+
+
+class TestPortAliasIndex(object):
+    def test_name_alias_conversion(self):
+        converter = make_converter(make_port_dict(8))
+        assert converter.name_to_alias("Ethernet4") == "etp2"
+        assert converter.name_to_alias("Ethernet4.10") == "etp2.10"
+        assert converter.name_to_alias("Ethernet400") == "Ethernet400"
+        assert converter.name_to_alias(None) is None
+        assert converter.alias_to_name("etp2") == "Ethernet4"
+        assert converter.alias_to_name("etp2.10") == "Ethernet4.10"
+        assert converter.alias_to_name("etp100") == "etp100"
+        assert converter.alias_max_length == 4
+
+    def test_first_port_owns_alias(self):
+        converter = make_converter({"Ethernet0": {"alias": "etp1"}, "Ethernet4": {"alias": "etp1"}})
+        assert converter.alias_to_name("etp1") == "Ethernet0"
+
+    def test_empty_port_table(self):
+        converter = make_converter(None)
+        assert converter.port_dict == {}
+        assert converter.name_to_alias("Ethernet0") == "Ethernet0"
+
+    @pytest.mark.parametrize("line", [
+        "Ethernet0 is up\n",
+        "  Ethernet0, Ethernet4 and Ethernet8\n",
+        "Ethernet0,Ethernet4 stay\n",
+        "PortChannel0001  Ethernet16(S)  Ethernet124\n",
+        "xEthernet0 Ethernet0x Ethernet40\n",
+        "Ethernet0",
+    ])
+    def test_replace_names(self, line):
+        port_dict = make_port_dict(32)
+        index = clicommon.PortAliasIndex(port_dict)
+        assert index.replace_names(line) == convert_per_port(port_dict, line)
+
+    def test_replace_adjacent_names(self):
+        index = clicommon.PortAliasIndex(make_port_dict(2))
+        assert index.replace_names("Ethernet0 Ethernet0 Ethernet4\n") == "etp1 etp1 etp2\n"
+
+    def test_index_built_once(self):
+        clicommon.port_alias_indexes.clear()
+        try:
+            with mock.patch("utilities_common.cli.load_db_config"), \
+                    mock.patch("sonic_py_common.multi_asic.get_namespace_list", return_value=['asic0', 'asic1']), \
+                    mock.patch("sonic_py_common.multi_asic.get_port_table",
+                               return_value=make_port_dict(4)) as get_port_table:
+                for _ in range(3):
+                    converter = clicommon.InterfaceAliasConverter()
+                    assert converter.name_to_alias("Ethernet12") == "etp4"
+            assert get_port_table.call_count == 1
+        finally:
+            clicommon.port_alias_indexes.clear()
+
+
+class TestAliasModeOutput(object):
+    def test_print_lines(self, capsys):
+        converter = make_converter(make_port_dict(8))
+        with mock.patch("utilities_common.cli.iface_alias_converter", converter):
+            clicommon.print_lines_in_alias_mode("portstat", iter([
+                "    IFACE    STATE\n",
+                "---------  -------\n",
+                "Ethernet4        U\n",
+            ]))
+            clicommon.print_lines_in_alias_mode("show vlan brief", iter(["Vlan1000  Ethernet4, Ethernet8\n"]))
+        assert capsys.readouterr().out.splitlines() == [
+            "IFACE    STATE",
+            "-----  -------",
+            "etp2        U",
+            "Vlan1000  etp2, etp3",
+        ]
+
+    def test_default_conversion_one_pass_per_line(self, capsys):
+        port_dict = make_port_dict(NUM_PORTS)
+        converter = make_converter(port_dict)
+        lines = ["Ethernet{}  Vlan{}  Ethernet{}, Ethernet{}\n".format(
+                 i % NUM_PORTS * 4, i, (i + 1) % NUM_PORTS * 4, (i * 7) % 4096 + 4096)
+                 for i in range(1000)]
+        expected = [convert_per_port(port_dict, line).rstrip('\n') for line in lines]
+
+        with mock.patch("utilities_common.cli.iface_alias_converter", converter), \
+                mock.patch.object(clicommon.PortAliasIndex, "replace_names", autospec=True,
+                                  side_effect=clicommon.PortAliasIndex.replace_names) as replace_names, \
+                mock.patch("utilities_common.cli.re.sub", side_effect=re.sub) as re_sub:
+            clicommon.print_lines_in_alias_mode("show vlan brief", iter(lines))
+
+        assert capsys.readouterr().out.splitlines() == expected
+        # A single substitution per line instead of one per port
+        assert replace_names.call_count == len(lines)
+        re_sub.assert_not_called()
@@ -0,0 +1,185 @@
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from utilities_common import asic_object_map
+from utilities_common.asic_object_map import get_asic_object_maps
+
+from .bulk_db_test import CountingRedis, MockCountersDb, MockSwssCountersDb, pipeline_client  # noqa: F401
+
+BRIDGE_PORT_PREFIX = 'ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:'
+VLAN_PREFIX = 'ASIC_STATE:SAI_OBJECT_TYPE_VLAN:'
+
+
+class MockAsicDb(MockCountersDb):
+    def connect(self, db_name, retry_on=True):
+        pass
+
+
+class MockSwssAsicDb(MockSwssCountersDb):
+    def connect(self, db_name, retry_on=True):
+        pass
+
+
+def make_db(num_ports, num_vlans, db_class=MockAsicDb):
+    client = CountingRedis()
+    for port in range(num_ports):
+        port_oid = 'oid:0x1000000000{:04x}'.format(port)
+        bridge_port_oid = 'oid:0x3a00000000{:04x}'.format(port)
+        client.hset('COUNTERS_PORT_NAME_MAP', 'Ethernet{}'.format(port * 4), port_oid)
+        client.hset(BRIDGE_PORT_PREFIX + bridge_port_oid, 'SAI_BRIDGE_PORT_ATTR_TYPE', 'SAI_BRIDGE_PORT_TYPE_PORT')
+        client.hset(BRIDGE_PORT_PREFIX + bridge_port_oid, 'SAI_BRIDGE_PORT_ATTR_PORT_ID', port_oid)
+        client.hset('VIDTORID', bridge_port_oid, 'oid:0x{:x}'.format(port))
+    client.hset('COUNTERS_LAG_NAME_MAP', 'PortChannel0001', 'oid:0x2000000000001')
+    # the CPU port is not a SONiC interface
+    client.hset('COUNTERS_PORT_NAME_MAP', 'CPU', 'oid:0x1000000000fff')
+    # the 1Q bridge port has no port
+    client.hset(BRIDGE_PORT_PREFIX + 'oid:0x3a000000000fff', 'SAI_BRIDGE_PORT_ATTR_TYPE', 'SAI_BRIDGE_PORT_TYPE_1Q_ROUTER')
+    for vlan in range(num_vlans):
+        client.hset(VLAN_PREFIX + 'oid:0x26{:012x}'.format(vlan), 'SAI_VLAN_ATTR_VLAN_ID', str(vlan + 2))
+    # default vlan, no VLAN_ID attribute
+    client.hset(VLAN_PREFIX + 'oid:0x26000000000fff', 'NULL', 'NULL')
+    client.set('VIDCOUNTER', str(num_ports + num_vlans))
+    client.requests = 0
+    return db_class(client)
+
+
+def read_maps_per_object(db):
+    """ The access pattern of port_util.get_interface_oid_map, get_bridge_port_map and get_vlan_ids """
+    if_name_map = db.get_all(db.COUNTERS_DB, 'COUNTERS_PORT_NAME_MAP')
+    if_name_map.update(db.get_all(db.COUNTERS_DB, 'COUNTERS_LAG_NAME_MAP'))
+    if_br_oid_map = {}
+    for key in db.keys(db.ASIC_DB, BRIDGE_PORT_PREFIX + '*'):
+        ent = db.get_all(db.ASIC_DB, key)
+        if 'SAI_BRIDGE_PORT_ATTR_PORT_ID' in ent:
+            if_br_oid_map[key[len(BRIDGE_PORT_PREFIX + 'oid:0x'):]] = ent['SAI_BRIDGE_PORT_ATTR_PORT_ID'][len('oid:0x'):]
+    bvid_vlan_map = {}
+    for key in db.keys(db.ASIC_DB, VLAN_PREFIX + '*'):
+        bvid_vlan_map[key[len(VLAN_PREFIX):]] = db.get_all(db.ASIC_DB, key).get('SAI_VLAN_ATTR_VLAN_ID')
+    return if_br_oid_map, bvid_vlan_map
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    path = str(tmp_path / 'default.json')
+    with mock.patch.object(asic_object_map, 'get_cache_file', return_value=path):
+        yield path
+
+
+class TestAsicObjectMaps(object):
+    def test_maps(self):
+        db = make_db(4, 2)
+        maps = get_asic_object_maps(db, use_cache=False)
+        assert maps.if_name_map['Ethernet4'] == '10000000000001'
+        assert maps.if_name_map['CPU'] == '1000000000fff'
+        assert maps.if_oid_map == {
+            '10000000000000': 'Ethernet0', '10000000000001': 'Ethernet4',
+            '10000000000002': 'Ethernet8', '10000000000003': 'Ethernet12',
+            '2000000000001': 'PortChannel0001'}
+        assert maps.if_br_oid_map['3a000000000001'] == '10000000000001'
+        assert '3a000000000fff' not in maps.if_br_oid_map
+        assert maps.if_br_oid_type_map['3a000000000001'] == 'SAI_BRIDGE_PORT_TYPE_PORT'
+        assert maps.get_if_br_oid_to_port_name_map()['3a000000000002'] == 'Ethernet8'
+        assert maps.get_vlan_ids(['oid:0x26000000000001', 'oid:0x26000000000fff', 'oid:0x260000000000ff']) == {
+            'oid:0x26000000000001': '3', 'oid:0x26000000000fff': None}
+        assert not maps.from_cache
+        assert maps.round_trips == db.client.requests
+
+    def test_same_maps_as_per_object_reads(self):
+        db = make_db(32, 16)
+        maps = get_asic_object_maps(db, use_cache=False)
+        assert read_maps_per_object(db) == (maps.if_br_oid_map, maps.bvid_vlan_map)
+
+    def test_cache(self, cache_file):
+        db = make_db(4, 2)
+        built = get_asic_object_maps(db, use_cache=True)
+        assert not built.from_cache
+        assert os.path.exists(cache_file)
+
+        db.client.requests = 0
+        cached = get_asic_object_maps(db, use_cache=True)
+        assert cached.from_cache
+        # the name maps and the generation marker only
+        assert cached.round_trips == db.client.requests == 3
+        assert cached.if_br_oid_map == built.if_br_oid_map
+        assert cached.bvid_vlan_map == built.bvid_vlan_map
+
+    def test_cache_invalidation(self, cache_file):
+        db = make_db(4, 2)
+        get_asic_object_maps(db, use_cache=True)
+
+        # new object
+        db.client.hset(VLAN_PREFIX + 'oid:0x26000000000010', 'SAI_VLAN_ATTR_VLAN_ID', '100')
+        db.client.incr('VIDCOUNTER')
+        maps = get_asic_object_maps(db, use_cache=True)
+        assert not maps.from_cache
+        assert maps.get_vlan_ids(['oid:0x26000000000010']) == {'oid:0x26000000000010': '100'}
+        assert get_asic_object_maps(db, use_cache=True).from_cache
+
+        # removed object
+        db.client.delete(BRIDGE_PORT_PREFIX + 'oid:0x3a000000000001')
+        db.client.hdel('VIDTORID', 'oid:0x3a000000000001')
+        maps = get_asic_object_maps(db, use_cache=True)
+        assert not maps.from_cache
+        assert '3a000000000001' not in maps.if_br_oid_map
+
+        # renamed interface
+        db.client.hset('COUNTERS_LAG_NAME_MAP', 'PortChannel0002', 'oid:0x2000000000002')
+        assert not get_asic_object_maps(db, use_cache=True).from_cache
+
+    def test_cache_swss_connector(self, cache_file, pipeline_client):
+        db = make_db(4, 2, MockSwssAsicDb)
+        assert not get_asic_object_maps(db, use_cache=True).from_cache
+        cached = get_asic_object_maps(db, use_cache=True)
+        assert cached.from_cache
+        assert cached.if_br_oid_map['3a000000000001'] == '10000000000001'
+
+    def test_cache_without_generation(self, cache_file, pipeline_client):
+        db = make_db(4, 2, MockSwssAsicDb)
+        # the DBConnector has no HLEN, VIDTORID cannot be counted
+        with mock.patch('utilities_common.bulk_db.connect_pipeline_client', return_value=None):
+            maps = get_asic_object_maps(db, use_cache=True)
+            assert not maps.from_cache
+            assert maps.if_br_oid_map['3a000000000001'] == '10000000000001'
+            assert not os.path.exists(cache_file)
+
+    def test_corrupted_cache(self, cache_file):
+        db = make_db(4, 2)
+        with open(cache_file, 'w') as fp:
+            fp.write('{')
+        assert not get_asic_object_maps(db, use_cache=True).from_cache
+        with open(cache_file) as fp:
+            assert json.load(fp)['version'] == asic_object_map.CACHE_VERSION
+
+    def test_cache_enabled_by_env(self, cache_file):
+        db = make_db(4, 2)
+        with mock.patch.dict(os.environ, {'SONIC_CLI_ASIC_MAP_CACHE': '1'}):
+            get_asic_object_maps(db)
+        assert os.path.exists(cache_file)
+        os.remove(cache_file)
+        with mock.patch.dict(os.environ, {'SONIC_CLI_ASIC_MAP_CACHE': '0'}):
+            get_asic_object_maps(db)
+        assert not os.path.exists(cache_file)
+
+    @pytest.mark.parametrize('num_ports,num_vlans', [
+        (64, 64),
+        pytest.param(512, 1000, marks=pytest.mark.benchmark),
+    ])
+    def test_round_trips(self, cache_file, num_ports, num_vlans):
+        db = make_db(num_ports, num_vlans)
+        expected = read_maps_per_object(db)
+        per_object_requests = db.client.requests
+
+        db.client.requests = 0
+        maps = get_asic_object_maps(db, use_cache=True)
+        bulk_requests = db.client.requests
+
+        db.client.requests = 0
+        cached = get_asic_object_maps(db, use_cache=True)
+
+        assert (maps.if_br_oid_map, maps.bvid_vlan_map) == expected
+        assert (cached.if_br_oid_map, cached.bvid_vlan_map) == expected
+        assert bulk_requests < per_object_requests // 10
+        assert db.client.requests == cached.round_trips < bulk_requests
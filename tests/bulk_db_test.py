@@ -0,0 +1,512 @@
+import fnmatch
+import json
+import re
+
+from unittest import mock
+
+import mockredis
+from mockredis.pipeline import MockRedisPipeline
+import pytest
+
+from utilities_common import bulk_db
+from utilities_common.bulk_db import BulkReader, CountersSnapshot, DbSnapshot, get_vlan_ids
+
+QUEUES_PER_PORT = 8
+QUEUE_COUNTERS = (
+    'SAI_QUEUE_STAT_PACKETS',
+    'SAI_QUEUE_STAT_BYTES',
+    'SAI_QUEUE_STAT_DROPPED_PACKETS',
+    'SAI_QUEUE_STAT_DROPPED_BYTES',
+)
+PORT_STATUS_FIELDS = ('oper_status', 'admin_status', 'speed', 'mtu', 'fec', 'alias', 'description')
+
+
+class CountingPipeline(MockRedisPipeline):
+    def execute(self):
+        self.mock_redis.requests += 1
+        self.mock_redis.in_pipeline = True
+        try:
+            return super(CountingPipeline, self).execute()
+        finally:
+            self.mock_redis.in_pipeline = False
+
+
+class CountingRedis(mockredis.MockRedis):
+    """
+    mockredis client which counts the requests sent to it, a pipeline
+    execute counts as a single request
+    """
+    def __init__(self, *args, **kwargs):
+        super(CountingRedis, self).__init__(strict=True, *args, **kwargs)
+        self.requests = 0
+        self.in_pipeline = False
+
+    # Same as mock_tables.dbconnector.SwssSyncClient, mockredis always
+    # encodes while SONiC connectors are opened with decode_responses
+    def _encode(self, value):
+        return super(CountingRedis, self)._encode(value).decode('utf-8')
+
+    def count(self):
+        if not self.in_pipeline:
+            self.requests += 1
+
+    def hget(self, *args, **kwargs):
+        self.count()
+        return super(CountingRedis, self).hget(*args, **kwargs)
+
+    def hgetall(self, *args, **kwargs):
+        self.count()
+        return super(CountingRedis, self).hgetall(*args, **kwargs)
+
+    def hmget(self, *args, **kwargs):
+        self.count()
+        return super(CountingRedis, self).hmget(*args, **kwargs)
+
+    def get(self, *args, **kwargs):
+        self.count()
+        return super(CountingRedis, self).get(*args, **kwargs)
+
+    def exists(self, *args, **kwargs):
+        self.count()
+        return super(CountingRedis, self).exists(*args, **kwargs)
+
+    def ping(self):
+        self.count()
+        return True
+
+    def hlen(self, *args, **kwargs):
+        self.count()
+        return super(CountingRedis, self).hlen(*args, **kwargs)
+
+    def keys(self, pattern='*'):
+        self.count()
+        regex = re.compile(fnmatch.translate(pattern))
+        return [key for key in self.redis if regex.match(key)]
+
+    # Same as mock_tables.dbconnector.SwssSyncClient
+    def scan(self, cursor=0, match=None, count=10):
+        keys = self.keys(match or '*')
+        cursor = int(cursor)
+        next_cursor = cursor + count
+        if next_cursor >= len(keys):
+            next_cursor = 0
+        return next_cursor, keys[cursor:cursor + count]
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return CountingPipeline(self, transaction, shard_hint)
+
+
+class MockCountersDb(object):
+    """
+    Minimal stand-in for a SonicV2Connector, all databases share the client
+    """
+    COUNTERS_DB = 'COUNTERS_DB'
+    ASIC_DB = 'ASIC_DB'
+    APPL_DB = 'APPL_DB'
+    STATE_DB = 'STATE_DB'
+    CONFIG_DB = 'CONFIG_DB'
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_redis_client(self, db_name):
+        return self.client
+
+    def get(self, db_name, key, field):
+        return self.client.hget(key, field)
+
+    def get_all(self, db_name, key):
+        return self.client.hgetall(key)
+
+    def keys(self, db_name, pattern):
+        return self.client.keys(pattern)
+
+
+class SwssDbConnector(object):
+    """
+    Stand-in for the swsscommon DBConnector returned by
+    SonicV2Connector.get_redis_client(), which has neither pipeline nor HMGET
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def hget(self, key, field):
+        return self.client.hget(key, field)
+
+    def hgetall(self, key):
+        return self.client.hgetall(key)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def exists(self, key):
+        return self.client.exists(key)
+
+    def keys(self, pattern='*'):
+        return self.client.keys(pattern)
+
+
+# namespace -> CountingRedis of the MockSwssCountersDb of the namespace
+SWSS_NAMESPACES = {}
+
+
+class MockSwssCountersDb(MockCountersDb):
+    """
+    SonicV2Connector stand-in handing out SwssDbConnector clients, the
+    pipelined reads go through the redis-py client of the pipeline_client
+    fixture
+    """
+    def __init__(self, client):
+        super(MockSwssCountersDb, self).__init__(client)
+        self.namespace = 'asic{}'.format(len(SWSS_NAMESPACES))
+        SWSS_NAMESPACES[self.namespace] = client
+
+    def get_redis_client(self, db_name):
+        return SwssDbConnector(self.client)
+
+
+@pytest.fixture
+def pipeline_client():
+    """
+    Connects the redis-py client of get_pipeline_client() to the
+    CountingRedis of the MockSwssCountersDb, yields the connected db names
+    """
+    connected = []
+
+    def connect(db_name, namespace):
+        connected.append(db_name)
+        client = SWSS_NAMESPACES[namespace]
+        client.ping()
+        return client
+
+    with mock.patch.object(bulk_db, 'connect_pipeline_client', side_effect=connect), \
+            mock.patch.dict(bulk_db._pipeline_clients, clear=True):
+        yield connected
+
+
+def make_counters_db(num_ports, db_class=MockCountersDb):
+    client = CountingRedis()
+    for port in range(num_ports):
+        port_name = 'Ethernet{}'.format(port * 4)
+        port_oid = 'oid:0x1000000000{:04x}'.format(port)
+        client.hset('COUNTERS_PORT_NAME_MAP', port_name, port_oid)
+        client.hset('RATES:' + port_oid, 'RX_BPS', '0')
+        for index in range(QUEUES_PER_PORT):
+            queue_oid = 'oid:0x15{:06x}{:02x}'.format(port, index)
+            client.hset('COUNTERS_QUEUE_NAME_MAP', '{}:{}'.format(port_name, index), queue_oid)
+            client.hset('COUNTERS_QUEUE_PORT_MAP', queue_oid, port_oid)
+            client.hset('COUNTERS_QUEUE_INDEX_MAP', queue_oid, str(index))
+            client.hset('COUNTERS_QUEUE_TYPE_MAP', queue_oid, 'SAI_QUEUE_TYPE_UNICAST')
+            for counter in QUEUE_COUNTERS:
+                client.hset('COUNTERS:' + queue_oid, counter, str(index))
+    client.requests = 0
+    return db_class(client)
+
+
+def make_asic_db(num_vlans, macs_per_vlan):
+    client = CountingRedis()
+    for vlan in range(num_vlans):
+        bvid = 'oid:0x26{:012x}'.format(vlan)
+        client.hset('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:' + bvid, 'SAI_VLAN_ATTR_VLAN_ID', str(vlan + 2))
+        for index in range(macs_per_vlan):
+            fdb = {'bvid': bvid, 'mac': '00:00:00:00:{:02X}:{:02X}'.format(index // 256, index % 256),
+                   'switch_id': 'oid:0x21000000000000'}
+            key = 'ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:' + json.dumps(fdb, separators=(',', ':'))
+            client.hset(key, 'SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID', 'oid:0x3a00000000{:04x}'.format(index % 32))
+            client.hset(key, 'SAI_FDB_ENTRY_ATTR_TYPE', 'SAI_FDB_ENTRY_TYPE_DYNAMIC')
+    # default vlan, no VLAN_ID attribute
+    client.hset('ASIC_STATE:SAI_OBJECT_TYPE_VLAN:oid:0x26000000000013', 'NULL', 'NULL')
+    client.requests = 0
+    return MockCountersDb(client)
+
+
+def make_port_db(num_ports):
+    client = CountingRedis()
+    for port in range(num_ports):
+        port_name = 'Ethernet{}'.format(port * 4)
+        for field in PORT_STATUS_FIELDS:
+            client.hset('PORT_TABLE:' + port_name, field, field + str(port))
+        client.hset('PORT_TABLE|' + port_name, 'speed', '100000')
+        client.hset('PORT|' + port_name, 'alias', 'etp{}'.format(port + 1))
+        if port % 2:
+            client.hset('PORTCHANNEL_MEMBER|PortChannel0001|' + port_name, 'NULL', 'NULL')
+    client.requests = 0
+    return MockCountersDb(client)
+
+
+def read_port_status_per_field(db):
+    """ The access pattern intfutil used before switching to DbSnapshot """
+    result = {}
+    for port_name in db.client.keys('PORT|*'):
+        port_name = port_name.split('|', 1)[1]
+        result[port_name] = [db.get(db.APPL_DB, 'PORT_TABLE:' + port_name, field) for field in PORT_STATUS_FIELDS]
+        result[port_name].append(db.get(db.STATE_DB, 'PORT_TABLE|' + port_name, 'speed'))
+    return result
+
+
+def read_port_status_snapshot(db):
+    snapshot = DbSnapshot()
+    snapshot.load(db, db.APPL_DB, ['PORT_TABLE:*'])
+    snapshot.load(db, db.STATE_DB, ['PORT_TABLE|*'])
+    snapshot.load(db, db.CONFIG_DB, ['PORT|*'])
+    result = {}
+    for port_name in snapshot.get_table('PORT'):
+        result[port_name] = [snapshot.get(snapshot.APPL_DB, 'PORT_TABLE:' + port_name, field)
+                             for field in PORT_STATUS_FIELDS]
+        result[port_name].append(snapshot.get(snapshot.STATE_DB, 'PORT_TABLE|' + port_name, 'speed'))
+    return result, snapshot
+
+
+def read_queue_counters_per_field(db):
+    """ The access pattern queuestat used before switching to CountersSnapshot """
+    result = {}
+    queue_map = db.get_all(db.COUNTERS_DB, 'COUNTERS_QUEUE_NAME_MAP')
+    for queue, oid in queue_map.items():
+        db.get(db.COUNTERS_DB, 'COUNTERS_QUEUE_PORT_MAP', oid)
+        db.get(db.COUNTERS_DB, 'COUNTERS_QUEUE_INDEX_MAP', oid)
+        db.get(db.COUNTERS_DB, 'COUNTERS_QUEUE_TYPE_MAP', oid)
+        result[queue] = {counter: db.get(db.COUNTERS_DB, 'COUNTERS:' + oid, counter)
+                         for counter in QUEUE_COUNTERS}
+    return result
+
+
+def read_queue_counters_bulk(db):
+    snapshot = CountersSnapshot(db)
+    queue_map, _, _, _ = snapshot.get_name_maps(
+        'COUNTERS_QUEUE_NAME_MAP', 'COUNTERS_QUEUE_PORT_MAP',
+        'COUNTERS_QUEUE_INDEX_MAP', 'COUNTERS_QUEUE_TYPE_MAP')
+    counters = snapshot.get_counters(queue_map.values())
+    return {queue: counters[oid] for queue, oid in queue_map.items()}, snapshot
+
+
+class TestBulkReader(object):
+    def test_get_all_many(self):
+        db = make_counters_db(4)
+        reader = BulkReader(db, db.COUNTERS_DB, batch_size=3)
+        keys = ['COUNTERS_PORT_NAME_MAP', 'COUNTERS_QUEUE_NAME_MAP',
+                'COUNTERS_QUEUE_INDEX_MAP', 'NO_SUCH_KEY']
+        result = reader.get_all_many(keys)
+        assert list(result.keys()) == keys
+        assert result['COUNTERS_PORT_NAME_MAP']['Ethernet4'] == 'oid:0x10000000000001'
+        assert result['NO_SUCH_KEY'] == {}
+        assert reader.round_trips == 2
+
+    def test_fallback_without_pipeline(self):
+        db = make_counters_db(4)
+        reader = BulkReader(db, db.COUNTERS_DB)
+        reader.pipelined = False
+        result = reader.get_all_many(['COUNTERS_PORT_NAME_MAP', 'NO_SUCH_KEY'])
+        assert len(result['COUNTERS_PORT_NAME_MAP']) == 4
+        assert result['NO_SUCH_KEY'] == {}
+        assert reader.round_trips == 2
+
+
+    def test_swss_connector(self, pipeline_client):
+        db = make_counters_db(4, MockSwssCountersDb)
+        reader = BulkReader(db, db.COUNTERS_DB, batch_size=3)
+        assert reader.pipelined
+        keys = ['COUNTERS_PORT_NAME_MAP', 'COUNTERS_QUEUE_NAME_MAP',
+                'COUNTERS_QUEUE_INDEX_MAP', 'NO_SUCH_KEY']
+        result = reader.get_all_many(keys)
+        assert len(result['COUNTERS_PORT_NAME_MAP']) == 4
+        assert result['NO_SUCH_KEY'] == {}
+        # the PING of the new connection, then two batches
+        assert reader.round_trips == db.client.requests == 3
+
+        # the connection is shared by the readers of the namespace
+        db.client.requests = 0
+        reader = BulkReader(db, db.COUNTERS_DB, batch_size=3)
+        assert reader.get_all_many(keys) == result
+        assert reader.round_trips == db.client.requests == 2
+        assert pipeline_client == [db.COUNTERS_DB]
+
+    def test_swss_connector_without_redis(self, pipeline_client):
+        db = make_counters_db(4, MockSwssCountersDb)
+        with mock.patch.object(bulk_db, 'connect_pipeline_client', return_value=None):
+            reader = BulkReader(db, db.COUNTERS_DB)
+        assert not reader.pipelined
+        assert isinstance(reader.client, SwssDbConnector)
+        result = reader.get_all_many(['COUNTERS_PORT_NAME_MAP', 'NO_SUCH_KEY'])
+        assert len(result['COUNTERS_PORT_NAME_MAP']) == 4
+        assert reader.round_trips == db.client.requests == 2
+
+
+class TestCountersSnapshot(object):
+    def test_name_maps_are_cached(self):
+        db = make_counters_db(4)
+        snapshot = CountersSnapshot(db)
+        port_map, queue_map = snapshot.get_name_maps('COUNTERS_PORT_NAME_MAP', 'COUNTERS_QUEUE_NAME_MAP')
+        assert len(port_map) == 4
+        assert len(queue_map) == 4 * QUEUES_PER_PORT
+        assert snapshot.get_name_map('COUNTERS_PORT_NAME_MAP') is port_map
+        assert snapshot.round_trips == 1
+
+    def test_counters_and_rates(self):
+        db = make_counters_db(4)
+        snapshot = CountersSnapshot(db)
+        port_map = snapshot.get_name_map('COUNTERS_PORT_NAME_MAP')
+        rates = snapshot.get_rates(port_map.values())
+        assert all(fvs == {'RX_BPS': '0'} for fvs in rates.values())
+        queue_oid = snapshot.get_name_map('COUNTERS_QUEUE_NAME_MAP')['Ethernet0:3']
+        counters = snapshot.get_counters([queue_oid])
+        assert counters[queue_oid]['SAI_QUEUE_STAT_PACKETS'] == '3'
+        # cached tables are not read again
+        round_trips = snapshot.round_trips
+        snapshot.get_counters([queue_oid])
+        assert snapshot.round_trips == round_trips
+
+    @pytest.mark.parametrize('num_ports', [
+        8,
+        pytest.param(32, marks=pytest.mark.benchmark),
+        pytest.param(128, marks=pytest.mark.benchmark),
+        pytest.param(512, marks=pytest.mark.benchmark),
+    ])
+    def test_round_trips(self, pipeline_client, num_ports):
+        db = make_counters_db(num_ports, MockSwssCountersDb)
+        expected = read_queue_counters_per_field(db)
+        per_field_requests = db.client.requests
+
+        db.client.requests = 0
+        result, snapshot = read_queue_counters_bulk(db)
+        bulk_requests = db.client.requests
+
+        assert result == expected
+        assert bulk_requests == snapshot.round_trips
+        num_queues = num_ports * QUEUES_PER_PORT
+        assert per_field_requests == 1 + num_queues * (3 + len(QUEUE_COUNTERS))
+        # the PING of the redis-py client, one batch for the name maps, then
+        # one per DEFAULT_BATCH_SIZE queues
+        assert bulk_requests == 2 + (num_queues + 511) // 512
+
+
+class TestAsicObjects(object):
+    FDB_PATTERN = 'ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:*'
+
+    def test_scan_keys(self):
+        db = make_asic_db(2, 10)
+        reader = BulkReader(db, db.ASIC_DB)
+        keys = reader.scan_keys(self.FDB_PATTERN, count=6)
+        assert keys == db.client.keys(self.FDB_PATTERN)
+        assert reader.round_trips == 4
+
+    def test_scan_keys_fallback_to_keys(self):
+        db = make_asic_db(2, 10)
+        reader = BulkReader(db, db.ASIC_DB)
+        # a client without SCAN support
+        reader.client = object()
+        assert len(reader.scan_keys(self.FDB_PATTERN)) == 20
+        assert reader.round_trips == db.client.requests == 1
+
+    def test_get_fields_many(self):
+        db = make_asic_db(1, 2)
+        reader = BulkReader(db, db.ASIC_DB)
+        keys = reader.scan_keys(self.FDB_PATTERN) + ['NO_SUCH_KEY']
+        fields = reader.get_fields_many(keys, ['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID'])
+        assert fields[keys[0]] == {'SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID': 'oid:0x3a000000000000'}
+        assert fields[keys[1]] == {'SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID': 'oid:0x3a000000000001'}
+        assert fields['NO_SUCH_KEY'] == {}
+
+        reader.pipelined = False
+        assert reader.get_fields_many(keys, ['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID']) == fields
+
+        # one HGETALL per key without pipeline, whatever the number of fields
+        reader.round_trips = 0
+        fields = reader.get_fields_many(keys, ['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID', 'SAI_FDB_ENTRY_ATTR_TYPE'])
+        assert fields[keys[0]]['SAI_FDB_ENTRY_ATTR_TYPE'] == 'SAI_FDB_ENTRY_TYPE_DYNAMIC'
+        assert fields['NO_SUCH_KEY'] == {}
+        assert reader.round_trips == len(keys)
+
+    def test_get_vlan_ids(self):
+        db = make_asic_db(2, 1)
+        reader = BulkReader(db, db.ASIC_DB)
+        vlans = get_vlan_ids(reader, ['oid:0x26000000000001', 'oid:0x26000000000013',
+                                      'oid:0x26000000000001', 'oid:0x260000000000ff'])
+        assert vlans == {'oid:0x26000000000001': '3', 'oid:0x26000000000013': None}
+        assert reader.round_trips == 1
+
+    @pytest.mark.parametrize('num_macs', [
+        1000,
+        pytest.param(10000, marks=pytest.mark.benchmark),
+    ])
+    def test_fdb_round_trips(self, num_macs):
+        db = make_asic_db(4, num_macs // 4)
+
+        for key in db.client.keys(self.FDB_PATTERN):
+            db.get_all(db.ASIC_DB, key)
+        per_entry_requests = db.client.requests
+
+        db.client.requests = 0
+        reader = BulkReader(db, db.ASIC_DB)
+        keys = reader.scan_keys(self.FDB_PATTERN)
+        reader.get_fields_many(keys, ['SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID'])
+
+        assert per_entry_requests == 1 + num_macs
+        assert db.client.requests == reader.round_trips
+        assert reader.round_trips < per_entry_requests // 100
+
+
+class TestDbSnapshot(object):
+    def test_load(self):
+        db = make_port_db(4)
+        snapshot = DbSnapshot(batch_size=3)
+        assert snapshot.load(db, db.APPL_DB, ['PORT_TABLE:*']) is snapshot
+        assert snapshot.APPL_DB == 'APPL_DB'
+        # one SCAN, two batches of HGETALL
+        assert snapshot.round_trips == db.client.requests == 3
+
+    def test_load_keys(self):
+        db = make_port_db(4)
+        snapshot = DbSnapshot().load_keys(db, db.STATE_DB, ['PORT_TABLE|Ethernet4', 'PORT_TABLE|Ethernet400'])
+        assert snapshot.keys(db.STATE_DB, 'PORT_TABLE|*') == ['PORT_TABLE|Ethernet4']
+        assert snapshot.get_all(snapshot.STATE_DB, 'PORT_TABLE|Ethernet400') == {}
+        assert snapshot.round_trips == db.client.requests == 1
+
+    def test_keys_and_fields(self):
+        db = make_port_db(4)
+        snapshot = DbSnapshot().load(db, db.APPL_DB, ['PORT_TABLE:*'])
+        assert sorted(snapshot.keys(db.APPL_DB, 'PORT_TABLE:*')) == sorted(db.client.keys('PORT_TABLE:*'))
+        assert snapshot.keys(db.APPL_DB, 'PORT_TABLE:Ethernet4') == ['PORT_TABLE:Ethernet4']
+        assert snapshot.keys(db.APPL_DB, 'PORT_TABLE:Ethernet400') == []
+        assert snapshot.keys(db.STATE_DB, 'PORT_TABLE|*') == []
+        assert snapshot.get(db.APPL_DB, 'PORT_TABLE:Ethernet4', 'mtu') == 'mtu1'
+        assert snapshot.get(db.APPL_DB, 'PORT_TABLE:Ethernet4', 'no_such_field') is None
+        assert snapshot.get_all(db.APPL_DB, 'PORT_TABLE:Ethernet8')['alias'] == 'alias2'
+        assert snapshot.get_all(db.APPL_DB, 'PORT_TABLE:Ethernet400') == {}
+
+    def test_get_table(self):
+        db = make_port_db(4)
+        snapshot = DbSnapshot().load(db, db.CONFIG_DB, ['PORT|*', 'PORTCHANNEL_MEMBER|*'])
+        assert snapshot.get_table('PORT')['Ethernet12'] == {'alias': 'etp4'}
+        assert sorted(snapshot.get_table('PORTCHANNEL_MEMBER')) == [
+            ('PortChannel0001', 'Ethernet12'), ('PortChannel0001', 'Ethernet4')]
+        assert snapshot.get_table('PORTCHANNEL_MEMBER')[('PortChannel0001', 'Ethernet4')] == {}
+        assert snapshot.get_table('PORTCHANNEL') == {}
+
+    def test_get_table_list_fields(self):
+        db = make_port_db(0)
+        db.client.hset('ACL_TABLE|DATAACL', 'type', 'L3')
+        db.client.hset('ACL_TABLE|DATAACL', 'ports@', 'Ethernet0,Ethernet4')
+        db.client.hset('VLAN|Vlan1000', 'members@', 'Ethernet8')
+        snapshot = DbSnapshot().load(db, db.CONFIG_DB, ['ACL_TABLE|*', 'VLAN|*'])
+        assert snapshot.get_table('ACL_TABLE') == {'DATAACL': {'type': 'L3', 'ports': ['Ethernet0', 'Ethernet4']}}
+        assert snapshot.get_table('VLAN') == {'Vlan1000': {'members': ['Ethernet8']}}
+        # get_all() returns the hash as stored, like SonicV2Connector
+        assert snapshot.get_all(db.CONFIG_DB, 'VLAN|Vlan1000') == {'members@': 'Ethernet8'}
+
+    @pytest.mark.parametrize('num_ports', [
+        32,
+        pytest.param(128, marks=pytest.mark.benchmark),
+        pytest.param(512, marks=pytest.mark.benchmark),
+    ])
+    def test_round_trips(self, num_ports):
+        db = make_port_db(num_ports)
+        expected = read_port_status_per_field(db)
+        per_field_requests = db.client.requests
+
+        db.client.requests = 0
+        result, snapshot = read_port_status_snapshot(db)
+
+        assert result == expected
+        assert per_field_requests == 1 + num_ports * (len(PORT_STATUS_FIELDS) + 1)
+        assert db.client.requests == snapshot.round_trips
+        assert snapshot.round_trips < per_field_requests // 20
@@ -0,0 +1,81 @@
+import os
+from unittest import mock
+
+from utilities_common.general import load_module_from_source
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+scripts_path = os.path.join(modules_path, "scripts")
+
+check_db_integrity_path = os.path.join(scripts_path, 'check_db_integrity.py')
+check_db_integrity = load_module_from_source('check_db_integrity', check_db_integrity_path)
+
+PORT_NAME_MAP = {"Ethernet0": "oid:0x1000000000002", "Ethernet4": "oid:0x1000000000004"}
+
+
+def mock_connector(tables_per_namespace):
+    def connector(use_unix_socket_path, namespace):
+        tables = tables_per_namespace[namespace]
+        db = mock.MagicMock()
+        db.exists.side_effect = lambda db_name, table: table in tables
+        db.get_all.side_effect = lambda db_name, table: tables[table]
+        db.keys.side_effect = AssertionError("the whole DB must not be read")
+        return db
+    return connector
+
+
+def run_main(tables_per_namespace):
+    with mock.patch.object(check_db_integrity, "SonicV2Connector",
+                           side_effect=mock_connector(tables_per_namespace)) as connector, \
+            mock.patch.object(check_db_integrity, "load_db_config"), \
+            mock.patch.object(check_db_integrity.multi_asic, "get_namespace_list",
+                              return_value=list(tables_per_namespace)), \
+            mock.patch.object(check_db_integrity.syslog, "syslog") as mock_syslog:
+        rc = check_db_integrity.main()
+    return rc, connector, mock_syslog
+
+
+class TestCheckDbIntegrity(object):
+    def test_get_schema_tables(self):
+        schema = {"required": ["A", "B"], "properties": {"B": {}, "C": {}}}
+        assert check_db_integrity.get_schema_tables(schema) == ["A", "B", "C"]
+
+    def test_fetch_tables(self):
+        with mock.patch.object(check_db_integrity, "SonicV2Connector",
+                               side_effect=mock_connector({"": {"COUNTERS_PORT_NAME_MAP": PORT_NAME_MAP}})):
+            db_data, timings = check_db_integrity.fetch_tables(
+                "", "COUNTERS_DB", ["COUNTERS_PORT_NAME_MAP", "COUNTERS_QUEUE_NAME_MAP"])
+        assert db_data == {"COUNTERS_PORT_NAME_MAP": {"type": "hash", "value": PORT_NAME_MAP}}
+        assert [table for table, _ in timings] == ["COUNTERS_PORT_NAME_MAP", "COUNTERS_QUEUE_NAME_MAP"]
+
+    def test_check_passed(self):
+        rc, connector, mock_syslog = run_main({"": {"COUNTERS_PORT_NAME_MAP": PORT_NAME_MAP}})
+        assert rc == 0
+        connector.assert_called_once_with(use_unix_socket_path=True, namespace="")
+        mock_syslog.assert_any_call(check_db_integrity.syslog.LOG_DEBUG, "Database integrity checks passed.")
+        messages = [c[0][1] for c in mock_syslog.call_args_list if c[0][0] == check_db_integrity.syslog.LOG_INFO]
+        assert len(messages) == 1
+        assert messages[0].startswith("DB integrity check of COUNTERS_DB COUNTERS_PORT_NAME_MAP took ")
+
+    def test_check_failed(self):
+        rc, _, mock_syslog = run_main({"": {"COUNTERS_QUEUE_NAME_MAP": {}}})
+        assert rc == 1
+        errors = [c[0][1] for c in mock_syslog.call_args_list if c[0][0] == check_db_integrity.syslog.LOG_ERR]
+        assert len(errors) == 1
+        assert "'COUNTERS_PORT_NAME_MAP' is a required property" in errors[0]
+
+    def test_check_masic(self):
+        rc, connector, mock_syslog = run_main({
+            "asic0": {"COUNTERS_PORT_NAME_MAP": PORT_NAME_MAP},
+            "asic1": {}
+        })
+        assert rc == 1
+        assert sorted(c[1]["namespace"] for c in connector.call_args_list) == ["asic0", "asic1"]
+        errors = [c[0][1] for c in mock_syslog.call_args_list if c[0][0] == check_db_integrity.syslog.LOG_ERR]
+        assert len(errors) == 1
+        assert "COUNTERS_DB of namespace asic1" in errors[0]
+        messages = [c[0][1] for c in mock_syslog.call_args_list if c[0][0] == check_db_integrity.syslog.LOG_INFO]
+        assert [m.split(" took ")[0] for m in messages] == [
+            "DB integrity check of COUNTERS_DB@asic0 COUNTERS_PORT_NAME_MAP",
+            "DB integrity check of COUNTERS_DB@asic1 COUNTERS_PORT_NAME_MAP"
+        ]
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from json import dump
 from copy import deepcopy
 from unittest import mock, TestCase
@@ -7,6 +8,8 @@ from unittest import mock, TestCase
 import pytest
 from utilities_common.general import load_module_from_source
 
+from .bulk_db_test import CountingRedis, MockCountersDb
+
 # Import file under test i.e., config_mgmt.py
 config_mgmt_py_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'config_mgmt.py')
 config_mgmt = load_module_from_source('config_mgmt', config_mgmt_py_path)
@@ -198,6 +201,80 @@ class TestConfigMgmt(TestCase):
 
         return
 
+    def test_verifyAsicDB_event_driven(self):
+        '''
+        Verify that _verifyAsicDB() returns as soon as the ports are deleted
+        from ASIC DB, rather than on the next poll
+        '''
+        cmdpb = self.config_mgmt_dpb(deepcopy(configDbJson))
+        portMap = {"Ethernet8": "1000000000008", "Ethernet9": "1000000000009"}
+        client = CountingRedis()
+        for oid in portMap.values():
+            client.hset(cmdpb.oidKey + oid, "NULL", "NULL")
+
+        # orchagent deletes the ports while the first notification is awaited
+        def get_message(timeout=0):
+            if not timeout:
+                return None
+            for oid in portMap.values():
+                client.delete(cmdpb.oidKey + oid)
+            return {"type": "pmessage"}
+        pubsub = mock.MagicMock()
+        pubsub.get_message.side_effect = get_message
+        db = self.mock_db(client, pubsub)
+
+        client.requests = 0
+        start = time.time()
+        assert config_mgmt.ConfigMgmtDPB._verifyAsicDB(cmdpb, db, list(portMap), portMap, 60)
+        assert time.time() - start < 1
+        # one pipelined existence check of all the ports per wake up
+        assert client.requests == 2
+        pubsub.psubscribe.assert_called_once_with("__keyspace@1__:ASIC_STATE:SAI_OBJECT_TYPE_PORT:oid:0x*")
+        pubsub.punsubscribe.assert_called_once_with("__keyspace@1__:ASIC_STATE:SAI_OBJECT_TYPE_PORT:oid:0x*")
+
+        # ports which are never deleted
+        for oid in portMap.values():
+            client.hset(cmdpb.oidKey + oid, "NULL", "NULL")
+        pubsub.get_message.side_effect = None
+        pubsub.get_message.return_value = None
+        with pytest.raises(Exception):
+            config_mgmt.ConfigMgmtDPB._verifyAsicDB(cmdpb, db, list(portMap), portMap, 0)
+        return
+
+    def test_verifyPortShutdown_event_driven(self):
+        '''
+        Verify that _verifyPortShutdown() checks the admin_status of all the
+        ports again on every State DB notification
+        '''
+        cmdpb = self.config_mgmt_dpb(deepcopy(configDbJson))
+        ports = ["Ethernet8", "Ethernet9"]
+        client = CountingRedis()
+        for port in ports:
+            client.hset("PORT_TABLE|{}".format(port), "admin_status", "up")
+
+        # one port goes down per notification
+        shutdownPorts = iter(ports)
+        def get_message(timeout=0):
+            if not timeout:
+                return None
+            client.hset("PORT_TABLE|{}".format(next(shutdownPorts)), "admin_status", "down")
+            return {"type": "pmessage"}
+        pubsub = mock.MagicMock()
+        pubsub.get_message.side_effect = get_message
+        db = self.mock_db(client, pubsub)
+
+        client.requests = 0
+        start = time.time()
+        assert config_mgmt.ConfigMgmtDPB._verifyPortShutdown(cmdpb, db, ports, 60)
+        assert time.time() - start < 1
+        # one pipelined read of all the ports per wake up
+        assert client.requests == 3
+        pubsub.psubscribe.assert_called_once_with("__keyspace@1__:PORT_TABLE|*")
+
+        client.hset("PORT_TABLE|Ethernet9", "admin_status", "up")
+        assert not config_mgmt.ConfigMgmtDPB._verifyPortShutdown(cmdpb, db, ports, 0)
+        return
+
     def tearDown(self):
         try:
             os.remove(config_mgmt.CONFIG_DB_JSON_FILE)
@@ -207,6 +284,17 @@ class TestConfigMgmt(TestCase):
         return
 
     ########### HELPER FUNCS #####################################
+    def mock_db(self, client, pubsub):
+        '''
+        SonicV2Connector whose databases are all served by client, with the
+        keyspace notifications of pubsub.
+        '''
+        client.pubsub = mock.MagicMock(return_value=pubsub)
+        db = MockCountersDb(client)
+        db.connect = mock.MagicMock()
+        db.get_dbid = mock.MagicMock(return_value=1)
+        return db
+
     def writeJson(self, d, file):
         with open(file, 'w') as f:
             dump(d, f, indent=4)
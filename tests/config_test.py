@@ -705,6 +705,33 @@ class TestReloadConfig(object):
             assert "\n".join([l.rstrip() for l in result.output.split('\n')]) \
                 == RELOAD_MASIC_CONFIG_DB_OUTPUT
 
+    def test_reload_config_masic_parallel(self, get_cmd_module, setup_multi_broadcom_masic):
+        self.add_sysinfo_to_cfg_file()
+        with mock.patch(
+                "utilities_common.cli.run_command",
+                mock.MagicMock(side_effect=mock_run_command_side_effect)
+        ) as mock_run_command:
+            (config, show) = get_cmd_module
+            runner = CliRunner()
+            cfg_files = "{},{},{}".format(
+                            self.dummy_cfg_file,
+                            self.dummy_cfg_file,
+                            self.dummy_cfg_file)
+            result = runner.invoke(
+                config.config.commands["reload"],
+                [cfg_files, '-y', '-f', '-p'])
+
+            print(result.exit_code)
+            print(result.output)
+            traceback.print_tb(result.exc_info[2])
+            assert result.exit_code == 0
+            # The namespaces are loaded concurrently, in any order
+            output = [l.rstrip() for l in result.output.split('\n')]
+            expected = RELOAD_MASIC_CONFIG_DB_OUTPUT.split('\n')
+            assert output[0] == expected[0]
+            assert sorted(output[1:4]) == sorted(expected[1:4])
+            assert output[4:] == expected[4:]
+
     def test_reload_yang_config(self, get_cmd_module,
                                         setup_single_broadcom_asic):
         with mock.patch(
@@ -731,6 +758,132 @@ class TestReloadConfig(object):
         print("TEARDOWN")
 
 
+class TestRunPerNamespace(object):
+    def test_parallel_failures(self, capsys):
+        namespaces = [None, "asic0", "asic1", "asic2"]
+        calls = []
+
+        def func(namespace, file):
+            calls.append(namespace)
+            if namespace == "asic0":
+                sys.exit(1)
+            if namespace == "asic2":
+                raise click.Abort()
+
+        with mock.patch.dict(os.environ, {"SONIC_CLI_NS_MAX_WORKERS": "4"}):
+            with pytest.raises(SystemExit) as e:
+                config.run_per_namespace(func, [(ns, "file") for ns in namespaces], parallel=True)
+
+        # All the namespaces run, the first failure is raised in the calling thread
+        assert sorted(calls, key=str) == sorted(namespaces, key=str)
+        assert e.value.code == 1
+        assert capsys.readouterr().err.splitlines() == [
+            "Failed in namespace asic0: SystemExit(1)",
+            "Failed in namespace asic2: Abort()",
+        ]
+
+
+class TestConfigSave(object):
+    CONFIG = {
+        "VLAN_MEMBER": {
+            ("Vlan1000", "Ethernet8"): {"tagging_mode": "untagged"},
+            ("Vlan1000", "Ethernet12"): {"tagging_mode": "untagged"},
+        },
+        "PORT": {
+            "Ethernet12": {"lanes": "12", "alias": "etp4"},
+            "Ethernet8": {"lanes": "8", "alias": "etp3"},
+        },
+        "VLAN": {
+            "Vlan1000": {"vlanid": "1000", "members": ["Ethernet8", "Ethernet12"]},
+        },
+        "DSCP_TO_TC_MAP": {
+            "AZURE": {"10": "1", "2": "0", "1": "0"},
+        },
+    }
+
+    # The tables and their keys are sorted naturally, the fields are sorted
+    # like 'sonic-cfggen -d --print-data' does
+    SAVED_CONFIG = """\
+{
+    "DSCP_TO_TC_MAP": {
+        "AZURE": {
+            "1": "0",
+            "10": "1",
+            "2": "0"
+        }
+    },
+    "PORT": {
+        "Ethernet8": {
+            "alias": "etp3",
+            "lanes": "8"
+        },
+        "Ethernet12": {
+            "alias": "etp4",
+            "lanes": "12"
+        }
+    },
+    "VLAN": {
+        "Vlan1000": {
+            "members": [
+                "Ethernet8",
+                "Ethernet12"
+            ],
+            "vlanid": "1000"
+        }
+    },
+    "VLAN_MEMBER": {
+        "Vlan1000|Ethernet8": {
+            "tagging_mode": "untagged"
+        },
+        "Vlan1000|Ethernet12": {
+            "tagging_mode": "untagged"
+        }
+    }
+}"""
+
+    @staticmethod
+    def mock_config_db(config):
+        config_db = mock.MagicMock()
+        config_db.get_config.return_value = config
+        config_db.serialize_key.side_effect = lambda key: "|".join(key) if isinstance(key, tuple) else key
+        return config_db
+
+    def test_save(self, tmp_path):
+        cfg_file = str(tmp_path / "config_db.json")
+        config_db = self.mock_config_db(self.CONFIG)
+        with mock.patch("config.main.ConfigDBPipeConnector", return_value=config_db) as pipe_connector:
+            result = CliRunner().invoke(config.config.commands["save"], ["-y", cfg_file])
+
+        assert result.exit_code == 0, result.output
+        pipe_connector.assert_called_once_with()
+        assert result.output == "Saving CONFIG_DB to {}\n".format(cfg_file)
+        with open(cfg_file) as f:
+            assert f.read() == self.SAVED_CONFIG
+
+    @pytest.mark.parametrize("parallel", [[], ["-p"]])
+    def test_save_masic(self, tmp_path, parallel):
+        cfg_files = [str(tmp_path / "config_db{}.json".format(inst)) for inst in ("", 0, 1)]
+        configs = {None: {"PORT": {}}, "asic0": {"PORT": {"Ethernet0": {}}}, "asic1": {"PORT": {"Ethernet4": {}}}}
+
+        def connector(use_unix_socket_path=False, namespace=None):
+            return self.mock_config_db(configs[namespace])
+
+        with mock.patch("sonic_py_common.multi_asic.is_multi_asic", return_value=True), \
+                mock.patch("sonic_py_common.multi_asic.get_num_asics", return_value=2), \
+                mock.patch("config.main.ConfigDBPipeConnector", side_effect=connector):
+            result = CliRunner().invoke(config.config.commands["save"], ["-y", ",".join(cfg_files)] + parallel)
+
+        assert result.exit_code == 0, result.output
+        for cfg_file, namespace in zip(cfg_files, configs):
+            if namespace is None:
+                message = "Saving CONFIG_DB to {}".format(cfg_file)
+            else:
+                message = "Saving CONFIG_DB of namespace {} to {}".format(namespace, cfg_file)
+            assert message in result.output.splitlines()
+            with open(cfg_file) as f:
+                assert json.load(f) == configs[namespace]
+
+
 class TestConfigCbf(object):
     @classmethod
     def setup_class(cls):
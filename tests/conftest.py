@@ -20,6 +20,7 @@ from .bgp_commands_input.bgp_network_test_vector import (
     )
 from . import config_int_ip_common
 import utilities_common.constants as constants
+import utilities_common.cli as clicommon
 import config.main as config
 
 test_path = os.path.dirname(os.path.abspath(__file__))
@@ -61,6 +62,30 @@ generated_services_list = [
     'telemetry.timer']
 
 
+@pytest.fixture(params=["subprocess", "in_process"])
+def script_run_mode(request):
+    """
+    Run the IN_PROCESS_SCRIPTS the show commands invoke in a subprocess, as
+    the unit tests do by default, and in-process, as on a switch
+    """
+    if request.param == "subprocess":
+        yield request.param
+        return
+
+    with mock.patch.object(clicommon, "in_process_enabled", return_value=True), \
+            mock.patch.object(clicommon, "script_modules", {}):
+        yield request.param
+
+
+@pytest.fixture(autouse=True)
+def clear_connector_pool():
+    # Every test starts with fresh connections to the mock DBs
+    from utilities_common.connector_pool import connector_pool
+    connector_pool.clear()
+    yield
+    connector_pool.clear()
+
+
 @pytest.fixture
 def get_cmd_module():
     import config.main as config
@@ -0,0 +1,75 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+from .mock_tables import dbconnector
+
+from utilities_common.connector_pool import ConnectorPool, connector_pool
+from utilities_common.general import load_module_from_source
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+scripts_path = os.path.join(modules_path, "scripts")
+sys.path.insert(0, modules_path)
+
+portstat = load_module_from_source('portstat', os.path.join(scripts_path, 'portstat'))
+
+
+class TestConnectorPool(object):
+    def test_connector_reused(self):
+        pool = ConnectorPool()
+        factory = mock.MagicMock(side_effect=lambda: object())
+        first = pool.get(('SonicV2Connector', 'asic0', None), factory)
+        assert pool.get(('SonicV2Connector', 'asic0', None), factory) is first
+        assert pool.get(('SonicV2Connector', 'asic1', None), factory) is not first
+        assert factory.call_count == 2
+        assert pool.opened == 2
+        assert pool.reused == 1
+
+    def test_db_set_is_part_of_key(self):
+        pool = ConnectorPool()
+        counters = pool.get_db_connector('', ['COUNTERS_DB', 'APPL_DB'])
+        assert pool.get_db_connector('', ['APPL_DB', 'COUNTERS_DB']) is counters
+        assert pool.get_db_connector('', ['APPL_DB']) is not counters
+        assert pool.opened == 2
+
+    def test_register(self):
+        pool = ConnectorPool()
+        db = object()
+        pool.register(('SonicV2Connector', '', None), db)
+        assert pool.get_db_connector('') is db
+        assert pool.opened == 1
+        assert pool.reused == 1
+
+    def test_clear(self):
+        pool = ConnectorPool()
+        pool.get_config_db('')
+        pool.clear()
+        assert pool.opened == 0
+        assert pool.reused == 0
+        assert pool.connectors == {}
+
+
+class TestPortstatConnections(object):
+    @classmethod
+    def setup_class(cls):
+        os.environ['UTILITIES_UNIT_TESTING'] = "2"
+
+    @pytest.mark.parametrize('num_ports', [32, 128, 512])
+    def test_connections_constant_with_port_count(self, num_ports):
+        stat = portstat.Portstat(None, 'all')
+        with mock.patch('sonic_py_common.multi_asic.connect_to_all_dbs_for_ns',
+                        wraps=portstat.multi_asic.connect_to_all_dbs_for_ns) as connect:
+            for port in range(num_ports):
+                stat.get_port_speed('Ethernet{}'.format(port * 4))
+                stat.get_port_state('Ethernet{}'.format(port * 4))
+        num_ns = len(stat.multi_asic.get_ns_list_based_on_options())
+        assert connect.call_count == num_ns
+        assert connector_pool.opened == num_ns
+        assert connector_pool.reused == 2 * num_ports * num_ns - num_ns
+
+    @classmethod
+    def teardown_class(cls):
+        os.environ['UTILITIES_UNIT_TESTING'] = "0"
@@ -1,9 +1,10 @@
 import dualtor_neighbor_check
+import functools
+import hashlib
 import json
 import pytest
-import shlex
+import redis
 import sys
-import subprocess
 import tabulate
 
 from unittest.mock import call
@@ -37,60 +38,6 @@ class TestDualtorNeighborCheck(object):
         with patch("dualtor_neighbor_check.syslog.syslog") as mock_syslog_log:
             yield mock_syslog_log
 
-    def test_run_command(self, mock_log_functions):
-        with patch("dualtor_neighbor_check.subprocess.Popen") as mock_popen:
-            mock_proc = MagicMock()
-            mock_popen.return_value = mock_proc
-            mock_proc.communicate.return_value = (b"admin", None)
-            mock_proc.returncode = 0
-
-            out = dualtor_neighbor_check.run_command("whoami")
-
-            mock_popen.assert_called_once_with(shlex.split("whoami"), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            mock_proc.communicate.assert_called_once()
-            assert out == "admin"
-
-    def test_run_command_nonzero_return(self, mock_log_functions):
-        with patch("dualtor_neighbor_check.subprocess.Popen") as mock_popen:
-            mock_proc = MagicMock()
-            mock_popen.return_value = mock_proc
-            mock_proc.communicate.return_value = (b"ls: cannot access '/tmp/not-existed': No such file or directory", None)
-            mock_proc.returncode = 2
-
-            with pytest.raises(RuntimeError):
-                dualtor_neighbor_check.run_command("ls /tmp/not-existed")
-
-            mock_popen.assert_called_once_with(shlex.split("ls /tmp/not-existed"), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            mock_proc.communicate.assert_called_once()
-
-    def test_redis_cli(self, mock_log_functions):
-        with patch("dualtor_neighbor_check.subprocess.Popen") as mock_popen:
-            mock_proc = MagicMock()
-            mock_popen.return_value = mock_proc
-            mock_proc.communicate.return_value = (b"6cde21a0d21ab29e08dd72e13b77214dbb01902f", None)
-            mock_proc.returncode = 0
-
-            redis_cmd = "script load \"return helloworld\""
-            out = dualtor_neighbor_check.redis_cli(redis_cmd)
-
-            mock_popen.assert_called_once_with(shlex.split("sudo redis-cli %s" % redis_cmd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            mock_proc.communicate.assert_called_once()
-            assert out == "6cde21a0d21ab29e08dd72e13b77214dbb01902f"
-
-    def test_redis_cli_error_stdout(self, mock_log_functions):
-        with patch("dualtor_neighbor_check.subprocess.Popen") as mock_popen:
-            mock_proc = MagicMock()
-            mock_popen.return_value = mock_proc
-            mock_proc.communicate.return_value = (b"(error) NOSCRIPT No matching script. Please use EVAL.", None)
-            mock_proc.returncode = 0
-
-            redis_cmd = "evalsha 0 0"
-            with pytest.raises(RuntimeError):
-                dualtor_neighbor_check.redis_cli(redis_cmd)
-
-            mock_popen.assert_called_once_with(shlex.split("sudo redis-cli %s" % redis_cmd), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-            mock_proc.communicate.assert_called_once()
-
     def test_log_config_default(self, mock_py_log_functions):
         mock_log_err, mock_log_warn, mock_log_info, mock_log_debug = mock_py_log_functions
         with patch("dualtor_neighbor_check.sys.argv", ["dualtor_neighbor_check.py"]) as mock_argv:
@@ -195,77 +142,66 @@ class TestDualtorNeighborCheck(object):
         )
         assert not is_dualtor
 
-    def test_read_from_db(self, mock_log_functions):
-        with patch("dualtor_neighbor_check.run_command") as mock_run_command:
-            neighbors = {"192.168.0.2": "ee:86:d8:46:7d:01"}
-            mux_states = {"Ethernet4": "active"}
-            hw_mux_states = {"Ethernet4": "active"}
-            asic_fdb = {"ee:86:d8:46:7d:01": "oid:0x3a00000000064b"}
-            asic_route_table = []
-            asic_neigh_table = ["{\"ip\":\"192.168.0.23\",\"rif\":\"oid:0x6000000000671\",\"switch_id\":\"oid:0x21000000000000\"}"]
-            mock_run_command.side_effect = [
-                "c53fd5eaad68be1e66a2fe80cd20a9cb18c91259",
-                json.dumps(
-                    {
-                        "neighbors": neighbors,
-                        "mux_states": mux_states,
-                        "hw_mux_states": hw_mux_states,
-                        "asic_fdb": asic_fdb,
-                        "asic_route_table": asic_route_table,
-                        "asic_neigh_table": asic_neigh_table
-                    }
-                )
-            ]
-            mock_appl_db = MagicMock()
-            mock_appl_db.get = MagicMock(return_value=None)
-
-            result = dualtor_neighbor_check.read_tables_from_db(mock_appl_db)
-
-            mock_appl_db.get.assert_called_once_with("_DUALTOR_NEIGHBOR_CHECK_SCRIPT_SHA1")
-            mock_run_command.assert_has_calls(
-                [
-                    call("sudo redis-cli SCRIPT LOAD \"%s\"" % dualtor_neighbor_check.DB_READ_SCRIPT),
-                    call("sudo redis-cli EVALSHA c53fd5eaad68be1e66a2fe80cd20a9cb18c91259 0")
-                ]
-            )
-            assert neighbors == result[0]
-            assert mux_states == result[1]
-            assert hw_mux_states == result[2]
-            assert {k: v.lstrip("oid:0x") for k, v in asic_fdb.items()} == result[3]
-            assert asic_route_table == result[4]
-            assert asic_neigh_table == result[5]
-
-    def test_read_from_db_with_lua_cache(self, mock_log_functions):
-        with patch("dualtor_neighbor_check.run_command") as mock_run_command:
-            neighbors = {"192.168.0.2": "ee:86:d8:46:7d:01"}
-            mux_states = {"Ethernet4": "active"}
-            hw_mux_states = {"Ethernet4": "active"}
-            asic_fdb = {"ee:86:d8:46:7d:01": "oid:0x3a00000000064b"}
-            asic_route_table = []
-            asic_neigh_table = ["{\"ip\":\"192.168.0.23\",\"rif\":\"oid:0x6000000000671\",\"switch_id\":\"oid:0x21000000000000\"}"]
-            mock_run_command.return_value = json.dumps(
-                {
-                    "neighbors": neighbors,
-                    "mux_states": mux_states,
-                    "hw_mux_states": hw_mux_states,
-                    "asic_fdb": asic_fdb,
-                    "asic_route_table": asic_route_table,
-                    "asic_neigh_table": asic_neigh_table
-                }
-            )
-            mock_appl_db = MagicMock()
-            mock_appl_db.get = MagicMock(return_value="c53fd5eaad68be1e66a2fe80cd20a9cb18c91259")
-
-            result = dualtor_neighbor_check.read_tables_from_db(mock_appl_db)
-
-            mock_appl_db.get.assert_called_once_with("_DUALTOR_NEIGHBOR_CHECK_SCRIPT_SHA1")
-            mock_run_command.assert_called_once_with("sudo redis-cli EVALSHA c53fd5eaad68be1e66a2fe80cd20a9cb18c91259 0")
-            assert neighbors == result[0]
-            assert mux_states == result[1]
-            assert hw_mux_states == result[2]
-            assert {k: v.lstrip("oid:0x") for k, v in asic_fdb.items()} == result[3]
-            assert asic_route_table == result[4]
-            assert asic_neigh_table == result[5]
+    @pytest.fixture
+    def db_tables(self):
+        return {
+            "neighbors": {"192.168.0.2": "ee:86:d8:46:7d:01"},
+            "mux_states": {"Ethernet4": "active"},
+            "hw_mux_states": {"Ethernet4": "active"},
+            "asic_fdb": {"ee:86:d8:46:7d:01": "oid:0x3a00000000064b"},
+            "asic_route_table": [],
+            "asic_neigh_table": ["{\"ip\":\"192.168.0.23\",\"rif\":\"oid:0x6000000000671\",\"switch_id\":\"oid:0x21000000000000\"}"]
+        }
+
+    def check_tables(self, db_tables, result):
+        assert db_tables["neighbors"] == result[0]
+        assert db_tables["mux_states"] == result[1]
+        assert db_tables["hw_mux_states"] == result[2]
+        assert {k: v.lstrip("oid:0x") for k, v in db_tables["asic_fdb"].items()} == result[3]
+        assert db_tables["asic_route_table"] == result[4]
+        assert db_tables["asic_neigh_table"] == result[5]
+
+    def test_read_from_db(self, mock_log_functions, db_tables):
+        mock_redis_client = MagicMock()
+        mock_redis_client.evalsha.side_effect = redis.exceptions.NoScriptError("NOSCRIPT No matching script.")
+        mock_redis_client.eval.return_value = json.dumps(db_tables)
+
+        result = dualtor_neighbor_check.read_tables_from_db(mock_redis_client)
+
+        mock_redis_client.evalsha.assert_called_once_with(hashlib.sha1(dualtor_neighbor_check.DB_READ_SCRIPT.encode()).hexdigest(), 0)
+        mock_redis_client.eval.assert_called_once_with(dualtor_neighbor_check.DB_READ_SCRIPT, 0)
+        self.check_tables(db_tables, result)
+
+    def test_read_from_db_with_lua_cache(self, mock_log_functions, db_tables):
+        mock_redis_client = MagicMock()
+        mock_redis_client.evalsha.return_value = json.dumps(db_tables).encode()
+
+        result = dualtor_neighbor_check.read_tables_from_db(mock_redis_client)
+
+        mock_redis_client.evalsha.assert_called_once_with(dualtor_neighbor_check.DB_READ_SCRIPT_SHA1, 0)
+        mock_redis_client.eval.assert_not_called()
+        self.check_tables(db_tables, result)
+
+    def test_read_from_db_lazy_debug_log(self, db_tables):
+        mock_redis_client = MagicMock()
+        mock_redis_client.evalsha.return_value = json.dumps(db_tables)
+
+        with patch("dualtor_neighbor_check.WRITE_LOG_DEBUG", functools.partial(dualtor_neighbor_check.write_syslog,
+                                                                                dualtor_neighbor_check.SyslogLevel.DEBUG)), \
+                patch("dualtor_neighbor_check.SYSLOG_LEVEL", dualtor_neighbor_check.SyslogLevel.NOTICE), \
+                patch("dualtor_neighbor_check.json.dumps") as mock_dumps, \
+                patch("dualtor_neighbor_check.syslog.syslog") as mock_syslog:
+            dualtor_neighbor_check.read_tables_from_db(mock_redis_client)
+            mock_dumps.assert_not_called()
+            mock_syslog.assert_not_called()
+
+        with patch("dualtor_neighbor_check.WRITE_LOG_DEBUG", functools.partial(dualtor_neighbor_check.write_syslog,
+                                                                                dualtor_neighbor_check.SyslogLevel.DEBUG)), \
+                patch("dualtor_neighbor_check.SYSLOG_LEVEL", dualtor_neighbor_check.SyslogLevel.DEBUG), \
+                patch("dualtor_neighbor_check.syslog.syslog") as mock_syslog:
+            dualtor_neighbor_check.read_tables_from_db(mock_redis_client)
+            mock_syslog.assert_any_call(dualtor_neighbor_check.syslog.LOG_DEBUG,
+                                        "mux states: %s" % json.dumps(db_tables["mux_states"], indent=4))
 
     def test_get_mux_server_to_port_map(self, mock_log_functions):
         mux_cables = {
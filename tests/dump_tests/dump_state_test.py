@@ -218,6 +218,31 @@ class TestDumpState:
         ddiff = DeepDiff(set(expected_entries), set(rec_json.keys()))
         assert not ddiff, "Expected Entries were not recieved when passing all keyword"
 
+    def test_identifier_all_prefetch(self, match_engine):
+        runner = CliRunner()
+        all_ports = dump.plugins.dump_modules["port"](match_engine).get_all_args(DEFAULT_NAMESPACE)
+        expected = runner.invoke(dump.state, ["port", ",".join(all_ports)], obj=match_engine)
+        with mock.patch.object(MatchEngine, "load_tables", side_effect=match_engine.load_tables) as load_tables:
+            result = runner.invoke(dump.state, ["port", "all"], obj=match_engine)
+        assert result.exit_code == 0, "exit code: {}, Exception: {}, Traceback: {}".format(result.exit_code, result.exception, result.exc_info)
+        assert load_tables.call_count == len(dump.plugins.dump_modules["port"].PREFETCH_TABLES)
+        assert not match_engine.snapshots
+        ddiff = compare_json_output(json.loads(expected.output), result.output)
+        assert not ddiff, ddiff
+
+    def test_identifier_all_thread_pool(self, match_engine):
+        runner = CliRunner()
+        all_ports = dump.plugins.dump_modules["port"](match_engine).get_all_args(DEFAULT_NAMESPACE)
+        expected = runner.invoke(dump.state, ["port", ",".join(all_ports), "--key-map"], obj=match_engine)
+        with mock.patch.object(dump.plugins.dump_modules["port"], "PREFETCH_TABLES", {}), \
+                mock.patch.dict(os.environ, {"SONIC_DUMP_MAX_WORKERS": "4"}), \
+                mock.patch.object(match_engine, "fork", side_effect=lambda: MatchEngine(match_engine.conn_pool)) as fork:
+            result = runner.invoke(dump.state, ["port", "all", "--key-map"], obj=match_engine)
+        assert result.exit_code == 0, "exit code: {}, Exception: {}, Traceback: {}".format(result.exit_code, result.exception, result.exc_info)
+        assert 1 <= fork.call_count <= 4
+        ddiff = compare_json_output(json.loads(expected.output), result.output)
+        assert not ddiff, ddiff
+
     def test_namespace_single_asic(self, match_engine):
         runner = CliRunner()
         result = runner.invoke(dump.state, ["port", "Ethernet0", "--table", "--key-map", "--namespace", "asic0"], obj=match_engine)
@@ -5,7 +5,7 @@ import pytest
 from dump.match_infra import MatchEngine, EXCEP_DICT, MatchRequest, MatchRequestOptimizer, ConnectionPool, CONN
 from utilities_common.constants import DEFAULT_NAMESPACE
 from dump.helper import populate_mock
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from deepdiff import DeepDiff
 from importlib import reload
 
@@ -303,3 +303,106 @@ class TestMatchEngineOptimizer:
         # missing filed should not cause an excpetion in the optimizer
         assert "whatever" in ret["return_values"]["COPP_GROUP|queue4_group2"]
         assert not  ret["return_values"]["COPP_GROUP|queue4_group2"]["whatever"]
+
+@pytest.mark.usefixtures("match_engine")
+class TestMatchEngineBatchMode:
+
+    requests = [
+        dict(db="CONFIG_DB", table="SFLOW_COLLECTOR", key_pattern="*"),
+        dict(db="APPL_DB", table="PORT_TABLE", field="lanes", value="202"),
+        dict(db="STATE_DB", table="REBOOT_CAUSE", return_fields=["cause"]),
+        dict(db="STATE_DB", table="CHASSIS_MODULE_TABLE", field="oper_status", value="Offline", return_fields=["slot"]),
+        dict(db="CONFIG_DB", table="SFLOW", key_pattern="global", just_keys=False),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="*", field="lanes", value="61,62,63,64", match_entire_list=True),
+        dict(db="STATE_DB", table="FAN_INFO", key_pattern="*", field="led_status", value="yellow"),
+        dict(db="ASIC_DB", table="ASIC_STATE:SAI_OBJECT_TYPE_SWITCH", key_pattern="oid:0x22*"),
+        dict(file=os.path.join(dump_test_input, "copp_cfg.json"), table="COPP_TRAP", field="trap_ids", value="arp_req"),
+    ]
+
+    def test_same_result_as_fetch(self, match_engine):
+        batch_engine = MatchEngine(match_engine.conn_pool, batch_mode=True)
+        for kwargs in self.requests:
+            expected = match_engine.fetch(MatchRequest(**kwargs))
+            ret = batch_engine.fetch(MatchRequest(**kwargs))
+            ddiff = DeepDiff(expected, ret)
+            assert not ddiff, ddiff
+
+    def test_fetch_many(self, match_engine):
+        batch_engine = MatchEngine(match_engine.conn_pool, batch_mode=True)
+        expected = [match_engine.fetch(MatchRequest(**kwargs)) for kwargs in self.requests]
+        ret = batch_engine.fetch_many([MatchRequest(**kwargs) for kwargs in self.requests] + [[]])
+        ddiff = DeepDiff(expected, ret[:-1])
+        assert not ddiff, ddiff
+        assert ret[-1]["error"] == EXCEP_DICT["INV_REQ"]
+
+    def test_fv_cache(self, match_engine):
+        batch_engine = MatchEngine(match_engine.conn_pool, batch_mode=True)
+        req = MatchRequest(db="STATE_DB", table="REBOOT_CAUSE", return_fields=["cause"])
+        ret = batch_engine.fetch(req)
+        assert len(ret["keys"]) == 2
+        for key in ret["keys"]:
+            assert batch_engine.fv_cache[(DEFAULT_NAMESPACE, "STATE_DB", key)]["cause"] == ret["return_values"][key]["cause"]
+
+        conn = match_engine.conn_pool.get("STATE_DB", DEFAULT_NAMESPACE)
+        client = conn.get_redis_client("STATE_DB")
+        with patch.object(client, "hgetall", wraps=client.hgetall) as hgetall:
+            ret = batch_engine.fetch(MatchRequest(db="STATE_DB", table="REBOOT_CAUSE", just_keys=False))
+            assert len(ret["keys"]) == 2
+            assert hgetall.call_count == 0
+
+        batch_engine.clear_fv_cache()
+        assert not batch_engine.fv_cache
+
+    def test_populate_fv_reuses_cache(self, match_engine):
+        from dump.main import populate_fv
+        batch_engine = MatchEngine(match_engine.conn_pool, batch_mode=True)
+        ret = batch_engine.fetch(MatchRequest(db="STATE_DB", table="REBOOT_CAUSE", return_fields=["cause"]))
+        info = {"id": {"STATE_DB": {"keys": ret["keys"], "tables_not_found": []}}}
+
+        conn = match_engine.conn_pool.get("STATE_DB", DEFAULT_NAMESPACE)
+        client = conn.get_redis_client("STATE_DB")
+        with patch.object(client, "hgetall", wraps=client.hgetall) as hgetall:
+            final_info = populate_fv(info, "port", DEFAULT_NAMESPACE, match_engine.conn_pool, batch_engine)
+            assert hgetall.call_count == 0
+
+        expected = populate_fv(info, "port", DEFAULT_NAMESPACE, match_engine.conn_pool)
+        ddiff = DeepDiff(expected, final_info)
+        assert not ddiff, ddiff
+        assert final_info["id"]["STATE_DB"]["keys"][0][ret["keys"][0]]["cause"] == ret["return_values"][ret["keys"][0]]["cause"]
+
+@pytest.mark.usefixtures("match_engine")
+class TestMatchEngineSnapshots:
+
+    requests = [
+        dict(db="CONFIG_DB", table="PORT", key_pattern="*"),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="Ethernet0"),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="Ethernet1*"),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="Ethernet1234"),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="*", field="lanes", value="61,62,63,64", match_entire_list=True),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="*", field="lanes", value="62"),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="Ethernet6*", field="lanes", value="62", return_fields=["alias"]),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="*", field="speed", value="1"),
+        dict(db="CONFIG_DB", table="PORT", key_pattern="Ethernet0", just_keys=False),
+    ]
+
+    def test_same_result_as_redis(self, match_engine):
+        snapshot_engine = MatchEngine(match_engine.conn_pool)
+        assert snapshot_engine.load_tables("CONFIG_DB", ["PORT"])
+        for kwargs in self.requests:
+            expected = match_engine.fetch(MatchRequest(**kwargs))
+            ret = snapshot_engine.fetch(MatchRequest(**kwargs))
+            ddiff = DeepDiff(expected, ret, ignore_order=True)
+            assert not ddiff, (kwargs, ddiff)
+
+    def test_served_from_memory(self, match_engine):
+        snapshot_engine = MatchEngine(match_engine.conn_pool)
+        snapshot_engine.load_tables("CONFIG_DB", ["PORT"])
+        conn = match_engine.conn_pool.get("CONFIG_DB", DEFAULT_NAMESPACE)
+        with patch.object(conn, "keys", wraps=conn.keys) as keys:
+            for kwargs in self.requests:
+                snapshot_engine.fetch(MatchRequest(**kwargs))
+            assert keys.call_count == 0
+
+            snapshot_engine.clear_snapshots()
+            snapshot_engine.fetch(MatchRequest(db="CONFIG_DB", table="PORT", key_pattern="*"))
+            assert keys.call_count == 1
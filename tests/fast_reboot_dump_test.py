@@ -1,5 +1,7 @@
 import json
 import os
+import pytest
+from unittest import mock
 from deepdiff import DeepDiff
 from utilities_common.db import Db
 import importlib
@@ -36,7 +38,46 @@ class TestFastRebootDump(object):
 
         expectd_map_mac_ip_per_vlan = {'Vlan2': {'52:54:00:5d:fc:b7': 'PortChannel0001'}}
         assert not DeepDiff(map_mac_ip_per_vlan, expectd_map_mac_ip_per_vlan, ignore_order=True)
-    
+
+    def test_generate_fdb_entries_vlan_not_found(self):
+        with pytest.raises(Exception, match='Not found bvi oid for vlan_id: 4000'):
+            fast_reboot_dump.generate_fdb_entries_logic(self.asic_db, self.app_db, ['Vlan2', 'Vlan4000'])
+
+    @pytest.mark.parametrize('entries', [
+        [],
+        [{'FDB_TABLE:Vlan2:52-54-00-5D-FC-B7': {'type': 'dynamic', 'port': 'PortChannel0001'}, 'OP': 'SET'}],
+        [{'NEIGH_TABLE:Vlan2:192.168.0.%d' % i: {'neigh': '52:54:00:5d:fc:b7', 'family': 'IPv4'}, 'OP': 'SET'}
+         for i in range(3)],
+    ])
+    def test_write_json_list(self, tmp_path, entries):
+        streamed = tmp_path / 'streamed.json'
+        dumped = tmp_path / 'dumped.json'
+        fast_reboot_dump.write_json_list(str(streamed), iter(entries))
+        with open(str(dumped), 'w') as fp:
+            json.dump(entries, fp, indent=2, separators=(',', ': '))
+        assert streamed.read_text() == dumped.read_text()
+
+    def test_write_json_list_failure(self, tmp_path):
+        fdb = tmp_path / 'fdb.json'
+        fdb.write_text('[]')
+
+        def entries():
+            yield {'FDB_TABLE:Vlan2:52-54-00-5D-FC-B7': {'type': 'dynamic', 'port': 'PortChannel0001'}, 'OP': 'SET'}
+            raise Exception('Not found bvi oid for vlan_id: 4000')
+
+        with pytest.raises(Exception, match='Not found bvi oid'):
+            fast_reboot_dump.write_json_list(str(fdb), entries())
+        # the previous file is left as it was, without a partial file next to it
+        assert fdb.read_text() == '[]'
+        assert os.listdir(str(tmp_path)) == ['fdb.json']
+
+    def test_timed_phase_failure(self):
+        with mock.patch.object(fast_reboot_dump.syslog, 'syslog') as log:
+            with pytest.raises(KeyError):
+                with fast_reboot_dump.timed_phase('arp'):
+                    raise KeyError('neigh')
+        assert log.call_args[0][1].startswith('Phase arp took')
+
     @classmethod
     def teardown_class(cls):
         print("TEARDOWN")
@@ -200,6 +200,54 @@ class TestConfigWrapper(unittest.TestCase):
         self.assertEqual(expected, actual)
         self.assertIsNotNone(error)
 
+    def test_validate_config_db_config__same_content__validated_once(self):
+        # Arrange
+        config_wrapper = gu_common.ConfigWrapper()
+        config_wrapper._validate_config_db_config = MagicMock(return_value=(True, None))
+        config = copy.deepcopy(Files.CONFIG_DB_AS_JSON)
+
+        # Act
+        config_wrapper.validate_config_db_config(Files.CONFIG_DB_AS_JSON)
+        actual, error = config_wrapper.validate_config_db_config(config)
+
+        # Assert
+        self.assertTrue(actual)
+        self.assertIsNone(error)
+        config_wrapper._validate_config_db_config.assert_called_once()
+        self.assertEqual(2, config_wrapper.validation_stats.validations)
+        self.assertEqual(1, config_wrapper.validation_stats.cache_hits)
+
+    def test_validate_config_db_config__table_changed__validated_again(self):
+        # Arrange
+        config_wrapper = gu_common.ConfigWrapper()
+        config_wrapper._validate_config_db_config = MagicMock(return_value=(True, None))
+        config = copy.deepcopy(Files.CONFIG_DB_AS_JSON)
+
+        # Act
+        config_wrapper.validate_config_db_config(config)
+        config["PORT"]["Ethernet0"]["mtu"] = "1500"
+        config_wrapper.validate_config_db_config(config)
+
+        # Assert
+        self.assertEqual(2, config_wrapper._validate_config_db_config.call_count)
+        self.assertEqual(0, config_wrapper.validation_stats.cache_hits)
+
+    def test_validate_config_db_config__config_hash__used_as_cache_key(self):
+        # Arrange
+        config_wrapper = gu_common.ConfigWrapper()
+        config_wrapper._validate_config_db_config = MagicMock(return_value=(True, None))
+        config_wrapper._get_table_hashes = MagicMock()
+
+        # Act
+        config_wrapper.validate_config_db_config(Files.CONFIG_DB_AS_JSON, 1234)
+        config_wrapper.validate_config_db_config(Files.CONFIG_DB_AS_JSON, 1234)
+        config_wrapper.validate_config_db_config(Files.CONFIG_DB_AS_JSON, 5678)
+
+        # Assert
+        config_wrapper._get_table_hashes.assert_not_called()
+        self.assertEqual(2, config_wrapper._validate_config_db_config.call_count)
+        self.assertEqual(1, config_wrapper.validation_stats.cache_hits)
+
     def test_validate_bgp_peer_group__valid_non_intersecting_ip_ranges__returns_true(self):
         # Arrange
         config_wrapper = gu_common.ConfigWrapper()
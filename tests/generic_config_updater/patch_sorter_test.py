@@ -1,5 +1,7 @@
+import copy
 from collections import OrderedDict
 import jsonpatch
+import pytest
 import unittest
 from unittest.mock import MagicMock, Mock
 
@@ -108,6 +110,122 @@ class TestDiff(unittest.TestCase):
         self.assertEqual(diff, other_diff)
         self.assertTrue(diff == other_diff)
 
+    def test_apply_move__current_config_not_modified(self):
+        # Arrange
+        current_config = copy.deepcopy(Files.CROPPED_CONFIG_DB_AS_JSON)
+        diff = ps.Diff(current_config=current_config, target_config=Files.ANY_CONFIG_DB)
+        move = ps.JsonMove.from_patch(Files.SINGLE_OPERATION_CONFIG_DB_PATCH)
+
+        # Act
+        diff.apply_move(move)
+
+        # Assert
+        self.assertEqual(Files.CROPPED_CONFIG_DB_AS_JSON, current_config)
+        self.assertIs(current_config, diff.current_config)
+
+    def test_apply_move_in_place__updates_current_config(self):
+        # Arrange
+        diff = ps.Diff(current_config=Files.CROPPED_CONFIG_DB_AS_JSON, target_config=Files.ANY_CONFIG_DB)
+        move = ps.JsonMove.from_patch(Files.SINGLE_OPERATION_CONFIG_DB_PATCH)
+
+        # Act
+        diff.apply_move_in_place(move)
+
+        # Assert
+        self.assertEqual(Files.CONFIG_DB_AFTER_SINGLE_OPERATION, diff.current_config)
+
+    def test_undo_move__restores_current_config_and_hash(self):
+        # Arrange
+        current_config = Files.CROPPED_CONFIG_DB_AS_JSON
+        diff = ps.Diff(current_config=current_config, target_config=Files.ANY_CONFIG_DB)
+        expected_hash = hash(diff)
+        move = ps.JsonMove.from_patch(Files.SINGLE_OPERATION_CONFIG_DB_PATCH)
+        undo_state = diff.apply_move_in_place(move)
+
+        # Act
+        diff.undo_move(undo_state)
+
+        # Assert
+        self.assertIs(current_config, diff.current_config)
+        self.assertEqual(expected_hash, hash(diff))
+
+    def test_hash__after_moves__same_as_new_diff(self):
+        # Arrange
+        current_config = {"VLAN": {"Vlan1000": {"vlanid": "1000", "members": ["Ethernet0", "Ethernet4"]}},
+                          "PORT": {"Ethernet0": {"mtu": "9100"}}}
+        patch = jsonpatch.JsonPatch([
+            {"op": "add", "path": "/VLAN/Vlan1000/members/1", "value": "Ethernet8"},
+            {"op": "remove", "path": "/PORT/Ethernet0/mtu"},
+            {"op": "add", "path": "/ACL_TABLE", "value": {"EVERFLOW": {"type": "MIRROR"}}},
+            {"op": "replace", "path": "/VLAN/Vlan1000/vlanid", "value": "1001"},
+            {"op": "remove", "path": "/VLAN/Vlan1000/members/0"},
+        ])
+        target_config = patch.apply(current_config)
+        diff = ps.Diff(current_config=current_config, target_config=target_config)
+        hash(diff)
+
+        for operation in patch:
+            # Act
+            move = ps.JsonMove.from_operation(operation)
+            new_diff = diff.apply_move(move)
+            diff.apply_move_in_place(move)
+
+            # Assert
+            fresh_diff = ps.Diff(copy.deepcopy(diff.current_config), target_config)
+            self.assertEqual(hash(fresh_diff), hash(new_diff))
+            self.assertEqual(hash(fresh_diff), hash(diff))
+
+        self.assertTrue(diff.has_no_diff())
+        self.assertEqual(target_config, diff.current_config)
+
+class TestDiffLargeConfig(unittest.TestCase):
+    """
+    Applies moves to incremental diffs of large synthetic configs, they must end with the same config and hash as
+    applying the moves to copies of the full config.
+    """
+    def test_apply_moves(self):
+        self.verify_apply_moves(1000, 10)
+
+    @pytest.mark.benchmark
+    def test_apply_moves_benchmark(self):
+        for num_ports, patch_size in [(1000, 100), (5000, 10), (5000, 25)]:
+            with self.subTest(num_ports=num_ports, patch_size=patch_size):
+                self.verify_apply_moves(num_ports, patch_size)
+
+    def verify_apply_moves(self, num_ports, patch_size):
+        # Arrange
+        current_config = self.create_config(num_ports)
+        operations = [{"op": "replace", "path": f"/PORT/Ethernet{index*4}/mtu", "value": "1500"}
+                      for index in range(0, num_ports, num_ports // patch_size)]
+        target_config = jsonpatch.JsonPatch(operations).apply(current_config)
+        moves = [ps.JsonMove.from_operation(operation) for operation in operations]
+
+        # Act
+        config = current_config
+        for move in moves:
+            config = move.patch.apply(config)
+
+        diff = ps.Diff(current_config, target_config)
+        hash(diff)
+        for move in moves:
+            diff.apply_move_in_place(move)
+            hash(diff)
+
+        # Assert
+        self.assertEqual(config, diff.current_config)
+        self.assertTrue(diff.has_no_diff())
+        self.assertEqual(hash(ps.Diff(config, target_config)), hash(diff))
+
+    def create_config(self, num_ports):
+        config = {"PORT": {}, "INTERFACE": {}, "VLAN_MEMBER": {}, "VLAN": {"Vlan1000": {"vlanid": "1000"}}}
+        for index in range(num_ports):
+            port = f"Ethernet{index*4}"
+            config["PORT"][port] = {"admin_status": "up", "alias": f"etp{index}", "lanes": f"{index*4},{index*4+1}",
+                                    "mtu": "9100", "speed": "100000"}
+            config["INTERFACE"][f"{port}|10.0.{index // 256}.{index % 256}/31"] = {}
+            config["VLAN_MEMBER"][f"Vlan1000|{port}"] = {"tagging_mode": "untagged"}
+        return config
+
 class TestJsonMove(unittest.TestCase):
     def setUp(self):
         self.operation_wrapper = OperationWrapper()
@@ -905,19 +1023,18 @@ class TestDeleteWholeConfigMoveValidator(unittest.TestCase):
 
 class TestFullConfigMoveValidator(unittest.TestCase):
     def setUp(self):
-        self.any_current_config = Mock()
-        self.any_target_config = Mock()
-        self.any_simulated_config = Mock()
+        self.any_current_config = {"VLAN": {"Vlan1000": {"vlanid": "1000"}}, "PORT": {"Ethernet0": {"mtu": "9100"}}}
+        self.any_target_config = {"VLAN": {"Vlan1000": {}}, "PORT": {"Ethernet0": {"mtu": "9100"}}}
+        self.any_simulated_config = {"VLAN": {"Vlan1000": {}}, "PORT": {"Ethernet0": {"mtu": "9100"}}}
         self.any_diff = ps.Diff(self.any_current_config, self.any_target_config)
-        self.any_move = Mock()
-        self.any_move.apply.side_effect = \
-            create_side_effect_dict({(str(self.any_current_config),): self.any_simulated_config})
+        self.any_move = ps.JsonMove.from_operation({"op": "remove", "path": "/VLAN/Vlan1000/vlanid"})
+        self.any_simulated_config_hash = ps._node_hash(self.any_simulated_config, ())
 
     def test_validate__invalid_config_db_after_applying_move__failure(self):
         # Arrange
         config_wrapper = Mock()
         config_wrapper.validate_config_db_config.side_effect = \
-            create_side_effect_dict({(str(self.any_simulated_config),): (False, None)})
+            create_side_effect_dict({(str(self.any_simulated_config), str(self.any_simulated_config_hash)): (False, None)})
         validator = ps.FullConfigMoveValidator(config_wrapper)
 
         # Act and assert
@@ -927,12 +1044,29 @@ class TestFullConfigMoveValidator(unittest.TestCase):
         # Arrange
         config_wrapper = Mock()
         config_wrapper.validate_config_db_config.side_effect = \
-            create_side_effect_dict({(str(self.any_simulated_config),): (True, None)})
+            create_side_effect_dict({(str(self.any_simulated_config), str(self.any_simulated_config_hash)): (True, None)})
         validator = ps.FullConfigMoveValidator(config_wrapper)
 
         # Act and assert
         self.assertTrue(validator.validate(self.any_move, self.any_diff))
 
+    def test_validate__config_hash_updated_from_current_config(self):
+        # Arrange
+        config_wrapper = Mock()
+        config_wrapper.validate_config_db_config.return_value = (True, None)
+        validator = ps.FullConfigMoveValidator(config_wrapper)
+
+        # Act
+        with unittest.mock.patch.object(ps, "_node_hash", wraps=ps._node_hash) as node_hash:
+            validator.validate(self.any_move, self.any_diff)
+            validator.validate(self.any_move, self.any_diff)
+
+        # Assert
+        # The current config is hashed once, then only the changed node is hashed per move
+        hashed_tokens = [args[1] for args, _ in node_hash.call_args_list]
+        self.assertEqual(1, hashed_tokens.count(()))
+        self.assertEqual(1, hashed_tokens.count(("PORT",)))
+
 class TestCreateOnlyMoveValidator(unittest.TestCase):
     def setUp(self):
         self.validator = ps.CreateOnlyMoveValidator(ps.PathAddressing())
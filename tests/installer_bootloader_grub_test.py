@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch, call
 
 # Import test module
 import sonic_installer.bootloader.grub as grub
+import sonic_installer.bootloader.onie as onie
 
 installed_images = [
     f'{grub.IMAGE_PREFIX}expeliarmus-{grub.IMAGE_PREFIX}abcde',
@@ -96,3 +97,19 @@ def test_verify_image():
     assert not bootloader.is_secure_upgrade_image_verification_supported()
     # command should fail
     assert not bootloader.verify_image_sign(image)
+
+def test_verify_image_platform(tmp_path):
+    image_path = str(tmp_path / 'sonic.bin')
+    bootloader = grub.GrubBootloader()
+    assert not bootloader.verify_image_platform(image_path)
+
+    with patch('sonic_installer.bootloader.grub.read_onie_image_info') as mock_info, \
+            patch('sonic_installer.bootloader.grub.device_info.get_platform', return_value='x86_64-kvm_x86_64-r0'):
+        open(image_path, 'w').close()
+        mock_info.return_value = onie.OnieImageInfo('20230531.01', frozenset(['x86_64-kvm_x86_64-r0']), 64)
+        assert bootloader.verify_image_platform(image_path)
+        mock_info.return_value = onie.OnieImageInfo('20230531.01', frozenset(['x86_64-mlnx_msn2700-r0']), 64)
+        assert not bootloader.verify_image_platform(image_path)
+        # Images built without the target platforms list are accepted
+        mock_info.return_value = onie.OnieImageInfo('20230531.01', None, 64)
+        assert bootloader.verify_image_platform(image_path)
@@ -1,8 +1,11 @@
+import os
 from unittest.mock import Mock, patch
 
 # Import test module
 import sonic_installer.bootloader.onie as onie
 
+from .installer_image_common import PLATFORMS, write_image
+
 
 @patch("sonic_installer.bootloader.onie.re.search")
 def test_get_current_image(re_search):
@@ -25,4 +28,53 @@ def test_verify_image_sign():
     except NotImplementedError:
         assert not is_supported
     else:
-        assert False, "Wrong return value from verify_image_sign, returned" + str(return_value)
\ No newline at end of file
+        assert False, "Wrong return value from verify_image_sign, returned" + str(return_value)
+
+def test_read_onie_image_info(tmp_path):
+    image_path = str(tmp_path / 'sonic.bin')
+    header_size = write_image(image_path, platforms=PLATFORMS)
+
+    info = onie.read_onie_image_info(image_path)
+    assert info.version == '20230531.01'
+    assert info.platforms == set(PLATFORMS)
+    assert info.payload_offset == header_size
+
+    bootloader = onie.OnieInstallerBootloader()
+    assert bootloader.get_binary_image_version(image_path) == onie.IMAGE_PREFIX + '20230531.01'
+
+
+def test_read_onie_image_info_no_platforms(tmp_path):
+    image_path = str(tmp_path / 'sonic.bin')
+    write_image(image_path, platforms=None)
+    info = onie.read_onie_image_info(image_path)
+    assert info.version == '20230531.01'
+    assert info.platforms is None
+
+
+def test_read_onie_image_info_not_an_image(tmp_path):
+    bootloader = onie.OnieInstallerBootloader()
+    image_path = str(tmp_path / 'sonic.bin')
+    with open(image_path, 'wb') as fp:
+        fp.write(os.urandom(4096))
+    assert bootloader.get_binary_image_version(image_path) is None
+    assert onie.read_onie_image_info(image_path).payload_offset is None
+
+    open(image_path, 'w').close()
+    assert bootloader.get_binary_image_version(image_path) is None
+    assert bootloader.get_binary_image_version(str(tmp_path / 'missing.bin')) is None
+
+
+def test_read_onie_image_info_cache(tmp_path):
+    image_path = str(tmp_path / 'sonic.bin')
+    write_image(image_path)
+
+    with patch('sonic_installer.bootloader.onie.mmap.mmap', side_effect=onie.mmap.mmap) as mock_mmap:
+        bootloader = onie.OnieInstallerBootloader()
+        assert bootloader.get_binary_image_version(image_path) == onie.IMAGE_PREFIX + '20230531.01'
+        assert onie.read_onie_image_info(image_path).version == '20230531.01'
+        assert mock_mmap.call_count == 1
+
+        # A new image downloaded to the same path is read again
+        write_image(image_path, version='20231130.02', payload_size=8192)
+        assert bootloader.get_binary_image_version(image_path) == onie.IMAGE_PREFIX + '20231130.02'
+        assert mock_mmap.call_count == 2
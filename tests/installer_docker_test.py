@@ -75,7 +75,7 @@ def test_rollback_docker_no_extra_image():
 @patch('sonic_installer.main.get_container_image_id', MagicMock(return_value='1'))
 @patch('sonic_installer.main.get_container_image_id_all', MagicMock(return_value=['1', '2']))
 @patch('sonic_installer.main.validate_url_or_abort', MagicMock())
-@patch('sonic_installer.main.urlretrieve', MagicMock())
+@patch('sonic_installer.main.download_image', MagicMock())
 @patch('os.path.isfile', MagicMock(return_value=True))
 @patch('sonic_installer.main.get_docker_tag_name', MagicMock(return_value='some_tag'))
 @patch('sonic_installer.main.run_command', MagicMock())
@@ -107,7 +107,7 @@ def test_upgrade_docker_basic(mock_hget, mock_popen, container):
 @patch('sonic_installer.main.get_container_image_name', MagicMock(return_value='docker-fpm-frr'))
 @patch('sonic_installer.main.get_container_image_id', MagicMock(return_value=['1']))
 @patch('sonic_installer.main.validate_url_or_abort', MagicMock())
-@patch('sonic_installer.main.urlretrieve', MagicMock(side_effect=Exception('download failed')))
+@patch('sonic_installer.main.download_image', MagicMock(side_effect=Exception('download failed')))
 def test_upgrade_docker_download_fail():
     runner = CliRunner()
     result = runner.invoke(
@@ -121,7 +121,7 @@ def test_upgrade_docker_download_fail():
 @patch('sonic_installer.main.get_container_image_name', MagicMock(return_value='docker-fpm-frr'))
 @patch('sonic_installer.main.get_container_image_id', MagicMock(return_value=['1']))
 @patch('sonic_installer.main.validate_url_or_abort', MagicMock())
-@patch('sonic_installer.main.urlretrieve', MagicMock(side_effect=Exception('download failed')))
+@patch('sonic_installer.main.download_image', MagicMock(side_effect=Exception('download failed')))
 def test_upgrade_docker_image_not_exist():
     runner = CliRunner()
     result = runner.invoke(
@@ -135,7 +135,7 @@ def test_upgrade_docker_image_not_exist():
 @patch('sonic_installer.main.get_container_image_name', MagicMock(return_value='docker-fpm-frr'))
 @patch('sonic_installer.main.get_container_image_id', MagicMock(return_value=['1']))
 @patch('sonic_installer.main.validate_url_or_abort', MagicMock())
-@patch('sonic_installer.main.urlretrieve', MagicMock())
+@patch('sonic_installer.main.download_image', MagicMock())
 @patch('os.path.isfile', MagicMock(return_value=True))
 @patch('sonic_installer.main.get_docker_tag_name', MagicMock(return_value='some_tag'))
 @patch('sonic_installer.main.run_command', MagicMock())
@@ -0,0 +1,252 @@
+import hashlib
+import io
+import os
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+import sonic_installer.bootloader.onie as onie
+from sonic_installer import download
+from sonic_installer.download import download_image
+from sonic_installer.exception import SonicRuntimeException
+
+from .installer_image_common import PLATFORMS, make_image
+
+class ImageServer(ThreadingHTTPServer):
+    """
+    Serves self.image with Range and If-Range support.
+
+    The body of the first responses is cut after the number of bytes of
+    the entries of drops, and Range is ignored if ranges is False.
+    """
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ImageHandler)
+        self.image = b''
+        self.etag = '"1"'
+        self.ranges = True
+        self.drops = []
+        self.requests = []
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}/sonic.bin'.format(self.server_address[1])
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        image = server.image
+        start = 0
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if server.ranges and range_header and (if_range is None or if_range == server.etag):
+            start = int(range_header[len('bytes='):].split('-')[0])
+            if start >= len(image):
+                self.send_response(416)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, len(image) - 1, len(image)))
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(image) - start))
+        self.send_header('ETag', server.etag)
+        self.end_headers()
+        data = image[start:]
+        if server.drops:
+            data = data[:server.drops.pop(0)]
+        self.wfile.write(data)
+        self.wfile.flush()
+        self.close_connection = True
+
+
+@pytest.fixture
+def image_server():
+    server = ImageServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(url, image_path, **kwargs):
+    kwargs.setdefault('chunk_size', 16 * 1024)
+    kwargs.setdefault('timeout', 5)
+    kwargs.setdefault('retry_interval', 0)
+    return download_image(url, image_path, **kwargs)
+
+
+class TestDownloadImage(object):
+    def test_download(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_path = str(tmp_path / 'sonic_image')
+        progress = []
+
+        result = fetch(image_server.url, image_path, reporthook=lambda *args: progress.append(args))
+
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert result.size == len(image_server.image)
+        assert result.sha256 == hashlib.sha256(image_server.image).hexdigest()
+        assert result.image_info.version == '20230531.01'
+        assert result.image_info.platforms == set(PLATFORMS)
+        assert progress[0] == (0, 1, len(image_server.image))
+        assert progress[-1] == (len(image_server.image), 1, len(image_server.image))
+        assert not os.path.exists(image_path + download.PARTIAL_SUFFIX)
+        assert not os.path.exists(image_path + download.PARTIAL_STATE_SUFFIX)
+
+        # The checks of the bootloader don't read the image again
+        with patch('sonic_installer.bootloader.onie.mmap.mmap') as mock_mmap:
+            bootloader = onie.OnieInstallerBootloader()
+            assert bootloader.get_binary_image_version(image_path) == onie.IMAGE_PREFIX + '20230531.01'
+            assert onie.read_onie_image_info(image_path) == result.image_info
+            mock_mmap.assert_not_called()
+
+    def test_same_image_info_as_reading_the_image(self, image_server, tmp_path):
+        for platforms in [PLATFORMS, None]:
+            image_server.image = make_image(platforms=platforms)
+            image_path = str(tmp_path / 'sonic_image')
+            result = fetch(image_server.url, image_path, chunk_size=1000)
+            assert result.image_info == onie._read_onie_image_info(image_path, result.size)
+
+    def test_not_an_onie_image(self, image_server, tmp_path):
+        image_server.image = os.urandom(64 * 1024)
+        image_path = str(tmp_path / 'docker-fpm-frr')
+        result = fetch(image_server.url, image_path)
+        assert result.image_info is None
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+
+    def test_compressed_payload(self, image_server, tmp_path):
+        image_server.image = make_image()
+        header_size = image_server.image.index(b'\nexit_marker\n') + len(b'\nexit_marker\n')
+        payload = io.BytesIO()
+        with tarfile.open(fileobj=payload, mode='w:gz') as tar:
+            tar.addfile(tarfile.TarInfo('installer/fs.zip'), io.BytesIO(b''))
+        image_server.image = image_server.image[:header_size].replace(
+            hashlib.sha1(image_server.image[header_size:]).hexdigest().encode(),
+            hashlib.sha1(payload.getvalue()).hexdigest().encode()) + payload.getvalue()
+        image_path = str(tmp_path / 'sonic_image')
+        # The payload is read from the image by the bootloader
+        assert fetch(image_server.url, image_path).image_info is None
+        assert onie.read_onie_image_info(image_path).version == '20230531.01'
+
+    def test_resume_after_connection_drop(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_server.drops = [50000, 70000]
+        image_path = str(tmp_path / 'sonic_image')
+
+        result = fetch(image_server.url, image_path)
+
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert result.sha256 == hashlib.sha256(image_server.image).hexdigest()
+        assert result.image_info.platforms == set(PLATFORMS)
+        assert [r.get('Range') for r in image_server.requests] == [None, 'bytes=50000-', 'bytes=120000-']
+        assert image_server.requests[1]['If-Range'] == image_server.etag
+
+    def test_resume_previous_download(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_server.drops = [100000]
+        image_path = str(tmp_path / 'sonic_image')
+        with pytest.raises(SonicRuntimeException):
+            fetch(image_server.url, image_path, retries=0)
+        assert os.path.getsize(image_path + download.PARTIAL_SUFFIX) == 100000
+        assert not os.path.exists(image_path)
+
+        result = fetch(image_server.url, image_path)
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert result.sha256 == hashlib.sha256(image_server.image).hexdigest()
+        assert result.image_info.version == '20230531.01'
+        assert image_server.requests[-1]['Range'] == 'bytes=100000-'
+
+    def test_resume_changed_image(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_server.drops = [100000]
+        image_path = str(tmp_path / 'sonic_image')
+        with pytest.raises(SonicRuntimeException):
+            fetch(image_server.url, image_path, retries=0)
+
+        # If-Range does not match, the whole new image is sent
+        image_server.image = make_image(version='20231130.02')
+        image_server.etag = '"2"'
+        result = fetch(image_server.url, image_path)
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert result.image_info.version == '20231130.02'
+
+    def test_resume_other_url(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_path = str(tmp_path / 'sonic_image')
+        with open(image_path + download.PARTIAL_SUFFIX, 'wb') as fp:
+            fp.write(b'garbage')
+        download.save_partial_state(image_path + download.PARTIAL_STATE_SUFFIX, 'http://other/sonic.bin', '"1"')
+
+        fetch(image_server.url, image_path)
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert 'Range' not in image_server.requests[0]
+
+    def test_range_not_supported(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_server.ranges = False
+        image_server.drops = [50000]
+        image_path = str(tmp_path / 'sonic_image')
+
+        result = fetch(image_server.url, image_path)
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert result.sha256 == hashlib.sha256(image_server.image).hexdigest()
+        assert result.image_info.platforms == set(PLATFORMS)
+
+    def test_retries_exhausted(self, image_server, tmp_path):
+        image_server.image = make_image()
+        image_server.drops = [0] * 3
+        image_path = str(tmp_path / 'sonic_image')
+        with pytest.raises(SonicRuntimeException):
+            fetch(image_server.url, image_path, retries=2)
+        assert len(image_server.requests) == 3
+
+    def test_not_found(self, image_server, tmp_path):
+        image_path = str(tmp_path / 'sonic_image')
+        with patch.object(ImageHandler, 'do_GET', lambda self: self.send_error(404)):
+            with pytest.raises(SonicRuntimeException):
+                fetch(image_server.url, image_path)
+        assert not os.path.exists(image_path)
+
+    def test_signed_image(self, image_server, tmp_path):
+        image_server.image = make_image(signature=os.urandom(2048))
+        image_path = str(tmp_path / 'sonic_image')
+        result = fetch(image_server.url, image_path)
+        with open(image_path, 'rb') as fp:
+            assert fp.read() == image_server.image
+        assert result.sha256 == hashlib.sha256(image_server.image).hexdigest()
+        assert result.image_info.platforms == set(PLATFORMS)
+
+    def test_signed_image_truncated(self, image_server, tmp_path):
+        image = make_image(signature=os.urandom(2048))
+        header_size = image.index(b'\nexit_marker\n') + len(b'\nexit_marker\n')
+        # The payload is shorter than payload_image_size
+        image_server.image = image[:header_size + 1024]
+        image_path = str(tmp_path / 'sonic_image')
+        with pytest.raises(SonicRuntimeException):
+            fetch(image_server.url, image_path)
+
+    def test_payload_checksum_mismatch(self, image_server, tmp_path):
+        image_server.image = make_image(payload_sha1='0' * 40)
+        image_path = str(tmp_path / 'sonic_image')
+        with pytest.raises(SonicRuntimeException):
+            fetch(image_server.url, image_path)
+        assert not os.path.exists(image_path)
+        assert not os.path.exists(image_path + download.PARTIAL_SUFFIX)
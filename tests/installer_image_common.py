@@ -0,0 +1,42 @@
+""" SONiC installer images for the sonic_installer tests """
+
+import hashlib
+import io
+import os
+import tarfile
+
+import sonic_installer.bootloader.onie as onie
+
+PLATFORMS = ['x86_64-kvm_x86_64-r0', 'x86_64-mlnx_msn2700-r0']
+EXIT_MARKER = b'exit_marker\n'
+
+
+def make_image(version='20230531.01', platforms=PLATFORMS, payload_size=256 * 1024, payload_sha1=None,
+               signature=None):
+    """ Builds a shell archive like onie-mk-demo.sh, with an uncompressed tar payload """
+    payload = io.BytesIO()
+    with tarfile.open(fileobj=payload, mode='w') as tar:
+        members = [('installer/fs.zip', os.urandom(payload_size))]
+        if platforms is not None:
+            members.append((onie.PLATFORMS_ASIC, ''.join(p + '\n' for p in platforms).encode()))
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    payload = payload.getvalue()
+    if payload_sha1 is None:
+        payload_sha1 = hashlib.sha1(payload).hexdigest()
+    header = '#!/bin/sh\nimage_version="{}"\npayload_sha1={}\n'.format(version, payload_sha1)
+    if signature is not None:
+        # Like the secure upgrade images, with the CMS signature after the payload
+        header += 'payload_image_size={}\n'.format(len(payload))
+    header += 'echo installing\nexit 0\n'
+    return header.encode() + EXIT_MARKER + payload + (signature or b'')
+
+
+def write_image(path, **kwargs):
+    """ Writes make_image(**kwargs) to path, returns the size of its header """
+    image = make_image(**kwargs)
+    with open(path, 'wb') as fp:
+        fp.write(image)
+    return image.index(EXIT_MARKER) + len(EXIT_MARKER)
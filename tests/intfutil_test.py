@@ -1,10 +1,11 @@
 import os
 import sys
 from click.testing import CliRunner
-from unittest import TestCase
+from unittest import TestCase, mock
 import subprocess
 
 import show.main as show
+import utilities_common.cli as clicommon
 
 root_path = os.path.dirname(os.path.abspath(__file__))
 modules_path = os.path.dirname(root_path)
@@ -365,3 +366,13 @@ class TestIntfutil(TestCase):
         print("TEARDOWN")
         os.environ["PATH"] = os.pathsep.join(os.environ["PATH"].split(os.pathsep)[:-1])
         os.environ["UTILITIES_UNIT_TESTING"] = "0"
+
+
+class TestIntfutilInProcess(TestIntfutil):
+    """ The same tests, with intfutil run in-process as on a switch """
+    def setUp(self):
+        super().setUp()
+        for patcher in (mock.patch.object(clicommon, "in_process_enabled", return_value=True),
+                        mock.patch.object(clicommon, "script_modules", {})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
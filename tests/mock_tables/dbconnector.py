@@ -3,6 +3,7 @@ import json
 import os
 import sys
 import re
+import time
 from unittest import mock
 
 import mockredis
@@ -68,7 +69,9 @@ def config_set(self, *args):
 
 
 class MockPubSub:
-    def get_message(self):
+    def get_message(self, timeout=0, *args, **kwargs):
+        # no keyspace notification is ever published, wait like redis does
+        time.sleep(timeout)
         return None
 
     def psubscribe(self, *args, **kwargs):
@@ -183,6 +186,18 @@ class SwssSyncClient(mockredis.MockRedis):
         # Find every key that matches the pattern
         return [key for key in self.redis if regex.match(key)]
 
+    # Patch mockredis/mockredis/client.py
+    # The official implementation matches the pattern against encoded keys,
+    # which fails once _encode decodes. Pages over keys() instead.
+    def scan(self, cursor=0, match=None, count=10):
+        """Emulate scan."""
+        keys = self.keys(match or '*')
+        cursor = int(cursor)
+        next_cursor = cursor + count
+        if next_cursor >= len(keys):
+            next_cursor = 0
+        return next_cursor, keys[cursor:cursor + count]
+
 
 class PortCounter:
     pass
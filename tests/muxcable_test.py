@@ -24,6 +24,15 @@ import config.main as config
 import show.main as show
 
 
+def mock_mux_direction_ports(res_dict):
+    return mock.MagicMock(side_effect=lambda db, ports: {port: res_dict for port in ports})
+
+
+def mock_config_xcvr_cmds(res_dict):
+    # ports is the 7th argument of config.muxcable.update_and_get_response_for_xcvr_cmds
+    return mock.MagicMock(side_effect=lambda *args: {port: res_dict for port in args[6]})
+
+
 tabular_data_status_output_expected = """\
 PORT        STATUS    SERVER_STATUS    HEALTH     HWSTATUS      LAST_SWITCHOVER_TIME
 ----------  --------  ---------------  ---------  ------------  ---------------------------
@@ -674,9 +683,9 @@ class TestMuxcable(object):
         #show.muxcable.platform_sfputil.logical = mock.Mock(return_value=["Ethernet0", "Ethernet4"])
         print("SETUP")
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status(self):
         runner = CliRunner()
         db = Db()
@@ -685,9 +694,9 @@ class TestMuxcable(object):
         assert result.exit_code == 0
         assert result.output == tabular_data_status_output_expected
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_alias(self):
         runner = CliRunner()
         db = Db()
@@ -698,9 +707,9 @@ class TestMuxcable(object):
         assert result.exit_code == 0
         assert result.output == tabular_data_status_output_expected_alias
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json(self):
         runner = CliRunner()
         db = Db()
@@ -710,9 +719,9 @@ class TestMuxcable(object):
         assert result.exit_code == 0
         assert result.output == json_data_status_output_expected
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json_alias(self):
         runner = CliRunner()
         db = Db()
@@ -773,9 +782,9 @@ class TestMuxcable(object):
 
         assert result.exit_code == 1
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json_with_correct_port(self):
         runner = CliRunner()
         db = Db()
@@ -785,9 +794,9 @@ class TestMuxcable(object):
 
         assert result.exit_code == 0
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json_with_correct_port_alias(self):
         runner = CliRunner()
         db = Db()
@@ -800,9 +809,9 @@ class TestMuxcable(object):
         assert result.exit_code == 0
 
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json_port_incorrect_index(self):
         runner = CliRunner()
         db = Db()
@@ -818,9 +827,9 @@ class TestMuxcable(object):
 
         result = runner.invoke(show.cli.commands["muxcable"], obj=db)
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json_with_incorrect_port(self):
         runner = CliRunner()
         db = Db()
@@ -866,9 +875,9 @@ class TestMuxcable(object):
 
         assert result.exit_code == 1
 
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value=({ 0 :"active",
-                                                                                              1  :"standby",
-                                                                                              2 : "True"})))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports(({ 0 :"active",
+                                                                                            1  :"standby",
+                                                                                            2 : "True"})))
     def test_muxcable_status_json_port_eth0(self):
         runner = CliRunner()
         db = Db()
@@ -1317,9 +1326,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "active"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "active",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "active",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1341,9 +1350,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "active"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "active",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "active",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1367,9 +1376,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1389,9 +1398,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1413,9 +1422,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1439,9 +1448,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "sucess"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "sucess",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "sucess",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1461,9 +1470,9 @@ class TestMuxcable(object):
     @mock.patch('config.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "sucess"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "sucess",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "sucess",
+                                                                                          2: "True"}))
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -1489,9 +1498,10 @@ class TestMuxcable(object):
     @mock.patch('config.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "sucess"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "sucess",
-                                                                                            2: "True"}))
+    @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmds', mock_config_xcvr_cmds({0: 0, 1: "sucess"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "sucess",
+                                                                                          2: "True"}))
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -1517,9 +1527,9 @@ class TestMuxcable(object):
     @mock.patch('config.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -1545,9 +1555,10 @@ class TestMuxcable(object):
     @mock.patch('config.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmds', mock_config_xcvr_cmds({0: 0, 1: "standby"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -1945,9 +1956,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "active"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "active",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "active",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1969,9 +1980,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "active"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "active",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "active",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -1995,9 +2006,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -2017,9 +2028,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -2041,9 +2052,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "standby",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "standby",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -2067,9 +2078,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "sucess"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "sucess",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "sucess",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
@@ -2114,6 +2125,7 @@ class TestMuxcable(object):
     @mock.patch('config.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "sucess"}))
+    @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmds', mock_config_xcvr_cmds({0: 0, 1: "sucess"}))
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -2164,6 +2176,7 @@ class TestMuxcable(object):
     @mock.patch('config.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "standby"}))
+    @mock.patch('config.muxcable.update_and_get_response_for_xcvr_cmds', mock_config_xcvr_cmds({0: 0, 1: "standby"}))
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -2442,6 +2455,92 @@ class TestMuxcable(object):
         assert result.exit_code == 0
         assert result.output == show_muxcable_tunnel_route_expected_output_port_json
 
+    @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
+    @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
+    @mock.patch('show.muxcable.platform_sfputil', mock.MagicMock(return_value={0: ["Ethernet12", "Ethernet0"]}))
+    @mock.patch('utilities_common.platform_sfputil_helper.logical_port_name_to_physical_port_list', mock.MagicMock(return_value=[0]))
+    def test_show_muxcable_tunnel_route_single_index(self):
+        import show.muxcable as muxcable
+        runner = CliRunner()
+        db = Db()
+
+        with mock.patch('show.muxcable.TunnelRouteIndex', wraps=muxcable.TunnelRouteIndex) as index:
+            result = runner.invoke(show.cli.commands["muxcable"].commands["tunnel-route"],
+                                   ["--json"], obj=db)
+        assert result.exit_code == 0
+        assert result.output == show_muxcable_tunnel_route_expected_output_json
+        # one index for all the mux ports of the namespace
+        assert index.call_count == 1
+
+    @mock.patch('show.muxcable.delete_all_keys_in_db_tables_helper', mock.MagicMock(return_value=0))
+    @mock.patch('show.muxcable.db_connect', mock.MagicMock(return_value=0))
+    @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet4", "Ethernet12"]))
+    @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
+    @mock.patch('show.muxcable.platform_sfputil', mock.MagicMock(return_value={0: ["Ethernet12", "Ethernet0"]}))
+    def test_show_muxcable_xcvr_cmds_batch(self):
+        import itertools
+        import show.muxcable as muxcable
+
+        cmd_tbl = mock.MagicMock()
+        cmd_tbl.getKeys.return_value = []
+        rsp_sub_tbl = mock.MagicMock()
+        # out of order, with a response of a port which was not asked for
+        rsp_sub_tbl.pop.side_effect = [("Ethernet12", "SET", (("state", "active"),)),
+                                       ("Ethernet8", "SET", (("state", "active"),)),
+                                       ("Ethernet0", "SET", (("state", "standby"),))]
+        with mock.patch('show.muxcable.swsscommon') as swsscommon, \
+                mock.patch('show.muxcable.time.time', mock.MagicMock(side_effect=itertools.count())):
+            swsscommon.Select.OBJECT = 1
+            swsscommon.Select.TIMEOUT = 2
+            swsscommon.Select.return_value.select.side_effect = itertools.chain(
+                [(1, None)] * 3, itertools.repeat((2, None)))
+            swsscommon.Table.return_value = cmd_tbl
+            swsscommon.SubscriberStateTable.return_value = rsp_sub_tbl
+            swsscommon.CastSelectableToRedisSelectObj.return_value.getDbConnector.return_value.getNamespace.return_value = ""
+
+            res_dicts = muxcable.update_and_get_response_for_xcvr_cmds(
+                "state", "state", "True", "XCVRD_SHOW_HWMODE_DIR_CMD", None, "XCVRD_SHOW_HWMODE_DIR_RSP", None,
+                ["Ethernet0", "Ethernet4", "Ethernet12"], 10, None, "probe")
+
+        # one subscriber and all the commands posted before waiting
+        assert swsscommon.SubscriberStateTable.call_count == 1
+        assert [c[0][0] for c in cmd_tbl.set.call_args_list] == ["Ethernet0", "Ethernet4", "Ethernet12"]
+        assert res_dicts == {"Ethernet0": {0: 0, 1: "standby"},
+                             "Ethernet4": {0: 1, 1: "unknown"},
+                             "Ethernet12": {0: 0, 1: "active"}}
+        # Ethernet4 never responded, the batch ends at the deadline
+        assert swsscommon.Select.return_value.select.call_count == 10
+
+    def test_show_muxcable_xcvr_cmds_batch_deadline(self):
+        import show.muxcable as muxcable
+
+        ports = ["Ethernet{}".format(i * 4) for i in range(48)]
+        with mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmds',
+                        mock.MagicMock(side_effect=lambda *args: {port: {0: 1, 1: "unknown"} for port in args[7]})) as cmds, \
+                mock.patch('show.muxcable.delete_all_keys_in_db_table'), \
+                mock.patch('show.muxcable.get_results', mock.MagicMock(return_value={port: {} for port in ports})):
+            muxcable.get_hwmode_mux_direction_ports(None, ports)
+            # xcvrd probes the ports one after the other
+            assert cmds.call_args[0][8] == muxcable.HWMODE_MUXDIRECTION_TIMEOUT * 48
+
+            with mock.patch.dict(os.environ, {"SONIC_CLI_XCVRD_CONCURRENT_BATCH": "1"}):
+                muxcable.get_hwmode_mux_direction_ports(None, ports)
+            # one dead cable does not stall the batch for the time of probing every port
+            assert cmds.call_args[0][8] == muxcable.HWMODE_MUXDIRECTION_TIMEOUT + 0.5
+
+    def test_tunnel_route_key_parsing(self):
+        import ipaddress
+        import show.muxcable as muxcable
+
+        assert muxcable.parse_tunnel_route_key("TUNNEL_ROUTE_TABLE:10.2.1.1") == ipaddress.ip_network("10.2.1.1/32")
+        assert muxcable.parse_tunnel_route_key("TUNNEL_ROUTE_TABLE:Vrf1:fc00::76/128") == ipaddress.ip_network("fc00::76/128")
+        assert muxcable.parse_asic_route_entry_key(
+            'ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY:{"dest":"10.2.1.1/32","switch_id":"oid:0x21000000000000"}'
+        ) == ipaddress.ip_network("10.2.1.1/32")
+        assert muxcable.parse_asic_route_entry_key("ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY:bogus") == "bogus"
+        # a prefix only matches its own entries, not the ones it is a substring of
+        assert muxcable.normalize_route_prefix("10.2.1.1") != muxcable.normalize_route_prefix("10.2.1.10/32")
+
     @mock.patch('config.muxcable.swsscommon.DBConnector', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Table', mock.MagicMock(return_value=0))
     @mock.patch('config.muxcable.swsscommon.Select', mock.MagicMock(return_value=0))
@@ -2587,9 +2686,9 @@ class TestMuxcable(object):
     @mock.patch('show.muxcable.delete_all_keys_in_db_table', mock.MagicMock(return_value=0))
     @mock.patch('show.muxcable.update_and_get_response_for_xcvr_cmd', mock.MagicMock(return_value={0: 0,
                                                                                                       1: "active"}))
-    @mock.patch('show.muxcable.get_hwmode_mux_direction_port', mock.MagicMock(return_value={0: 0,
-                                                                                            1: "active",
-                                                                                            2: "True"}))
+    @mock.patch('show.muxcable.get_hwmode_mux_direction_ports', mock_mux_direction_ports({0: 0,
+                                                                                          1: "active",
+                                                                                          2: "True"}))
     @mock.patch('show.muxcable.check_port_in_mux_cable_table', mock.MagicMock(return_value=True))
     @mock.patch('utilities_common.platform_sfputil_helper.get_logical_list', mock.MagicMock(return_value=["Ethernet0", "Ethernet12"]))
     @mock.patch('utilities_common.platform_sfputil_helper.get_asic_id_for_logical_port', mock.MagicMock(return_value=0))
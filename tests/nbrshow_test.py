@@ -0,0 +1,48 @@
+import json
+import os
+from unittest import mock
+
+from utilities_common.asic_object_map import get_asic_object_maps
+from utilities_common.bulk_db import ASIC_FDB_ENTRY_PREFIX, BulkReader
+from utilities_common.general import load_module_from_source
+
+from .asic_object_map_test import make_db
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+scripts_path = os.path.join(modules_path, "scripts")
+
+nbrshow = load_module_from_source('nbrshow', os.path.join(scripts_path, 'nbrshow'))
+
+
+def fdb_key(mac, bvid):
+    return ASIC_FDB_ENTRY_PREFIX + json.dumps({'bvid': bvid, 'mac': mac, 'switch_id': 'oid:0x21000000000000'},
+                                              separators=(',', ':'))
+
+
+def make_nbr(db):
+    nbr = nbrshow.NbrBase.__new__(nbrshow.NbrBase)
+    nbr.db = db
+    nbr.asic_maps = get_asic_object_maps(db, use_cache=False)
+    nbr.if_name_map = nbr.asic_maps.if_name_map
+    nbr.if_oid_map = nbr.asic_maps.if_oid_map
+    nbr.if_br_oid_map = nbr.asic_maps.if_br_oid_map
+    return nbr
+
+
+class TestNbrshow(object):
+    def test_fetch_fdb_data_entry_aged_out(self):
+        db = make_db(2, 1)
+        db.client.hset(fdb_key('00:00:00:00:00:01', 'oid:0x26000000000000'),
+                       nbrshow.FDB_BRIDGE_PORT_ATTR, 'oid:0x3a000000000001')
+        aged_out = fdb_key('00:00:00:00:00:02', 'oid:0x26000000000000')
+        scan_keys = BulkReader.scan_keys
+
+        def scan_keys_before_aging(reader, pattern, *args, **kwargs):
+            # the entry is removed between the scan and the read
+            return scan_keys(reader, pattern, *args, **kwargs) + [aged_out]
+
+        nbr = make_nbr(db)
+        with mock.patch.object(nbrshow.BulkReader, 'scan_keys', scan_keys_before_aging):
+            nbr.fetch_fdb_data()
+        assert nbr.bridge_mac_list == [(2, '00:00:00:00:00:01', 'Ethernet4')]
@@ -1,6 +1,8 @@
 import os
 import shutil
 
+import pytest
+
 from click.testing import CliRunner
 
 import clear.main as clear
@@ -251,6 +253,7 @@ def verify_after_clear(output, expected_out):
     assert new_output == expected_out
 
 
+@pytest.mark.usefixtures("script_run_mode")
 class TestPortStat(object):
     @classmethod
     def setup_class(cls):
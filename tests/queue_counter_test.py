@@ -3,6 +3,8 @@ import json
 import os
 import sys
 
+import pytest
+
 from click.testing import CliRunner
 from unittest import TestCase
 from swsscommon.swsscommon import ConfigDBConnector
@@ -2192,6 +2194,7 @@ show_queue_port_voq_counters_json = """\
   }
 }"""
 
+@pytest.mark.usefixtures("script_run_mode")
 class TestQueue(object):
     @classmethod
     def setup_class(cls):
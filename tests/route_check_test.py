@@ -6,7 +6,7 @@ import sys
 import syslog
 import time
 from sonic_py_common import device_info
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 from tests.route_check_test_data import APPL_DB, ARGS, ASIC_DB, CONFIG_DB, DEFAULT_CONFIG_DB, DESCR, OP_DEL, OP_SET, PRE, RESULT, RET, TEST_DATA, UPD
 
 import pytest
@@ -130,7 +130,8 @@ class mock_selector:
         if self.select_state == 0:
             self.select_state = self.TIMEOUT
         else:
-            time.sleep(timeout)
+            # the timeout is in milliseconds
+            time.sleep(timeout / 1000)
 
         return (state, None)
 
@@ -283,6 +284,79 @@ class TestRouteCheck(object):
             assert ret == expect_ret
             assert res == expect_res
 
+    @pytest.mark.parametrize("test_num", TEST_DATA.keys())
+    def test_route_check_watch(self, mock_dbs, test_num):
+        self.init()
+
+        ct_data = TEST_DATA[test_num]
+        set_test_case_data(ct_data)
+        args = ct_data[ARGS].split() + ["-w"]
+        if "-i" not in args:
+            args += ["-i", "15"]
+
+        with patch('sys.argv', args):
+            ret, res = route_check.main()
+            assert ret == (ct_data[RET] if RET in ct_data else 0)
+            assert res == (ct_data[RESULT] if RESULT in ct_data else None)
+
+    def test_route_watcher_wait(self, mock_dbs):
+        self.init()
+        set_test_case_data(TEST_DATA["0"])
+        watcher = route_check.RouteWatcher()
+        watcher.selector = MagicMock()
+        watcher.drain = MagicMock()
+
+        with patch("route_check.time.time", side_effect=[100, 100.75, 101.6]):
+            assert watcher.wait(1.5) == ([], [])
+        # Select takes milliseconds, the wait ends at the deadline
+        assert watcher.selector.select.call_args_list == [call(1500), call(750)]
+        assert watcher.drain.call_count == 2
+
+    def test_route_key(self):
+        assert route_check.route_key("10.1.0.32") == route_check.route_key("10.1.0.32/32")
+        assert route_check.route_key("2603:10B0:503:DF4::5D/128") == route_check.route_key("2603:10b0:503:df4:0::5d")
+        assert route_check.route_key("10.0.0.0/8") != route_check.route_key("10.0.0.0/24")
+        assert route_check.route_key("169.254.0.1/32") is None
+        assert route_check.route_key("fe80::1/64") is None
+        assert route_check.key_to_route(route_check.route_key("2603:10b0:0:0::5d/126")) == "2603:10b0::5d/126"
+        with pytest.raises(ValueError):
+            route_check.route_key("10.0.0.256/32")
+
+    def test_route_diff(self):
+        key = route_check.route_key
+        diff = route_check.RouteDiff([key("10.0.0.0/24"), key("10.0.1.0/24")],
+                                     [key("10.0.0.0/24"), key("10.0.2.0/24"), key("10.1.0.1")],
+                                     [key("10.1.0.1"), key("10.1.0.2")])
+        assert diff.get_misses() == (["10.0.1.0/24"], ["10.0.2.0/24"], ["10.1.0.2/32"])
+
+        diff.add_asic(key("10.0.1.0/24"))
+        diff.add_appl(key("10.0.2.0/24"))
+        diff.add_asic(key("10.1.0.2"))
+        assert diff.get_misses() == ([], [], [])
+
+        diff.del_asic(key("10.0.0.0/24"))
+        diff.del_appl(key("10.0.1.0/24"))
+        diff.del_intf(key("10.1.0.1"))
+        assert diff.get_misses() == (["10.0.0.0/24"], ["10.0.1.0/24", "10.1.0.1/32"], [])
+
+    def test_debug_payload_skipped(self, mock_dbs):
+        self.init()
+        set_test_case_data(TEST_DATA["0"])
+        with patch('sys.argv', ["route_check"]), \
+             patch("route_check.report_level", syslog.LOG_WARNING), \
+             patch("route_check.keys_to_routes", wraps=route_check.keys_to_routes) as keys_to_routes:
+            route_check.main()
+        # only the diff is converted back to strings
+        assert keys_to_routes.call_count == 3
+
+        set_test_case_data(TEST_DATA["0"])
+        with patch('sys.argv', ["route_check"]), \
+             patch("route_check.report_level", syslog.LOG_DEBUG), \
+             patch("route_check.keys_to_routes", wraps=route_check.keys_to_routes) as keys_to_routes:
+            route_check.main()
+        # the tables are dumped at debug level
+        assert keys_to_routes.call_count == 6
+
     def test_timeout(self, mock_dbs, force_hang):
         # Test timeout
         ex_raised = False
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from .mock_tables import dbconnector
+
+import utilities_common.multi_asic as multi_asic_util
+from utilities_common import constants
+
+NS_LIST = ['asic0', 'asic1', 'asic2', 'asic3']
+
+
+class Collector(object):
+    def __init__(self, max_workers):
+        self.db = None
+        self.config_db = None
+        self.calls = []
+        self.multi_asic = multi_asic_util.MultiAsic(constants.DISPLAY_ALL, None, max_workers=max_workers)
+        self.multi_asic.get_ns_list_based_on_options = mock.MagicMock(return_value=NS_LIST)
+
+    @multi_asic_util.run_on_multi_asic
+    def collect(self, fail_ns=None):
+        ns = self.multi_asic.current_namespace
+        self.calls.append(threading.current_thread().name)
+        # finish the namespaces in reverse order
+        time.sleep(0.01 * (len(NS_LIST) - NS_LIST.index(ns)))
+        if ns in (fail_ns or []):
+            raise ValueError(ns)
+        return ns.upper()
+
+
+class Accumulator(Collector):
+    def __init__(self, max_workers):
+        super(Accumulator, self).__init__(max_workers)
+        self.total = 0
+
+    @multi_asic_util.run_on_multi_asic
+    def scratch(self):
+        # attributes set and used within the call only
+        self.last_ns = self.multi_asic.current_namespace
+        return self.last_ns
+
+    @multi_asic_util.run_on_multi_asic
+    def accumulate(self):
+        self.total += 1
+
+
+def connect_ns(obj, ns):
+    obj.multi_asic.current_namespace = ns
+
+
+@mock.patch('utilities_common.multi_asic._connect_ns', mock.MagicMock(side_effect=connect_ns))
+class TestRunOnMultiAsic(object):
+    @pytest.mark.parametrize('max_workers', [1, 4])
+    def test_results_in_namespace_order(self, max_workers):
+        collector = Collector(max_workers)
+        results = collector.collect()
+        assert list(results.items()) == [(ns, ns.upper()) for ns in NS_LIST]
+
+    def test_concurrent_uses_thread_pool(self):
+        collector = Collector(4)
+        collector.collect()
+        assert len(collector.calls) == len(NS_LIST)
+        assert threading.current_thread().name not in collector.calls
+        # the original object is left untouched
+        assert collector.multi_asic.current_namespace is None
+
+    def test_serial_by_default(self):
+        collector = Collector(1)
+        collector.collect()
+        assert collector.calls == [threading.current_thread().name] * len(NS_LIST)
+        assert collector.multi_asic.current_namespace == NS_LIST[-1]
+
+    def test_errors_per_namespace(self):
+        collector = Collector(4)
+        with pytest.raises(ValueError) as e:
+            collector.collect(fail_ns=['asic1', 'asic3'])
+        # the error of the first failed namespace is raised
+        assert str(e.value) == 'asic1'
+        assert list(collector.multi_asic.ns_errors.keys()) == ['asic1', 'asic3']
+
+    def test_max_workers_env(self):
+        with mock.patch.dict('os.environ'):
+            os.environ.pop(constants.NS_MAX_WORKERS_ENV, None)
+            assert multi_asic_util.multi_asic_max_workers() == 1
+            assert multi_asic_util.multi_asic_max_workers(8) == 8
+        with mock.patch.dict('os.environ', {constants.NS_MAX_WORKERS_ENV: '3'}):
+            assert multi_asic_util.multi_asic_max_workers() == 3
+        with mock.patch.dict('os.environ', {constants.NS_MAX_WORKERS_ENV: 'x'}):
+            assert multi_asic_util.multi_asic_max_workers() == constants.DEFAULT_NS_MAX_WORKERS
+            assert multi_asic_util.multi_asic_max_workers(8) == 8
+        with mock.patch.dict('os.environ', {constants.NS_MAX_WORKERS_ENV: '0'}):
+            assert multi_asic_util.multi_asic_max_workers() == 1
+
+    def test_scratch_attributes(self):
+        accumulator = Accumulator(4)
+        assert list(accumulator.scratch().values()) == NS_LIST
+
+    def test_accumulate_on_self(self):
+        accumulator = Accumulator(1)
+        accumulator.accumulate()
+        assert accumulator.total == len(NS_LIST)
+
+        # the copies of the namespaces would lose the updates
+        accumulator = Accumulator(4)
+        with pytest.raises(RuntimeError) as e:
+            accumulator.accumulate()
+        assert 'Accumulator.accumulate sets total in namespace asic0' in str(e.value)
+        assert list(accumulator.multi_asic.ns_errors.keys()) == NS_LIST
+        assert accumulator.total == 0
@@ -0,0 +1,167 @@
+import os
+import stat
+import sys
+import time
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from .mock_tables import dbconnector  # noqa: F401
+
+import utilities_common.cli as clicommon
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(root_path)
+scripts_path = os.path.join(modules_path, "scripts")
+
+SCRIPT_NAME = "fakestat"
+SCRIPT = """#!{python}
+import sys
+
+from natsort import natsorted
+from tabulate import tabulate
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "--fail":
+        print("partial output")
+        sys.exit(3)
+    print(tabulate([[port, "up"] for port in natsorted(argv)], headers=["Port", "Status"]))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+
+@pytest.fixture
+def fake_script(tmp_path):
+    path = tmp_path / SCRIPT_NAME
+    path.write_text(SCRIPT.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    env_path = str(tmp_path) + os.pathsep + os.environ.get("PATH", "")
+    with mock.patch.dict(os.environ, {"PATH": env_path}), \
+            mock.patch.object(clicommon, "IN_PROCESS_SCRIPTS", (SCRIPT_NAME,)), \
+            mock.patch.object(clicommon, "script_modules", {}):
+        yield path
+
+
+def run_in_process(enabled, command):
+    with mock.patch("utilities_common.cli.in_process_enabled", mock.MagicMock(return_value=enabled)):
+        return clicommon.run_command(command, return_cmd=True)
+
+
+class TestRunScriptInProcess(object):
+    def test_same_output_as_subprocess(self, fake_script):
+        command = [SCRIPT_NAME, "Ethernet8", "Ethernet0"]
+        with mock.patch("subprocess.Popen", wraps=clicommon.subprocess.Popen) as popen:
+            in_process = run_in_process(True, command)
+        popen.assert_not_called()
+        assert in_process == run_in_process(False, command)
+        assert in_process[0].splitlines()[2].split() == ["Ethernet0", "up"]
+
+    def test_exit_code(self, fake_script):
+        command = [SCRIPT_NAME, "--fail"]
+        assert run_in_process(True, command) == ("partial output\n", 3)
+        assert run_in_process(True, command) == run_in_process(False, command)
+
+    def test_argv_restored(self, fake_script):
+        argv = list(sys.argv)
+        run_in_process(True, [SCRIPT_NAME, "Ethernet0"])
+        assert sys.argv == argv
+
+    def test_exit_on_error(self, fake_script):
+        with mock.patch("utilities_common.cli.in_process_enabled", mock.MagicMock(return_value=True)):
+            with pytest.raises(SystemExit) as e:
+                clicommon.run_command([SCRIPT_NAME, "--fail"])
+            assert e.value.code == 3
+            clicommon.run_command([SCRIPT_NAME, "--fail"], ignore_error=True)
+
+    def test_fallback_without_main(self, fake_script):
+        fake_script.write_text("#!{}\nprint('no entry point')\n".format(sys.executable))
+        assert clicommon.load_script(SCRIPT_NAME) is None
+        assert run_in_process(True, [SCRIPT_NAME]) == ("no entry point\n", 0)
+
+    def test_disabled_by_env(self):
+        with mock.patch.dict(os.environ, {clicommon.IN_PROCESS_ENV: "0"}):
+            os.environ.pop("UTILITIES_UNIT_TESTING", None)
+            assert not clicommon.in_process_enabled()
+
+    def test_alias_mode(self, fake_script):
+        with mock.patch("utilities_common.cli.in_process_enabled", mock.MagicMock(return_value=True)), \
+                mock.patch("utilities_common.cli.print_lines_in_alias_mode") as print_lines, \
+                mock.patch("subprocess.Popen") as popen:
+            clicommon.run_command_in_alias_mode([SCRIPT_NAME, "Ethernet0"])
+        popen.assert_not_called()
+        command_str, lines = print_lines.call_args[0]
+        assert command_str == SCRIPT_NAME + " Ethernet0"
+        assert lines[-1].split() == ["Ethernet0", "up"]
+
+
+    @pytest.mark.benchmark
+    def test_startup_benchmark(self, fake_script):
+        command = [SCRIPT_NAME, "Ethernet0", "Ethernet4"]
+        runs = 5
+
+        start = time.monotonic()
+        for _ in range(runs):
+            expected = run_in_process(False, command)
+        subprocess_time = (time.monotonic() - start) / runs
+
+        start = time.monotonic()
+        for _ in range(runs):
+            result = run_in_process(True, command)
+        in_process_time = (time.monotonic() - start) / runs
+
+        assert result == expected
+        assert in_process_time < subprocess_time
+        print("\nsubprocess {:.1f}ms, in-process {:.1f}ms per run".format(
+            subprocess_time * 1000, in_process_time * 1000))
+
+
+class TestRunRealScriptInProcess(object):
+    @classmethod
+    def setup_class(cls):
+        os.environ["PATH"] += os.pathsep + scripts_path
+        os.environ["UTILITIES_UNIT_TESTING"] = "2"
+        os.environ["UTILITIES_UNIT_TESTING_TOPOLOGY"] = ""
+
+    def test_portstat_same_output_as_subprocess(self):
+        # The unit tests run the scripts in a subprocess, which loads the
+        # same mock tables as this process
+        command = ["portstat", "-a"]
+        with mock.patch.object(clicommon, "script_modules", {}), \
+                mock.patch("subprocess.Popen", wraps=clicommon.subprocess.Popen) as popen:
+            in_process = run_in_process(True, command)
+            popen.assert_not_called()
+            assert clicommon.script_modules["portstat"] is not None
+        subprocess_result = run_in_process(False, command)
+
+        assert in_process == subprocess_result
+        assert in_process[1] == 0
+        assert "Ethernet0" in in_process[0]
+
+    def test_portstat_alias_mode(self):
+        import show.main as show
+
+        def show_counters(enabled):
+            with mock.patch("utilities_common.cli.in_process_enabled", mock.MagicMock(return_value=enabled)), \
+                    mock.patch.object(clicommon, "script_modules", {}), \
+                    mock.patch.dict(os.environ, {"SONIC_CLI_IFACE_MODE": "alias"}):
+                return CliRunner().invoke(show.cli.commands["interfaces"].commands["counters"], [])
+
+        in_process = show_counters(True)
+        subprocess_result = show_counters(False)
+        assert in_process.exit_code == subprocess_result.exit_code == 0
+        assert in_process.output == subprocess_result.output
+        assert "etp1" in in_process.output
+
+    @classmethod
+    def teardown_class(cls):
+        os.environ["PATH"] = os.pathsep.join(
+            os.environ["PATH"].split(os.pathsep)[:-1])
+        os.environ["UTILITIES_UNIT_TESTING"] = "0"
@@ -420,6 +420,19 @@ class TestSfputil(object):
         output = sfputil.fetch_error_status_from_state_db('Ethernet0', db.db)
         assert output == expected_output_ethernet0
 
+    @patch('sfputil.main.platform_sfputil', MagicMock(is_logical_port=MagicMock(return_value=1)))
+    @patch('sfputil.main.multi_asic.get_front_end_namespaces', MagicMock(return_value=['asic0', 'asic1']))
+    def test_error_status_from_db_multi_namespace(self):
+        def fetch(port, namespace):
+            return [['Ethernet0' if namespace == 'asic0' else 'Ethernet4', 'OK']]
+        runner = CliRunner()
+        with patch('sfputil.main.fetch_error_status_from_namespace', side_effect=fetch) as mock_fetch:
+            result = runner.invoke(sfputil.cli.commands['show'].commands['error-status'], ["-p", "Ethernet0"])
+        assert result.exit_code == 0
+        assert sorted(c[0][1] for c in mock_fetch.call_args_list) == ['asic0', 'asic1']
+        # the tables of the namespaces are displayed in namespace order
+        assert result.output.index('Ethernet0') < result.output.index('Ethernet4')
+
     @patch('sfputil.main.platform_chassis')
     @patch('sfputil.main.logical_port_name_to_physical_port_list', MagicMock(return_value=[1]))
     @patch('sfputil.main.logical_port_to_physical_port_index', MagicMock(return_value=1))
@@ -1,4 +1,5 @@
 import copy
+import fnmatch
 import json
 import os
 import sys
@@ -342,19 +343,12 @@ class Table:
 
 db_conns = {"APPL_DB": APPL_DB, "ASIC_DB": ASIC_DB, "COUNTERS_DB": CNTR_DB}
 def conn_side_effect(arg, _):
-    return db_conns[arg]
-
-
-def table_side_effect(db, tbl):
-    if not db in tables_returned:
-        tables_returned[db] = {}
-    if not tbl in tables_returned[db]:
-        tables_returned[db][tbl] = Table(db, tbl)
-    return tables_returned[db][tbl]
+    return mock_db_conn(db_conns[arg])
 
 
 class mock_db_conn:
     def __init__(self, db):
+        self.db = db
         self.db_name = None
         for (k, v) in db_conns.items():
             if v == db:
@@ -364,8 +358,14 @@ class mock_db_conn:
     def getDbName(self):
         return self.db_name
 
+    def scan(self, cursor, match, count):
+        tables = current_test_data[PRE].get(self.db, {})
+        keys = [tbl + ":" + key for tbl in tables for key in tables[tbl]]
+        return (0, [key for key in keys if fnmatch.fnmatchcase(key, match)])
+
 
 def table_side_effect(db, tbl):
+    db = db.db
     if not db in tables_returned:
         tables_returned[db] = {}
     if not tbl in tables_returned[db]:
@@ -373,6 +373,25 @@ def table_side_effect(db, tbl):
     return tables_returned[db][tbl]
 
 
+class mock_subscriber:
+    """ Returns the present keys of the table first, then the updates appended to it """
+    def __init__(self, db, tbl):
+        db = db.db
+        data = current_test_data[PRE].get(db, {})
+        if tbl == "ASIC_STATE:SAI_OBJECT_TYPE_ROUTE_ENTRY":
+            prefix = "SAI_OBJECT_TYPE_ROUTE_ENTRY:"
+            keys = [key[len(prefix):] for key in data.get(ASIC_STATE, {}) if key.startswith(prefix)]
+        else:
+            keys = list(data.get(tbl, {}))
+        self.updates = [(key, OP_SET) for key in keys]
+
+    def pop(self):
+        if not self.updates:
+            return ("", "", None)
+        key, op = self.updates.pop(0)
+        return (key, op, ())
+
+
 def set_mock(mock_table, mock_conn):
     mock_conn.side_effect = conn_side_effect
     mock_table.side_effect = table_side_effect
@@ -411,3 +430,60 @@ class TestVnetRouteCheck(object):
                     print("expect_res={}".format(json.dumps(expect_res, indent=4)))
                 assert ret == expect_ret
                 assert res == expect_res
+
+    @patch("vnet_route_check.swsscommon.DBConnector")
+    @patch("vnet_route_check.swsscommon.Table")
+    def test_vnet_route_check_daemon(self, mock_table, mock_conn):
+        self.init()
+        set_mock(mock_table, mock_conn)
+
+        with patch("vnet_route_check.swsscommon.Select"), \
+                patch("vnet_route_check.swsscommon.SubscriberStateTable", side_effect=mock_subscriber):
+            for (i, ct_data) in test_data.items():
+                do_start_test("route_test_daemon", i, ct_data)
+                watcher = vnet_route_check.VnetRouteWatcher()
+
+                ret = vnet_route_check.check_vnet_routes(watcher)
+                expect_ret = ct_data[RET] if RET in ct_data else 0
+                if expect_ret == 0:
+                    assert ret == expect_ret
+                else:
+                    assert ret == (expect_ret, ct_data[RESULT])
+
+    @patch("vnet_route_check.swsscommon.DBConnector")
+    @patch("vnet_route_check.swsscommon.Table")
+    def test_vnet_route_check_daemon_update(self, mock_table, mock_conn):
+        self.init()
+        set_mock(mock_table, mock_conn)
+        do_start_test("route_test_daemon_update", "1", test_data["1"])
+
+        with patch("vnet_route_check.swsscommon.Select"), \
+                patch("vnet_route_check.swsscommon.SubscriberStateTable", side_effect=mock_subscriber):
+            watcher = vnet_route_check.VnetRouteWatcher()
+            assert vnet_route_check.check_vnet_routes(watcher)[0] == -1
+
+            watcher.asic_subs.updates.append((RT_ENTRY_KEY_PREFIX + "50.2.2.0/24" + RT_ENTRY_KEY_SUFFIX, OP_SET))
+            watcher.drain()
+            assert vnet_route_check.check_vnet_routes(watcher) == 0
+
+            watcher.appl_subs[0].updates.append(("Vnet1:50.1.1.0/24", OP_DEL))
+            watcher.drain()
+            assert vnet_route_check.check_vnet_routes(watcher) == (-1, {
+                "results": {
+                    "missed_in_app_db_routes": {
+                        "Vnet1": {
+                            "routes": [
+                                "50.1.1.0/24"
+                            ]
+                        }
+                    }
+                }
+            })
+
+    def test_parse_route_entry_key(self):
+        key = RT_ENTRY_KEY_PREFIX + "FD01:FC00::1/128" + RT_ENTRY_KEY_SUFFIX
+        assert vnet_route_check.parse_route_entry_key(key) == ("oid:0x3000000000d4b", "fd01:fc00::1/128")
+        assert vnet_route_check.parse_route_entry_key(key[len("SAI_OBJECT_TYPE_ROUTE_ENTRY:"):]) == \
+            ("oid:0x3000000000d4b", "fd01:fc00::1/128")
+        assert vnet_route_check.parse_route_entry_key("SAI_OBJECT_TYPE_ROUTE_ENTRY:{\"dest\":\"10.0.0.0/8\"}") is None
+        assert vnet_route_check.parse_route_entry_key("oid:0x6000000000d76") is None
@@ -23,6 +23,7 @@ def q_multicast_wm_neg():
     print("Teardown watermarkstat sample data: no queue multicast watermark counters")
 
 
+@pytest.mark.usefixtures("script_run_mode")
 class TestWatermarkstat(object):
     @classmethod
     def setup_class(cls):
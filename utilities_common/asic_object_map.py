@@ -0,0 +1,215 @@
+"""
+Maps between ASIC_DB object ids and SONiC objects, shared by the scripts
+which decode ASIC_DB: fdbshow, nbrshow, fast-reboot-dump.py and
+dualtor_neighbor_check.py.
+
+The interface OID maps of COUNTERS_DB, the bridge port map and the
+bvid -> VLAN id map used to be rebuilt object by object by every script
+with port_util.get_interface_oid_map(), port_util.get_bridge_port_map()
+and a lookup per bvid. They are now built together with pipelined reads.
+
+Bridge ports and VLANs change rarely, so they may also be kept in a per
+user cache file. The cache is keyed by a generation marker of ASIC_DB,
+which lets back-to-back runs of a monitoring loop skip the rebuild as long
+as no ASIC object was created or removed.
+"""
+
+import hashlib
+import json
+import os
+
+from sonic_py_common import port_util
+
+from utilities_common import constants
+from utilities_common.bulk_db import BulkReader, ASIC_VLAN_PREFIX
+
+ASIC_BRIDGE_PORT_PREFIX = 'ASIC_STATE:SAI_OBJECT_TYPE_BRIDGE_PORT:'
+COUNTERS_NAME_MAPS = ('COUNTERS_PORT_NAME_MAP', 'COUNTERS_LAG_NAME_MAP')
+# syncd allocates the object ids from VIDCOUNTER and maps every existing
+# object id to its hardware id in VIDTORID
+VIDCOUNTER_KEY = 'VIDCOUNTER'
+VIDTORID_KEY = 'VIDTORID'
+OID_PREFIX = 'oid:0x'
+CACHE_APP_NAME = 'asic_object_map'
+CACHE_VERSION = 1
+
+
+def asic_object_map_cache_enabled():
+    '''
+    Returns True if the maps may be cached on disk, which is enabled by
+    setting the SONIC_CLI_ASIC_MAP_CACHE environment variable to 1
+    '''
+    return os.environ.get(constants.ASIC_MAP_CACHE_ENV) == '1'
+
+
+def strip_oid_prefix(oid):
+    return oid[len(OID_PREFIX):]
+
+
+class AsicObjectMaps(object):
+    """
+    Object id maps of one namespace.
+
+    Like the maps of port_util, the object ids of if_name_map, if_oid_map
+    and if_br_oid_map have no "oid:0x" prefix:
+        if_name_map: interface name -> port or LAG oid
+        if_oid_map: port or LAG oid -> name, for SONiC interface names only
+        if_br_oid_map: bridge port oid -> port oid
+        if_br_oid_type_map: bridge port oid -> SAI_BRIDGE_PORT_ATTR_TYPE
+    bvid_vlan_map maps VLAN object ids, as found in the FDB entry keys, to
+    their VLAN id. The default VLAN has no VLAN id and is mapped to None.
+
+    round_trips counts the requests sent to build the maps, from_cache is
+    True if the bridge ports and VLANs were loaded from the cache file.
+    """
+
+    def __init__(self, if_name_map, bridge_ports, bvid_vlan_map):
+        self.if_name_map = if_name_map
+        self.if_oid_map = {oid: name for name, oid in if_name_map.items()
+                           if port_util.get_index_from_str(name) is not None}
+        self.if_br_oid_map = {br_oid: port_oid for br_oid, (port_oid, _) in bridge_ports.items()}
+        self.if_br_oid_type_map = {br_oid: br_type for br_oid, (_, br_type) in bridge_ports.items()}
+        self.bvid_vlan_map = bvid_vlan_map
+        self.round_trips = 0
+        self.from_cache = False
+
+    def get_vlan_ids(self, bvids):
+        """
+        Same as bulk_db.get_vlan_ids(), without reading ASIC_DB
+        """
+        return {bvid: self.bvid_vlan_map[bvid] for bvid in bvids if bvid in self.bvid_vlan_map}
+
+    def get_if_br_oid_to_port_name_map(self):
+        """
+        Returns the bridge port oid -> interface name map of the bridge
+        ports of SONiC interfaces
+        """
+        return {br_oid: self.if_oid_map[port_oid] for br_oid, port_oid in self.if_br_oid_map.items()
+                if port_oid in self.if_oid_map}
+
+
+def read_if_name_map(db):
+    """
+    Returns the interface name -> oid map of the ports and LAGs of
+    COUNTERS_DB, read with one pipelined request, and the round trips
+    """
+    reader = BulkReader(db, db.COUNTERS_DB)
+    if_name_map = {}
+    for name_map in reader.get_all_many(COUNTERS_NAME_MAPS).values():
+        if_name_map.update((name, strip_oid_prefix(oid)) for name, oid in name_map.items())
+    return if_name_map, reader.round_trips
+
+
+def read_bridge_ports_and_vlans(db):
+    """
+    Returns the bridge port oid -> [port oid, bridge port type] and the
+    bvid -> VLAN id maps of ASIC_DB read with pipelined requests, and the
+    round trips
+    """
+    reader = BulkReader(db, db.ASIC_DB)
+    keys = reader.scan_keys(ASIC_BRIDGE_PORT_PREFIX + 'oid:*') + reader.scan_keys(ASIC_VLAN_PREFIX + 'oid:*')
+    bridge_ports = {}
+    bvid_vlan_map = {}
+    for key, fvs in reader.get_all_many(keys).items():
+        if key.startswith(ASIC_BRIDGE_PORT_PREFIX):
+            if 'SAI_BRIDGE_PORT_ATTR_PORT_ID' in fvs:
+                bridge_ports[strip_oid_prefix(key[len(ASIC_BRIDGE_PORT_PREFIX):])] = [
+                    strip_oid_prefix(fvs['SAI_BRIDGE_PORT_ATTR_PORT_ID']), fvs.get('SAI_BRIDGE_PORT_ATTR_TYPE')]
+        elif fvs:
+            bvid_vlan_map[key[len(ASIC_VLAN_PREFIX):]] = fvs.get('SAI_VLAN_ATTR_VLAN_ID')
+    return bridge_ports, bvid_vlan_map, reader.round_trips
+
+
+def get_asic_db_generation(db, if_name_map):
+    """
+    Returns a marker which changes whenever an ASIC object is created or
+    removed, or an interface is renamed: syncd increments VIDCOUNTER for
+    every new object and VIDTORID holds one entry per existing object.
+
+    The marker is read by the client of BulkReader, the swsscommon
+    DBConnector has no HLEN. Returns None and the round trips if no
+    client able to count VIDTORID could be connected, the maps must
+    then be rebuilt.
+    """
+    reader = BulkReader(db, db.ASIC_DB)
+    client = reader.client
+    if not hasattr(client, 'hlen'):
+        return None, reader.round_trips
+    marker = [client.get(VIDCOUNTER_KEY), client.hlen(VIDTORID_KEY), sorted(if_name_map.items())]
+    return hashlib.sha1(json.dumps(marker).encode('utf-8')).hexdigest(), reader.round_trips + 2
+
+
+def get_cache_file(namespace):
+    # UserCache pulls in the whole CLI, only import it when caching
+    from utilities_common.cli import UserCache
+    return os.path.join(UserCache(app_name=CACHE_APP_NAME).get_directory(),
+                        '{}.json'.format(namespace or 'default'))
+
+
+def load_cache(cache_file, generation):
+    try:
+        with open(cache_file) as fp:
+            cache = json.load(fp)
+    except (OSError, ValueError):
+        return None
+    if cache.get('version') != CACHE_VERSION or cache.get('generation') != generation:
+        return None
+    return cache
+
+
+def save_cache(cache_file, generation, bridge_ports, bvid_vlan_map):
+    cache = {
+        'version': CACHE_VERSION,
+        'generation': generation,
+        'bridge_ports': bridge_ports,
+        'bvid_vlan_map': bvid_vlan_map
+    }
+    tmp_file = '{}.{}'.format(cache_file, os.getpid())
+    try:
+        with open(tmp_file, 'w') as fp:
+            json.dump(cache, fp)
+        # readers never see a partially written cache
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+
+def get_asic_object_maps(db, namespace=constants.DEFAULT_NAMESPACE, use_cache=None):
+    """
+    Returns the AsicObjectMaps of db, a SonicV2Connector of namespace.
+
+    With use_cache, which defaults to asic_object_map_cache_enabled(), the
+    bridge ports and VLANs are loaded from the cache file of the namespace
+    if ASIC_DB did not change since it was written, and the file is
+    refreshed otherwise.
+    """
+    if use_cache is None:
+        use_cache = asic_object_map_cache_enabled()
+
+    db.connect(db.COUNTERS_DB)
+    db.connect(db.ASIC_DB)
+    if_name_map, round_trips = read_if_name_map(db)
+
+    cache = None
+    if use_cache:
+        generation, generation_round_trips = get_asic_db_generation(db, if_name_map)
+        round_trips += generation_round_trips
+        # without a generation marker a cache could never be invalidated
+        use_cache = generation is not None
+    if use_cache:
+        cache_file = get_cache_file(namespace)
+        cache = load_cache(cache_file, generation)
+
+    if cache is not None:
+        bridge_ports = cache['bridge_ports']
+        bvid_vlan_map = cache['bvid_vlan_map']
+    else:
+        bridge_ports, bvid_vlan_map, asic_round_trips = read_bridge_ports_and_vlans(db)
+        round_trips += asic_round_trips
+        if use_cache:
+            save_cache(cache_file, generation, bridge_ports, bvid_vlan_map)
+
+    maps = AsicObjectMaps(if_name_map, bridge_ports, bvid_vlan_map)
+    maps.round_trips = round_trips
+    maps.from_cache = cache is not None
+    return maps
@@ -0,0 +1,343 @@
+"""
+Bulk readers for the SONiC redis databases.
+
+The stat scripts used to read COUNTERS_DB one field at a time, paying a redis
+round trip per port, per queue and per counter. The helpers here read whole
+hashes in pipelined batches so that the number of round trips depends on the
+number of batches rather than on the number of objects.
+
+The swsscommon DBConnector returned by SonicV2Connector.get_redis_client()
+has no pipeline, the batches are then sent by a redis-py client connected to
+the same redis instance, like dualtor_neighbor_check does for its script.
+"""
+
+import fnmatch
+import threading
+
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_SCAN_COUNT = 1000
+
+COUNTER_TABLE_PREFIX = "COUNTERS:"
+RATES_TABLE_PREFIX = "RATES:"
+
+ASIC_VLAN_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_VLAN:"
+ASIC_FDB_ENTRY_PREFIX = "ASIC_STATE:SAI_OBJECT_TYPE_FDB_ENTRY:"
+
+# (namespace, db_name) -> redis-py client, shared by the readers of a process
+_pipeline_clients = {}
+_pipeline_clients_lock = threading.Lock()
+
+
+def get_namespace(db):
+    namespace = getattr(db, 'namespace', None)
+    if namespace is None and hasattr(db, 'getNamespace'):
+        namespace = db.getNamespace()
+    return namespace or ''
+
+
+def connect_pipeline_client(db_name, namespace):
+    """
+    Returns a redis-py client of the redis instance of db_name in
+    namespace, None if it cannot be connected
+    """
+    try:
+        import redis
+        from swsscommon.swsscommon import SonicDBConfig
+    except ImportError:
+        return None
+    try:
+        db_id = SonicDBConfig.getDbId(db_name, namespace)
+        sock = SonicDBConfig.getDbSock(db_name, namespace)
+        if sock:
+            client = redis.Redis(unix_socket_path=sock, db=db_id, decode_responses=True)
+        else:
+            client = redis.Redis(host=SonicDBConfig.getDbHostname(db_name, namespace),
+                                 port=SonicDBConfig.getDbPort(db_name, namespace),
+                                 db=db_id, decode_responses=True)
+        client.ping()
+    except Exception:
+        return None
+    return client
+
+
+def get_pipeline_client(db, db_name):
+    """
+    Returns a client of db_name supporting pipelines and whether it was
+    connected by this call, or (None, False) if there is none
+    """
+    client = db.get_redis_client(db_name)
+    if hasattr(client, 'pipeline'):
+        return client, False
+    key = (get_namespace(db), db_name)
+    with _pipeline_clients_lock:
+        if key in _pipeline_clients:
+            return _pipeline_clients[key], False
+        client = connect_pipeline_client(db_name, key[0])
+        _pipeline_clients[key] = client
+        return client, client is not None
+
+
+class BulkReader(object):
+    """
+    Read many hashes from one database of a SonicV2Connector.
+
+    The reads are sent in batches of batch_size commands by a client
+    supporting pipelines, see get_pipeline_client(). When no such client
+    can be connected every hash is read with its own HGETALL through the
+    connector client. round_trips counts the requests actually sent to
+    redis.
+    """
+
+    def __init__(self, db, db_name, batch_size=DEFAULT_BATCH_SIZE):
+        self.db = db
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self.round_trips = 0
+        client, connected = get_pipeline_client(db, db_name)
+        if connected:
+            # the PING checking the connection
+            self.round_trips += 1
+        self.pipelined = client is not None
+        self.client = client if self.pipelined else db.get_redis_client(db_name)
+
+    def get_all(self, key):
+        """
+        Return all field-values of a single hash, {} if it does not exist
+        """
+        self.round_trips += 1
+        return dict(self.client.hgetall(key) or {})
+
+    def scan_keys(self, pattern, count=DEFAULT_SCAN_COUNT):
+        """
+        Return the keys matching pattern.
+
+        The keyspace is walked with SCAN so that redis is never blocked for
+        the time a KEYS over a large table takes. Clients without SCAN
+        support fall back to a single KEYS.
+        """
+        if not hasattr(self.client, 'scan'):
+            self.round_trips += 1
+            return list(self.db.keys(self.db_name, pattern) or [])
+
+        keys = []
+        cursor = 0
+        while True:
+            self.round_trips += 1
+            cursor, batch = self.client.scan(cursor, match=pattern, count=count)
+            keys.extend(batch)
+            if int(cursor) == 0:
+                break
+        # SCAN may return a key more than once
+        return list(dict.fromkeys(keys))
+
+    def iter_batches(self, keys, command):
+        """
+        Run command(pipe_or_client, key) for every key and yield
+        (key, result) pairs, one pipelined batch at a time
+        """
+        keys = list(keys)
+        if not self.pipelined:
+            for key in keys:
+                self.round_trips += 1
+                yield key, command(self.client, key)
+            return
+
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start:start + self.batch_size]
+            pipe = self.client.pipeline(transaction=False)
+            for key in batch:
+                command(pipe, key)
+            self.round_trips += 1
+            for key, result in zip(batch, pipe.execute()):
+                yield key, result
+
+    def get_all_many(self, keys):
+        """
+        Return a dict of key -> field-values for every key in keys.
+        Keys that do not exist are mapped to {}.
+        """
+        return {key: dict(fvs or {})
+                for key, fvs in self.iter_batches(keys, lambda client, key: client.hgetall(key))}
+
+    def exists_many(self, keys):
+        """
+        Return the keys of keys which exist, in the order of keys
+        """
+        return [key for key, exists in self.iter_batches(keys, lambda client, key: client.exists(key))
+                if exists]
+
+    def get_fields_many(self, keys, fields):
+        """
+        Return a dict of key -> {field: value} holding only the requested
+        fields of every key. Fields that do not exist are left out, so a key
+        that does not exist is mapped to {}.
+        """
+        fields = list(fields)
+        if self.pipelined:
+            def command(client, key):
+                return client.hmget(key, fields)
+        else:
+            # not every connector client implements HMGET, one HGETALL per
+            # key filtered here costs one request instead of one per field
+            def command(client, key):
+                fvs = client.hgetall(key) or {}
+                return [fvs.get(field) for field in fields]
+
+        result = {}
+        for key, values in self.iter_batches(keys, command):
+            result[key] = {field: value for field, value in zip(fields, values or [])
+                           if value is not None}
+        return result
+
+
+class CountersSnapshot(object):
+    """
+    Cached view of the COUNTERS_DB of one namespace.
+
+    Name maps (COUNTERS_PORT_NAME_MAP, COUNTERS_QUEUE_INDEX_MAP, ...) are read
+    once and kept for the lifetime of the snapshot. Counter and rate hashes
+    are fetched in bulk and cached per table key, so a caller may prefetch the
+    objects of every port with one call and then resolve them port by port.
+    """
+
+    def __init__(self, db, batch_size=DEFAULT_BATCH_SIZE):
+        self.reader = BulkReader(db, db.COUNTERS_DB, batch_size)
+        self.name_maps = {}
+        self.tables = {}
+
+    @property
+    def round_trips(self):
+        return self.reader.round_trips
+
+    def get_name_maps(self, *map_names):
+        """
+        Fetch several name maps at once, returns a list in the order of
+        map_names
+        """
+        missing = [name for name in map_names if name not in self.name_maps]
+        if missing:
+            self.name_maps.update(self.reader.get_all_many(missing))
+        return [self.name_maps[name] for name in map_names]
+
+    def get_name_map(self, map_name):
+        return self.get_name_maps(map_name)[0]
+
+    def get_tables(self, oids, prefix=COUNTER_TABLE_PREFIX):
+        """
+        Return a dict of oid -> field-values of the <prefix><oid> hashes
+        """
+        oids = list(oids)
+        missing = [prefix + oid for oid in oids if prefix + oid not in self.tables]
+        if missing:
+            self.tables.update(self.reader.get_all_many(missing))
+        return {oid: self.tables[prefix + oid] for oid in oids}
+
+    def get_counters(self, oids):
+        return self.get_tables(oids, COUNTER_TABLE_PREFIX)
+
+    def get_rates(self, oids):
+        return self.get_tables(oids, RATES_TABLE_PREFIX)
+
+
+class DbSnapshot(object):
+    """
+    In memory copy of some tables of one namespace, read with one SCAN and
+    pipelined HGETALLs per table.
+
+    The snapshot answers keys(), get(), get_all() and get_table() the way
+    SonicV2Connector and ConfigDBConnector do, so helpers written against a
+    connector render their view from memory instead of paying a round trip
+    per field. Only the tables passed to load() are known to the snapshot,
+    every other key reads as missing.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.round_trips = 0
+        self.dbs = {}
+
+    def load(self, db, db_name, patterns):
+        """
+        Read the hashes of db_name matching patterns, db being a connector
+        of the namespace. Returns the snapshot.
+        """
+        reader = BulkReader(db, db_name, self.batch_size)
+        hashes = self.dbs.setdefault(db_name, {})
+        for pattern in patterns:
+            # keys deleted between the SCAN and the HGETALL read as missing
+            hashes.update((key, fvs) for key, fvs in reader.get_all_many(reader.scan_keys(pattern)).items() if fvs)
+        self.round_trips += reader.round_trips
+        # so that snapshot.APPL_DB can be used like db.APPL_DB
+        setattr(self, db_name, db_name)
+        return self
+
+    def load_keys(self, db, db_name, keys):
+        """
+        Read the hashes of db_name stored at keys, for callers which know
+        the keys and must not walk the keyspace. Returns the snapshot.
+        """
+        reader = BulkReader(db, db_name, self.batch_size)
+        hashes = self.dbs.setdefault(db_name, {})
+        hashes.update((key, fvs) for key, fvs in reader.get_all_many(keys).items() if fvs)
+        self.round_trips += reader.round_trips
+        setattr(self, db_name, db_name)
+        return self
+
+    def keys(self, db_name, pattern='*'):
+        hashes = self.dbs.get(db_name, {})
+        if not any(c in pattern for c in '*?['):
+            return [pattern] if pattern in hashes else []
+        return [key for key in hashes if fnmatch.fnmatchcase(key, pattern)]
+
+    def get(self, db_name, key, field):
+        return self.dbs.get(db_name, {}).get(key, {}).get(field)
+
+    def get_all(self, db_name, key):
+        return dict(self.dbs.get(db_name, {}).get(key, {}))
+
+    def get_table(self, table, db_name='CONFIG_DB', separator='|'):
+        """
+        Like ConfigDBConnector.get_table, keys of several parts are returned
+        as tuples and the field-values are decoded the way raw_to_typed()
+        does: list fields ("ports@") are split into lists under the name
+        without the '@', and the "NULL" placeholder field is dropped.
+        """
+        prefix = table + separator
+        data = {}
+        for key, fvs in self.dbs.get(db_name, {}).items():
+            if key.startswith(prefix):
+                row = key[len(prefix):]
+                tokens = row.split(separator)
+                data[tuple(tokens) if len(tokens) > 1 else row] = raw_to_typed(fvs)
+        return data
+
+
+def raw_to_typed(fvs):
+    """
+    Decode the field-values of a CONFIG_DB hash like
+    ConfigDBConnector.raw_to_typed
+    """
+    typed = {}
+    for field, value in fvs.items():
+        if field == 'NULL':
+            continue
+        if field.endswith('@'):
+            typed[field[:-1]] = value.split(',')
+        else:
+            typed[field] = value
+    return typed
+
+
+def get_vlan_ids(reader, bvids):
+    """
+    Resolve VLAN object ids to VLAN ids with one batch of reads from the
+    ASIC_DB reader.
+
+    Returns a dict of bvid -> vlan id. A bvid whose VLAN object has no
+    SAI_VLAN_ATTR_VLAN_ID (the default VLAN) is mapped to None, a bvid
+    whose VLAN object does not exist is left out.
+    """
+    bvids = list(dict.fromkeys(bvids))
+    vlans = reader.get_all_many(ASIC_VLAN_PREFIX + bvid for bvid in bvids)
+    return {bvid: vlans[ASIC_VLAN_PREFIX + bvid].get("SAI_VLAN_ATTR_VLAN_ID")
+            for bvid in bvids if vlans[ASIC_VLAN_PREFIX + bvid]}
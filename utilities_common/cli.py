@@ -1,25 +1,35 @@
 import configparser
+import contextlib
 import datetime
+import io
 import os
 import re
 import subprocess
 import sys
 import shutil
+import traceback
 
 import click
 import json
 import lazy_object_proxy
 import netaddr
 
-from natsort import natsorted
 from sonic_py_common import multi_asic
 from utilities_common.db import Db
-from utilities_common.general import load_db_config
+from utilities_common.general import load_db_config, load_module_from_source
 from sonic_py_common.general import getstatusoutput_noshell_pipe
 from sonic_py_common import device_info
 
 VLAN_SUB_INTERFACE_SEPARATOR = '.'
 
+# Scripts with a main(argv) entry point that run_command calls in-process
+# instead of starting a new interpreter for them
+IN_PROCESS_SCRIPTS = ('intfstat', 'intfutil', 'pfcstat', 'portstat', 'queuestat', 'watermarkstat')
+# Set to 0 to always run the scripts in a subprocess
+IN_PROCESS_ENV = 'SONIC_CLI_IN_PROCESS'
+
+script_modules = {}
+
 pass_db = click.make_pass_decorator(Db, ensure=True)
 
 class AbbreviationGroup(click.Group):
@@ -119,23 +129,19 @@ class AliasedGroup(click.Group):
             return click.Group.get_command(self, ctx, matches[0])
         ctx.fail('Too many matches: %s' % ', '.join(sorted(matches)))
 
-class InterfaceAliasConverter(object):
-    """Class which handles conversion between interface name and alias"""
+class PortAliasIndex(object):
+    """Bidirectional index of SONiC interface names and vendor aliases"""
 
-    def __init__(self, db=None):
+    # An interface name preceded by whitespace or the start of the line and
+    # followed by whitespace, a comma and whitespace or the end of the line
+    NAME_TOKEN = re.compile(r"(?<!\S)[^\s,]+(?=$|,?\s)")
 
-        # Load database config files
-        load_db_config()
-        if db is None:
-            self.port_dict = multi_asic.get_port_table()
-        else:
-            self.config_db = db.cfgdb
-            self.port_dict = self.config_db.get_table('PORT')
+    def __init__(self, port_dict):
+        self.port_dict = port_dict if port_dict else {}
         self.alias_max_length = 0
-
-
-        if not self.port_dict:
-            self.port_dict = {}
+        # name -> alias and alias -> name
+        self.aliases = {}
+        self.names = {}
 
         for port_name in self.port_dict:
             try:
@@ -146,6 +152,46 @@ class InterfaceAliasConverter(object):
             except KeyError:
                 break
 
+        for port_name, port in self.port_dict.items():
+            alias = port.get('alias')
+            if alias is not None:
+                self.aliases[port_name] = alias
+                # The first port using an alias owns it
+                self.names.setdefault(alias, port_name)
+
+    def replace_names(self, line):
+        """Replace every interface name token in line with its alias"""
+        aliases = self.aliases
+        return self.NAME_TOKEN.sub(lambda m: aliases.get(m.group(0), m.group(0)), line)
+
+
+# PortAliasIndex of the PORT table of all namespaces, per namespace list
+port_alias_indexes = {}
+
+
+def get_port_alias_index():
+    """Return the PortAliasIndex of all namespaces, built once per process"""
+    namespaces = tuple(multi_asic.get_namespace_list())
+    if namespaces not in port_alias_indexes:
+        port_alias_indexes[namespaces] = PortAliasIndex(multi_asic.get_port_table())
+    return port_alias_indexes[namespaces]
+
+
+class InterfaceAliasConverter(object):
+    """Class which handles conversion between interface name and alias"""
+
+    def __init__(self, db=None):
+
+        # Load database config files
+        load_db_config()
+        if db is None:
+            self.index = get_port_alias_index()
+        else:
+            self.config_db = db.cfgdb
+            self.index = PortAliasIndex(self.config_db.get_table('PORT'))
+        self.port_dict = self.index.port_dict
+        self.alias_max_length = self.index.alias_max_length
+
     def name_to_alias(self, interface_name):
         """Return vendor interface alias if SONiC
            interface name is given as argument
@@ -159,10 +205,9 @@ class InterfaceAliasConverter(object):
                 # interface_name holds the parent port name
                 interface_name = interface_name[:sub_intf_sep_idx]
 
-            for port_name in self.port_dict:
-                if interface_name == port_name:
-                    return self.port_dict[port_name]['alias'] if sub_intf_sep_idx == -1 \
-                            else self.port_dict[port_name]['alias'] + VLAN_SUB_INTERFACE_SEPARATOR + vlan_id
+            alias = self.index.aliases.get(interface_name)
+            if alias is not None:
+                return alias if sub_intf_sep_idx == -1 else alias + VLAN_SUB_INTERFACE_SEPARATOR + vlan_id
 
         # interface_name not in port_dict. Just return interface_name
         return interface_name if sub_intf_sep_idx == -1 else interface_name + VLAN_SUB_INTERFACE_SEPARATOR + vlan_id
@@ -180,9 +225,9 @@ class InterfaceAliasConverter(object):
                 # interface_alias holds the parent port alias
                 interface_alias = interface_alias[:sub_intf_sep_idx]
 
-            for port_name in self.port_dict:
-                if interface_alias == self.port_dict[port_name]['alias']:
-                    return port_name if sub_intf_sep_idx == -1 else port_name + VLAN_SUB_INTERFACE_SEPARATOR + vlan_id
+            port_name = self.index.names.get(interface_alias)
+            if port_name is not None:
+                return port_name if sub_intf_sep_idx == -1 else port_name + VLAN_SUB_INTERFACE_SEPARATOR + vlan_id
 
         # interface_alias not in port_dict. Just return interface_alias
         return interface_alias if sub_intf_sep_idx == -1 else interface_alias + VLAN_SUB_INTERFACE_SEPARATOR + vlan_id
@@ -389,9 +434,7 @@ def print_output_in_alias_mode(output, index):
     if word:
         interface_name = word[index]
         interface_name = interface_name.replace(':', '')
-    for port_name in natsorted(list(iface_alias_converter.port_dict.keys())):
-            if interface_name == port_name:
-                alias_name = iface_alias_converter.port_dict[port_name]['alias']
+        alias_name = iface_alias_converter.index.aliases.get(interface_name, "")
     if alias_name:
         if len(alias_name) < iface_alias_converter.alias_max_length:
             alias_name = alias_name.rjust(
@@ -408,13 +451,28 @@ def run_command_in_alias_mode(command, shell=False):
         command_str = ' '.join(command)
     else:
         command_str = command
+
+    result = run_script_in_process(command) if not shell else None
+    if result is not None:
+        output, rc = result
+        print_lines_in_alias_mode(command_str, output.splitlines(keepends=True))
+        if rc != 0:
+            sys.exit(rc)
+        return
+
     process = subprocess.Popen(command, text=True, shell=shell, stdout=subprocess.PIPE)
+    print_lines_in_alias_mode(command_str, iter(process.stdout.readline, ''))
 
-    while True:
-        output = process.stdout.readline()
-        if output == '' and process.poll() is not None:
-            break
+    rc = process.wait()
+    if rc != 0:
+        sys.exit(rc)
 
+
+def print_lines_in_alias_mode(command_str, lines):
+    """Print the output lines of command_str with all instances of SONiC
+       interface names replaced with vendor-sepecific interface aliases.
+    """
+    for output in lines:
         if output:
             index = 1
             raw_output = output
@@ -511,16 +569,72 @@ def run_command_in_alias_mode(command, shell=False):
                 whitespace and followed immediately by either the end of a line or whitespace
                 or a comma followed by whitespace
                 """
-                converted_output = raw_output
-                for port_name in iface_alias_converter.port_dict:
-                    converted_output = re.sub(r"(^|\s){}($|,{{0,1}}\s)".format(port_name),
-                            r"\1{}\2".format(iface_alias_converter.name_to_alias(port_name)),
-                            converted_output)
+                converted_output = iface_alias_converter.index.replace_names(raw_output)
                 click.echo(converted_output.rstrip('\n'))
 
-    rc = process.poll()
-    if rc != 0:
-        sys.exit(rc)
+
+def in_process_enabled():
+    """Check whether IN_PROCESS_SCRIPTS may be run in-process"""
+    # Under unit tests the scripts load the mock tables when they are
+    # imported, they need a new interpreter for every run
+    if 'UTILITIES_UNIT_TESTING' in os.environ:
+        return False
+    return os.environ.get(IN_PROCESS_ENV, '1') != '0'
+
+
+def load_script(name):
+    """Load the installed script name as a module, return None if it can't be loaded"""
+    if name not in script_modules:
+        module = None
+        path = shutil.which(name)
+        if path:
+            try:
+                module = load_module_from_source(name, path)
+            except Exception:
+                module = None
+        if not callable(getattr(module, 'main', None)):
+            module = None
+        script_modules[name] = module
+    return script_modules[name]
+
+
+def run_script_in_process(command):
+    """
+    Run command by calling the main() of its script in this process.
+
+    Returns a tuple of the standard output and the exit code of the script,
+    or None if command has to be run in a subprocess instead.
+    """
+    if not in_process_enabled() or not command or command[0] not in IN_PROCESS_SCRIPTS:
+        return None
+
+    module = load_script(command[0])
+    if module is None:
+        return None
+
+    output = io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = list(command)
+    rc = 0
+    try:
+        with contextlib.redirect_stdout(output):
+            module.main(list(command[1:]))
+    except SystemExit as e:
+        # Same exit code as the interpreter would return for sys.exit(code)
+        if e.code is None:
+            rc = 0
+        elif isinstance(e.code, int):
+            rc = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            rc = 1
+    except Exception:
+        traceback.print_exc()
+        rc = 1
+    finally:
+        sys.argv = saved_argv
+
+    return output.getvalue(), rc
 
 
 def run_command(command, display_cmd=False, ignore_error=False, return_cmd=False, interactive_mode=False, shell=False):
@@ -551,6 +665,21 @@ def run_command(command, display_cmd=False, ignore_error=False, return_cmd=False
         run_command_in_alias_mode(command, shell=shell)
         sys.exit(0)
 
+    # Long running interactive commands are left to a subprocess
+    result = run_script_in_process(command) if not shell and not interactive_mode else None
+    if result is not None:
+        out, rc = result
+        if return_cmd:
+            return out, rc
+
+        if len(out) > 0:
+            click.echo(out.rstrip('\n'))
+
+        if rc != 0 and not ignore_error:
+            sys.exit(rc)
+
+        return
+
     proc = subprocess.Popen(command, shell=shell, text=True, stdout=subprocess.PIPE)
 
     if return_cmd:
@@ -0,0 +1,99 @@
+"""
+Process-wide pool of database connectors.
+
+A CLI invocation used to open a fresh connection to every database of a
+namespace whenever a helper needed one, sometimes once per printed row. The
+pool hands out one connector per (namespace, db set) and keeps it for the
+lifetime of the process.
+"""
+
+import threading
+
+from sonic_py_common import multi_asic
+from swsscommon import swsscommon
+
+ALL_DBS = None
+CONFIG_DB = ('CONFIG_DB',)
+
+
+class ConnectorPool(object):
+    """
+    Cache of connectors keyed by (connector type, namespace, db set).
+
+    opened counts the connectors created by the pool and reused the number
+    of requests served from the cache. Connectors for different keys may be
+    created concurrently, requests for the same key wait for the first one.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        self.connectors = {}
+        self.opened = 0
+        self.reused = 0
+
+    def get(self, key, factory):
+        """
+        Return the connector cached under key, creating it with factory()
+        if it does not exist yet
+        """
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            connector = self.connectors.get(key)
+            if connector is not None:
+                with self.lock:
+                    self.reused += 1
+                return connector
+
+            connector = factory()
+            with self.lock:
+                self.connectors[key] = connector
+                self.opened += 1
+            return connector
+
+    def register(self, key, connector):
+        """
+        Store a connector opened by the caller so that later requests for
+        key reuse it
+        """
+        with self.lock:
+            self.connectors[key] = connector
+            self.opened += 1
+
+    def get_db_connector(self, namespace, db_list=ALL_DBS):
+        """
+        Return a SonicV2Connector of namespace connected to the databases in
+        db_list, or to all the databases of the namespace if db_list is None
+        """
+        if db_list is ALL_DBS:
+            return self.get(('SonicV2Connector', namespace, ALL_DBS),
+                            lambda: multi_asic.connect_to_all_dbs_for_ns(namespace))
+
+        db_list = tuple(sorted(db_list))
+
+        def connect():
+            db = swsscommon.SonicV2Connector(use_unix_socket_path=True, namespace=namespace)
+            for db_name in db_list:
+                db.connect(db_name)
+            return db
+
+        return self.get(('SonicV2Connector', namespace, db_list), connect)
+
+    def get_config_db(self, namespace):
+        """
+        Return a ConfigDBConnector of namespace
+        """
+        return self.get(('ConfigDBConnector', namespace, CONFIG_DB),
+                        lambda: multi_asic.connect_config_db_for_ns(namespace))
+
+    def clear(self):
+        with self.lock:
+            self.key_locks.clear()
+            self.connectors.clear()
+            self.opened = 0
+            self.reused = 0
+
+
+connector_pool = ConnectorPool()
@@ -11,3 +11,11 @@ IPV4 = 'v4'
 IPV6 = 'v6'
 VTYSH_COMMAND = 'vtysh'
 RVTYSH_COMMAND = 'rvtysh'
+DEFAULT_NS_MAX_WORKERS = 1
+DEFAULT_NS_PARALLEL_MAX_WORKERS = 8
+NS_MAX_WORKERS_ENV = 'SONIC_CLI_NS_MAX_WORKERS'
+DEFAULT_DUMP_MAX_WORKERS = 8
+DUMP_MAX_WORKERS_ENV = 'SONIC_DUMP_MAX_WORKERS'
+ASIC_MAP_CACHE_ENV = 'SONIC_CLI_ASIC_MAP_CACHE'
+XCVRD_BATCH_TIMEOUT_MARGIN_SECS = 0.5
+XCVRD_CONCURRENT_BATCH_ENV = 'SONIC_CLI_XCVRD_CONCURRENT_BATCH'
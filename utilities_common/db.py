@@ -1,6 +1,7 @@
 from sonic_py_common import multi_asic, device_info
 from swsscommon.swsscommon import ConfigDBConnector, ConfigDBPipeConnector, SonicV2Connector
 from utilities_common import constants
+from utilities_common.connector_pool import connector_pool, CONFIG_DB, ALL_DBS
 from utilities_common.multi_asic import multi_asic_ns_choices
 
 
@@ -32,14 +33,15 @@ class Db(object):
 
         self.cfgdb_clients[constants.DEFAULT_NAMESPACE] = self.cfgdb
         self.db_clients[constants.DEFAULT_NAMESPACE] = self.db
+        # Let the other helpers of this process reuse the connections
+        connector_pool.register(('ConfigDBConnector', constants.DEFAULT_NAMESPACE, CONFIG_DB), self.cfgdb)
+        connector_pool.register(('SonicV2Connector', constants.DEFAULT_NAMESPACE, ALL_DBS), self.db)
 
         if multi_asic.is_multi_asic():
             self.ns_list = multi_asic_ns_choices()
             for ns in self.ns_list:
-                self.cfgdb_clients[ns] = (
-                    multi_asic.connect_config_db_for_ns(ns)
-                )
-                self.db_clients[ns] = multi_asic.connect_to_all_dbs_for_ns(ns)
+                self.cfgdb_clients[ns] = connector_pool.get_config_db(ns)
+                self.db_clients[ns] = connector_pool.get_db_connector(ns)
 
     def get_data(self, table, key):
         data = self.cfgdb.get_table(table)
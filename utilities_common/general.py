@@ -1,10 +1,13 @@
 import importlib.machinery
 import importlib.util
+import os
 import sys
 
 from sonic_py_common.multi_asic import is_multi_asic
 from swsscommon import swsscommon
 
+from utilities_common import constants
+
 def load_module_from_source(module_name, file_path):
     """
     This function will load the Python source file specified by <file_path>
@@ -32,6 +35,23 @@ def load_db_config():
         if not swsscommon.SonicDBConfig.isInit():
             swsscommon.SonicDBConfig.load_sonic_db_config()
 
+def get_xcvr_batch_timeout(cmd_timeout_secs, num_ports):
+    """
+    Returns the deadline of a batch of xcvrd commands sent to num_ports ports
+    at once, cmd_timeout_secs being the timeout of one command.
+
+    The y_cable task of xcvrd serves the commands one after the other, so
+    the batch gets the timeout of every command in sequence. The wait ends as
+    soon as every port responded, the deadline only matters for ports which
+    don't. For an xcvrd serving the commands of a batch concurrently, setting
+    SONIC_CLI_XCVRD_CONCURRENT_BATCH to 1 gives the batch the timeout of one
+    command and a margin, whatever the number of ports.
+    """
+    if os.environ.get(constants.XCVRD_CONCURRENT_BATCH_ENV) == '1':
+        return cmd_timeout_secs + constants.XCVRD_BATCH_TIMEOUT_MARGIN_SECS
+    return cmd_timeout_secs * max(num_ports, 1)
+
+
 def get_optional_value_for_key_in_config_tbl(config_db, port, key, table):
     info_dict = {}
     info_dict = config_db.get_entry(table, port)
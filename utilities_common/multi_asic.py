@@ -1,5 +1,9 @@
 import argparse
+import copy
 import functools
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 import netifaces
@@ -7,6 +11,7 @@ import pyroute2
 from natsort import natsorted
 from sonic_py_common import multi_asic, device_info
 from utilities_common import constants
+from utilities_common.connector_pool import connector_pool
 from utilities_common.general import load_db_config
 
 
@@ -14,7 +19,7 @@ class MultiAsic(object):
 
     def __init__(
         self, display_option=constants.DISPLAY_ALL, namespace_option=None,
-        db=None
+        db=None, max_workers=1
     ):
         # Load database config files
         load_db_config()
@@ -23,6 +28,9 @@ class MultiAsic(object):
         self.current_namespace = None
         self.is_multi_asic = multi_asic.is_multi_asic()
         self.db = db
+        self.max_workers = max_workers
+        self.ns_errors = OrderedDict()
+        self.connector_pool = connector_pool
 
     def get_display_option(self):
         return self.display_option
@@ -129,32 +137,90 @@ def multi_asic_click_option_namespace(func):
    func = _multi_asic_click_option_namespace(func)
    return func
 
+def multi_asic_max_workers(default=constants.DEFAULT_NS_MAX_WORKERS):
+    '''
+    Returns the number of namespaces the CLI may process concurrently.
+    By default they are processed one after the other, the
+    SONIC_CLI_NS_MAX_WORKERS environment variable lets more of them be
+    processed at the same time.
+    '''
+    try:
+        return max(1, int(os.environ.get(constants.NS_MAX_WORKERS_ENV, default)))
+    except ValueError:
+        return default
+
+
+def _connect_ns(obj, ns):
+    obj.multi_asic.current_namespace = ns
+    # if object instance already has db connections, use them
+    if obj.multi_asic.db and obj.multi_asic.db.cfgdb_clients.get(ns):
+        obj.config_db = obj.multi_asic.db.cfgdb_clients[ns]
+    else:
+        obj.config_db = obj.multi_asic.connector_pool.get_config_db(ns)
+
+    if obj.multi_asic.db and obj.multi_asic.db.db_clients.get(ns):
+        obj.db = obj.multi_asic.db.db_clients[ns]
+    else:
+        obj.db = obj.multi_asic.connector_pool.get_db_connector(ns)
+
+
 def run_on_multi_asic(func):
     '''
     This decorator is used on the CLI functions which needs to be
     run on all the namespaces in the multi ASIC platform
     The decorator loops through all the required namespaces,
     for every iteration, it connects to all the DBs and provides an handle
-    to the wrapped function.
-
+    to the wrapped function. The connections are taken from the process-wide
+    connector pool, so they are opened only once per namespace.
+    The return values of the wrapped function are returned as an OrderedDict
+    keyed by namespace, in the order of get_ns_list_based_on_options().
+
+    If multi_asic.max_workers is greater than 1, the namespaces are connected
+    and processed concurrently in a thread pool. Every namespace then runs on
+    a shallow copy of the object, and only the return values are merged back:
+    the wrapped function must return its results rather than accumulate them
+    on self. Attributes it sets for its own use within the call are fine, but
+    rebinding an attribute the object already had (e.g. self.total += n)
+    would be silently lost, so it raises a RuntimeError instead. Mutating a
+    shared container in place (e.g. self.table.append()) is not detected and
+    is not thread safe either, don't do it. An exception raised for a
+    namespace is recorded in multi_asic.ns_errors, and the one of the first
+    failed namespace is re-raised once every namespace is done.
     '''
     @functools.wraps(func)
     def wrapped_run_on_all_asics(self, *args, **kwargs):
         ns_list = self.multi_asic.get_ns_list_based_on_options()
-        for ns in ns_list:
-            self.multi_asic.current_namespace = ns
-            # if object instance already has db connections, use them
-            if self.multi_asic.db and self.multi_asic.db.cfgdb_clients.get(ns):
-                self.config_db = self.multi_asic.db.cfgdb_clients[ns]
-            else:
-                self.config_db = multi_asic.connect_config_db_for_ns(ns)
-
-            if self.multi_asic.db and self.multi_asic.db.db_clients.get(ns):
-                self.db = self.multi_asic.db.db_clients[ns]
-            else:
-                self.db = multi_asic.connect_to_all_dbs_for_ns(ns)
-
-            func(self,  *args, **kwargs)
+        results = OrderedDict()
+        max_workers = min(self.multi_asic.max_workers or 1, len(ns_list))
+        if max_workers <= 1:
+            for ns in ns_list:
+                _connect_ns(self, ns)
+                results[ns] = func(self,  *args, **kwargs)
+            return results
+
+        def run_on_ns(ns):
+            ns_obj = copy.copy(self)
+            ns_obj.multi_asic = copy.copy(self.multi_asic)
+            _connect_ns(ns_obj, ns)
+            connected = dict(vars(ns_obj))
+            result = func(ns_obj, *args, **kwargs)
+            lost = [attr for attr in connected if vars(ns_obj).get(attr) is not connected[attr]]
+            if lost:
+                raise RuntimeError("{} sets {} in namespace {}, which is lost when namespaces run in parallel; "
+                                   "return it instead".format(func.__qualname__, ', '.join(lost), ns))
+            return result
+
+        self.multi_asic.ns_errors = OrderedDict()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(ns, executor.submit(run_on_ns, ns)) for ns in ns_list]
+        for ns, future in futures:
+            try:
+                results[ns] = future.result()
+            except BaseException as e:
+                self.multi_asic.ns_errors[ns] = e
+        if self.multi_asic.ns_errors:
+            raise next(iter(self.multi_asic.ns_errors.values()))
+        return results
     return wrapped_run_on_all_asics
 
 
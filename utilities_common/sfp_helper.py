@@ -1,5 +1,7 @@
 import ast
 
+from utilities_common.bulk_db import DbSnapshot
+
 QSFP_DATA_MAP = {
     'model': 'Vendor PN',
     'vendor_oui': 'Vendor OUI',
@@ -342,6 +344,26 @@ CCMIS_STATUS_MAP = {
     'rxsigpowerlowalarm_flag': 'Rxsigpower low alarm flag'
 }
 
+TRANSCEIVER_INFO_TABLE = 'TRANSCEIVER_INFO'
+TRANSCEIVER_FIRMWARE_INFO_TABLE = 'TRANSCEIVER_FIRMWARE_INFO'
+TRANSCEIVER_DOM_SENSOR_TABLE = 'TRANSCEIVER_DOM_SENSOR'
+TRANSCEIVER_DOM_THRESHOLD_TABLE = 'TRANSCEIVER_DOM_THRESHOLD'
+TRANSCEIVER_PM_TABLE = 'TRANSCEIVER_PM'
+TRANSCEIVER_STATUS_TABLE = 'TRANSCEIVER_STATUS'
+
+def load_transceiver_snapshot(state_db, tables, ports=None):
+    """
+    Read the transceiver tables of STATE_DB in pipelined batches.
+    With ports None every entry of tables is read, otherwise only the
+    entries of ports. The returned DbSnapshot answers get_all() and keys()
+    like state_db.
+    """
+    snapshot = DbSnapshot()
+    if ports is None:
+        return snapshot.load(state_db, state_db.STATE_DB, [table + '|*' for table in tables])
+    return snapshot.load_keys(state_db, state_db.STATE_DB,
+                              ['{}|{}'.format(table, port) for port in ports for table in tables])
+
 def covert_application_advertisement_to_output_string(indent, sfp_info_dict):
     key = 'application_advertisement'
     field_name = '{}{}: '.format(indent, QSFP_DATA_MAP[key])